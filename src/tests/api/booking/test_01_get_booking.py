@@ -1,47 +1,40 @@
 import pytest
-import json
-import time
 import logging
 
 logger = logging.getLogger(__name__)
 from tests.api.utils.booking_helper import find_matching_bookings, validate_booking_by_id, get_bookings
-
-# Load test data's from JSON
-with open("resources/test-data/filters.json") as f:
-    filter_data = json.load(f)
+from tests.api.utils.booking_ids import BookingIds
 
 
 # -----------------------------
 # Retrieve all booking IDs without filters
 # -----------------------------
-@pytest.mark.parametrize("data", [d for d in filter_data if d["description"] == "No filters"])
-def test_Retrieve_all_booking_IDs_without_filters(api_client, create_test_booking, data):
+@pytest.mark.test_data("filters.json", description="No filters")
+def test_Retrieve_all_booking_IDs_without_filters(api_client, shared_booking_registry, data):
     """Verify retrieving all booking IDs without applying any filters."""
 
     # Send GET request to /booking endpoint to retrieve all booking IDs
-    response = api_client.get("/booking")
+    # (streamed: the full list can hold hundreds of thousands of bookings)
+    response = api_client.get("/booking", stream=True)
 
     # Verify API responded with HTTP 200 OK
     assert response.status_code == 200
 
-    # Parse JSON response containing all booking IDs
-    booking_ids = response.json()
+    # Parse booking IDs incrementally into a set-like container (O(1) lookups);
+    # a body that is not a JSON list or a non-integer ID raises ValueError
+    try:
+        ids = BookingIds.from_response(response)
+    except ValueError as e:
+        pytest.fail(f"Invalid booking list: {e}")
 
     # Validate response is a non-empty list
-    assert isinstance(booking_ids, list), f"Response is not a list"
-    assert len(booking_ids) > 0, f"Response is having zero booking"
-
-    # Extract only the booking IDs from the response
-    ids = [item["bookingid"] for item in booking_ids]
-
-    # Check that every booking ID is an integer
-    assert all(isinstance(bid, int) for bid in ids), f"Not all booking IDs are numbers: {ids}"
+    assert len(ids) > 0, f"Response is having zero booking"
 
     # Print booking IDs for traceability/debugging
     #logger.info(f"Found booking IDs: {ids}")
 
     # Verify that the dynamically created booking(s) exist in the retrieved IDs
-    for booking in create_test_booking:
+    for booking in shared_booking_registry:
         booking_id = booking["bookingid"]
         if booking_id in ids:
             logger.info(f"Booking ID {booking_id} found in API response.")
@@ -53,14 +46,14 @@ def test_Retrieve_all_booking_IDs_without_filters(api_client, create_test_bookin
 # -----------------------------
 # Retrieve booking IDs by applying single filters
 # -----------------------------
-@pytest.mark.parametrize(
-    "data",
-    [d for d in filter_data if d["description"] == "Individual filter"],
+@pytest.mark.test_data(
+    "filters.json",
+    description="Individual filter",
     ids=lambda d: f"{d['description']}-{d['params']}"
 )
-def test_by_applying_single_filters(api_client, create_test_booking, data):
+def test_by_applying_single_filters(api_client, shared_booking_registry, data):
     """Test Individual filters by applying firstname, lastname, checkin, checkout"""
-    booking_to_test = find_matching_bookings(create_test_booking, data["params"])
+    booking_to_test = find_matching_bookings(shared_booking_registry, data["params"])
     booking_id = booking_to_test["bookingid"]
 
     # Validate that the filtered GET /booking call returns the expected booking ID
@@ -76,15 +69,15 @@ def test_by_applying_single_filters(api_client, create_test_booking, data):
 # -----------------------------
 # Retrieve booking IDs by applying multiple filters
 # -----------------------------
-@pytest.mark.parametrize(
-    "data",
-    [d for d in filter_data if d["description"] == "Multiple filters"],
+@pytest.mark.test_data(
+    "filters.json",
+    description="Multiple filters",
     ids=lambda d: f"{d['description']}-{d['params']}"
 )
-def test_by_applying_multiple_filters(api_client, create_test_booking, data):
+def test_by_applying_multiple_filters(api_client, shared_booking_registry, data):
     """Test Multiple filters by firstname, lastname, checkin, checkout"""
     # Loop through dynamically created bookings for this test session
-    booking_to_test = find_matching_bookings(create_test_booking, data["params"])
+    booking_to_test = find_matching_bookings(shared_booking_registry, data["params"])
     booking_id = booking_to_test["bookingid"]
 
     # Validate that the filtered GET /booking call returns the expected booking ID
@@ -100,10 +93,9 @@ def test_by_applying_multiple_filters(api_client, create_test_booking, data):
 # -----------------------------
 # Error handling for invalid filter values
 # -----------------------------
-@pytest.mark.parametrize(
-    "data",
-    [d for d in filter_data if d["description"]
-     == "Invalid Value Format In filter"],
+@pytest.mark.test_data(
+    "filters.json",
+    description="Invalid Value Format In filter",
     ids=lambda d: f"{d['description']}-{d['params']}"
 )
 def test_Validate_error_handling(api_client, data):
@@ -118,28 +110,3 @@ def test_Validate_error_handling(api_client, data):
     # Typical invalid filter requests should fail with a client error
     # (most APIs return 400 Bad Request, but 404/422 are also acceptable depending on backend)
     assert response.status_code in [400, 422],f"Unexpected status code {response.status_code} for params {data['params']}"
-    
-
-
-# -----------------------------
-# Basic Performance test for GET /booking endpoint
-# -----------------------------
-def test_get_booking_performance(api_client):
-    """Basic performance validation: Response time < 2 seconds"""
-
-    # Measure start time
-    start = time.time()
-    response = api_client.get("/booking")
-
-    # Calculate elapsed time for the request
-    elapsed = time.time() - start
-
-    # Log status and timing for traceability
-    logger.info("Performance test: GET /booking (no filters)")
-    logger.info("Response status: %s, Time taken: %.2fs", response.status_code, elapsed)
-    
-    # Assert API returns 200 OK
-    assert response.status_code == 200
-
-    # Assert API responds within acceptable threshold (< 2 seconds)
-    assert elapsed < 2
@@ -1,23 +1,21 @@
 import pytest
-import json
 import logging
 from datetime import datetime
+from functools import partial
 from tests.api.utils.booking_helper import validate_updated_fields, validate_unchanged_fields
+from tests.api.utils.http_log import lazy_json
+from tests.api.utils.race import NO_CACHE, RaceHarness, consistent_reads, last_writer_wins
 
 logger = logging.getLogger(__name__)
 
-# Load update scenarios from JSON
-with open("resources/test-data/update_payloads.json") as f:
-    update_data = json.load(f)
-
 # -----------------------------
 # Update individual booking field with type validation
 # -----------------------------
 
 
-@pytest.mark.parametrize(
-    "data",
-    [d for d in update_data if d["description"] == "Update Individual Field"],
+@pytest.mark.test_data(
+    "update_payloads.json",
+    description="Update Individual Field",
     ids=lambda d: f"{d['description']}-{d['payload']}")
 def test_individual_field_update_with_type_validation(api_client, create_test_booking, data):
     """Test individual field updates with type validation"""
@@ -27,13 +25,13 @@ def test_individual_field_update_with_type_validation(api_client, create_test_bo
     payload = data["payload"]
 
     original = api_client.get(f"/booking/{booking_id}").json()
-    logger.info("Original booking:\n%s", json.dumps(original, indent=2))
+    logger.info("Original booking:\n%s", lazy_json(original))
 
     response = api_client.patch(f"/booking/{booking_id}", json=payload)
     assert response.status_code == 200, f"Unexpected status {response.status_code} for payload {payload}"
 
     updated = response.json()
-    logger.info("Updated booking:\n%s", json.dumps(updated, indent=2))
+    logger.info("Updated booking:\n%s", lazy_json(updated))
 
     # Type validation
     assert isinstance(updated["firstname"], str)
@@ -52,9 +50,9 @@ def test_individual_field_update_with_type_validation(api_client, create_test_bo
 # -----------------------------
 
 
-@pytest.mark.parametrize(
-    "data",
-    [d for d in update_data if d["description"] in ["Update Multiple Fields"]],
+@pytest.mark.test_data(
+    "update_payloads.json",
+    description=["Update Multiple Fields"],
     ids=lambda d: f"{d['description']}-{d['payload']}")
 def test_multiple_fields_get_updated(api_client, create_test_booking, data):
     """Test multiple field updates"""
@@ -64,13 +62,13 @@ def test_multiple_fields_get_updated(api_client, create_test_booking, data):
     payload = data["payload"]
 
     original = api_client.get(f"/booking/{booking_id}").json()
-    logger.info("Original booking:\n%s", json.dumps(original, indent=2))
+    logger.info("Original booking:\n%s", lazy_json(original))
 
     response = api_client.patch(f"/booking/{booking_id}", json=payload)
     assert response.status_code == 200, f"Unexpected status {response.status_code} for payload {payload}"
 
     updated = api_client.get(f"/booking/{booking_id}").json()
-    logger.info("Updated booking:\n%s", json.dumps(updated, indent=2))
+    logger.info("Updated booking:\n%s", lazy_json(updated))
 
     validate_updated_fields(updated, payload)
 
@@ -102,10 +100,9 @@ def test_non_updated_field_remains_unchanged(api_client, create_test_booking):
 # -----------------------------
 
 
-@pytest.mark.parametrize(
-    "data",
-    [d for d in update_data if d["description"]
-        == "Invalid Value Format In Update"],
+@pytest.mark.test_data(
+    "update_payloads.json",
+    description="Invalid Value Format In Update",
     ids=lambda d: f"{d['description']}-{d['payload']}")
 def test_validate_error_handling(api_client, create_test_booking, data):
     """Verify API returns correct errors for invalid updates"""
@@ -114,16 +111,12 @@ def test_validate_error_handling(api_client, create_test_booking, data):
     endpoint_id = data.get("invalid_id", booking_id)
 
     client = api_client if data.get(
-        "auth") != "none" else api_client.__class__(api_client.base_url)
+        "auth") != "none" else api_client.__class__(api_client.base_url, cassette=api_client.cassette)
 
     response = client.patch(f"/booking/{endpoint_id}", json=data["payload"])
     logger.info("Booking %s | Payload: %s | Status: %s",
                 endpoint_id, data["payload"], response.status_code)
-    try:
-        logger.info("Response:\n%s", json.dumps(response.json(), indent=2))
-    except ValueError:
-        # fallback if response is not JSON
-        logger.info("Response text: %s", response.text)
+    logger.info("Response:\n%s", lazy_json(response))
 
     assert response.status_code in [
         400, 404, 422, 401, 403], f"Unexpected status {response.status_code} for invalid case {data['description']}"
@@ -132,9 +125,9 @@ def test_validate_error_handling(api_client, create_test_booking, data):
 # -----------------------------
 # Verify idempotency of PATCH updates
 # -----------------------------
-@pytest.mark.parametrize(
-    "data",
-    [d for d in update_data if d.get("idempotent")],
+@pytest.mark.test_data(
+    "update_payloads.json",
+    where=lambda d: d.get("idempotent"),
     ids=lambda d: f"{d['description']}-{d['payload']}")
 def test_idempotency_of_updates(api_client, create_test_booking, data):
     """Verify PATCH requests are idempotent"""
@@ -148,8 +141,8 @@ def test_idempotency_of_updates(api_client, create_test_booking, data):
 
     logger.info("Booking %s | Payload: %s | Statuses: [%s, %s]",
                 booking_id, payload, first.status_code, second.status_code)
-    logger.info("First response:\n%s", json.dumps(first.json(), indent=2))
-    logger.info("Second response:\n%s", json.dumps(second.json(), indent=2))
+    logger.info("First response:\n%s", lazy_json(first))
+    logger.info("Second response:\n%s", lazy_json(second))
 
     # Idempotent update → always expect 200
     assert first.status_code == 200, f"First PATCH returned {first.status_code} unexpectedly"
@@ -158,3 +151,86 @@ def test_idempotency_of_updates(api_client, create_test_booking, data):
     # The response body should be identical for both PATCH calls
     assert first.json() == second.json(
     ), "PATCH responses are not identical for idempotent update"
+
+
+# -----------------------------
+# Concurrent PATCH races on one booking
+# -----------------------------
+def _race_patches(iteration, writers):
+    """One distinct multi-field PATCH per writer, so a torn write is detectable."""
+    return {
+        f"PATCH #{n}": {"firstname": f"Race{iteration}", "lastname": f"Writer{n}", "totalprice": iteration * 100 + n}
+        for n in range(writers)
+    }
+
+
+def _live_timings(api_client):
+    """Replayed cassette responses keep the recorded winner but get this run's timings."""
+    return api_client.cassette is None
+
+
+@pytest.fixture
+def race_booking(api_client, payload_stream):
+    """A dedicated booking for race tests, deleted afterwards."""
+    response = api_client.post("/booking", json=next(payload_stream))
+    response.raise_for_status()
+    booking_id = response.json()["bookingid"]
+    yield booking_id
+    api_client.delete(f"/booking/{booking_id}")
+
+
+def test_concurrent_patch_last_writer_wins(api_client, config, race_booking):
+    """Simultaneous PATCHes: the booking ends up as exactly one writer's payload, never a mix"""
+    race_config = config.get("race", {})
+    concurrency = race_config.get("concurrency", 8)
+    harness = RaceHarness(iterations=race_config.get("iterations", 10))
+    endpoint = f"/booking/{race_booking}"
+
+    def invariant(patches, outcomes):
+        final = api_client.get(endpoint, headers=NO_CACHE).json()
+        return last_writer_wins(final, outcomes, patches, check_order=_live_timings(api_client))
+
+    report = harness.run(
+        setup=lambda iteration: _race_patches(iteration, concurrency),
+        calls=lambda patches: [
+            (label, partial(api_client.patch, endpoint, json=payload)) for label, payload in patches.items()
+        ],
+        invariant=invariant,
+    )
+
+    logger.info("Concurrent PATCH race | %d x %d requests:\n%s",
+                harness.iterations, concurrency, lazy_json(report))
+    assert not report["violations"], f"Concurrent PATCH violated invariants: {report['violations'][:5]}"
+
+
+def test_concurrent_patch_and_get(api_client, config, race_booking):
+    """PATCHes racing GETs: every read sees the previous state or one whole PATCH"""
+    race_config = config.get("race", {})
+    concurrency = race_config.get("concurrency", 8)
+    writers = max(1, concurrency // 2)
+    harness = RaceHarness(iterations=race_config.get("iterations", 10))
+    endpoint = f"/booking/{race_booking}"
+
+    def setup(iteration):
+        initial = api_client.get(endpoint, headers=NO_CACHE).json()
+        return initial, _race_patches(iteration, writers)
+
+    def calls(target):
+        _, patches = target
+        return [
+            (label, partial(api_client.patch, endpoint, json=payload)) for label, payload in patches.items()
+        ] + [
+            ("GET /booking/{id}", partial(api_client.get, endpoint, headers=NO_CACHE))
+        ] * (concurrency - writers)
+
+    def invariant(target, outcomes):
+        initial, patches = target
+        final = api_client.get(endpoint, headers=NO_CACHE).json()
+        return consistent_reads(outcomes, initial, patches) + last_writer_wins(
+            final, outcomes, patches, check_order=_live_timings(api_client))
+
+    report = harness.run(setup=setup, calls=calls, invariant=invariant)
+
+    logger.info("Concurrent PATCH/GET race | %d x %d requests:\n%s",
+                harness.iterations, concurrency, lazy_json(report))
+    assert not report["violations"], f"Concurrent PATCH/GET violated invariants: {report['violations'][:5]}"
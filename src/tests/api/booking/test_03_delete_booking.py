@@ -1,6 +1,10 @@
 import pytest
 import logging
-import json
+from functools import partial
+
+from tests.api.utils.bulk_booking import create_bookings, delete_bookings
+from tests.api.utils.http_log import lazy_json
+from tests.api.utils.race import RaceHarness, single_delete_wins
 
 logger = logging.getLogger(__name__)
 
@@ -15,19 +19,13 @@ def test_successful_delete_and_verify(api_client, create_test_booking):
     # Delete the booking
     response = api_client.delete(f"/booking/{booking_id}")
     logger.info("Delete Response | Booking ID: %s | Status: %s", booking_id, response.status_code)
-    try:
-        logger.info("Response:\n%s", json.dumps(response.json(), indent=2))
-    except ValueError:
-        logger.info("Response text: %s", response.text)
+    logger.info("Response:\n%s", lazy_json(response))
     assert response.status_code == 201, "Expected 201 on successful delete"
 
     # Verify booking is no longer retrievable
     get_response = api_client.get(f"/booking/{booking_id}")
     logger.info("Get Booking post delete | Booking ID: %s | Status: %s", booking_id, get_response.status_code)
-    try:
-        logger.info("Response:\n%s", json.dumps(get_response.json(), indent=2))
-    except ValueError:
-        logger.info("Response text: %s", get_response.text)
+    logger.info("Response:\n%s", lazy_json(get_response))
     assert get_response.status_code == 404, "Booking should not be found after deletion"
 
 
@@ -42,10 +40,7 @@ def test_delete_non_existent_booking(api_client, invalid_id):
     """Deleting non-existent booking IDs should return 404 or 400 or 405"""
     response = api_client.delete(f"/booking/{invalid_id}")
     logger.info("Delete Response for invalid_id | ID: %s | Status: %s", invalid_id, response.status_code)
-    try:
-        logger.info("Response:\n%s", json.dumps(response.json(), indent=2))
-    except ValueError:
-        logger.info("Response text: %s", response.text)
+    logger.info("Response:\n%s", lazy_json(response))
     assert response.status_code in [400, 404, 405]
 
 
@@ -65,10 +60,7 @@ def test_delete_with_invalid_auth(api_client, create_test_booking, auth_header):
 
     response = api_client.delete(f"/booking/{booking_id}", headers=auth_header)
     logger.info("Delete Response with auth | Booking ID: %s | Status: %s | Auth: %s", booking_id, response.status_code, auth_header)
-    try:
-        logger.info("Response:\n%s", json.dumps(response.json(), indent=2))
-    except ValueError:
-        logger.info("Response text: %s", response.text)
+    logger.info("Response:\n%s", lazy_json(response))
     assert response.status_code in [401, 403, 405]
 
 
@@ -82,32 +74,42 @@ def test_idempotent_delete(api_client, create_test_booking):
     # First delete attempt
     first = api_client.delete(f"/booking/{booking_id}")
     logger.info("First delete | Booking ID: %s | Status: %s", booking_id, first.status_code)
-    try:
-        logger.info("Response:\n%s", json.dumps(first.json(), indent=2))
-    except ValueError:
-        logger.info("Response text: %s", first.text)
+    logger.info("Response:\n%s", lazy_json(first))
     assert first.status_code == 201
 
     # Second delete attempt
     second = api_client.delete(f"/booking/{booking_id}")
     logger.info("Second delete | Booking ID: %s | Status: %s", booking_id, second.status_code)
-    try:
-        logger.info("Response:\n%s", json.dumps(second.json(), indent=2))
-    except ValueError:
-        logger.info("Response text: %s", second.text)
+    logger.info("Response:\n%s", lazy_json(second))
     assert second.status_code in [404, 405]
 
 
 # -----------------------------
 # Concurrent deletion of the same booking
 # -----------------------------
-def test_concurrent_delete(api_client, create_test_booking):
-    """Concurrent deletion should be handled gracefully"""
-    booking_id = create_test_booking.pop(0)["bookingid"]
+def test_concurrent_delete(api_client, config, payload_stream):
+    """Simultaneous DELETEs of one booking: exactly one 201, the rest 404/405, every iteration"""
+    race_config = config.get("race", {})
+    concurrency = race_config.get("concurrency", 8)
+    harness = RaceHarness(iterations=race_config.get("iterations", 10))
 
-    # Fire two delete requests back-to-back
-    resp1 = api_client.delete(f"/booking/{booking_id}")
-    resp2 = api_client.delete(f"/booking/{booking_id}")
+    # One fresh booking per iteration, so every race starts from an existing booking
+    created = create_bookings(api_client, payload_stream.take(harness.iterations)).raise_for_failures()
+    booking_ids = [booking["bookingid"] for booking in created]
 
-    logger.info("Concurrent delete responses | Booking ID: %s | Statuses: [%s, %s]", booking_id, resp1.status_code, resp2.status_code)
-    assert sorted([resp1.status_code, resp2.status_code]) == [201, 404], f"Concurrent DELETE returned unexpected statuses"
+    try:
+        report = harness.run(
+            setup=lambda iteration: booking_ids[iteration],
+            calls=lambda booking_id: [
+                ("DELETE /booking/{id}", partial(api_client.delete, f"/booking/{booking_id}"))
+            ] * concurrency,
+            invariant=lambda booking_id, outcomes: single_delete_wins(outcomes),
+        )
+    finally:
+        # Only the races delete these bookings: if one raised, delete those it never reached
+        # (the interrupted iteration's booking may already be gone; that failure is ignored)
+        delete_bookings(api_client, booking_ids[harness.report()["iterations"]:])
+
+    logger.info("Concurrent delete race | %d x %d requests:\n%s",
+                harness.iterations, concurrency, lazy_json(report))
+    assert not report["violations"], f"Concurrent DELETE violated invariants: {report['violations'][:5]}"
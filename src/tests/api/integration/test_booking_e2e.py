@@ -1,8 +1,12 @@
 import pytest
-import json
+import asyncio
 import logging
-from tests.api.utils.booking_helper import validate_booking_by_id, get_bookings
+from tests.api.utils.booking_helper import (
+    validate_booking_by_id, get_bookings, get_bookings_async, validate_booking_by_id_async)
 from tests.api.utils.booking_data_builder import BookingDataBuilder
+from tests.api.utils.bulk_pipeline import (
+    pipeline_create_bookings, pipeline_delete_bookings, pipeline_patch_bookings)
+from tests.api.utils.http_log import lazy_json
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +27,7 @@ def create_e2e_booking(api_client):
 
     logger.info(
         "Booking created | ID=%s | Payload:\n%s",
-        booking_id, json.dumps(booking_data, indent=2)
+        booking_id, lazy_json(booking_data)
     )
 
     yield {"bookingid": booking_id, "data": booking_data}
@@ -48,7 +52,7 @@ def test_e2e_booking_lifecycle(api_client):
     booking_id = response.json()["bookingid"]
 
     logger.info("Booking created | ID=%s | Payload:\n%s",
-                booking_id, json.dumps(booking_data, indent=2))
+                booking_id, lazy_json(booking_data))
 
     # -------------------------------
     # 2. VERIFY VIA SINGLE FILTER (firstname)
@@ -71,7 +75,7 @@ def test_e2e_booking_lifecycle(api_client):
         f"/booking/{booking_id}", json=updated_payload)
     update_resp.raise_for_status()
     logger.info("Booking updated successfully | ID=%s | Updated Payload:\n%s",
-                booking_id, json.dumps(updated_payload, indent=2))
+                booking_id, lazy_json(updated_payload))
 
     # Update filters too
     updated_filters = {"firstname": updated_payload["firstname"]}
@@ -97,65 +101,110 @@ def test_e2e_booking_lifecycle(api_client):
 # -----------------------------
 
 
-def test_bulk_booking_operations(api_client):
+def test_bulk_booking_operations(api_client, config, payload_stream):
     """
-    Bulk operations scenario:
+    Bulk operations scenario (through the rate-limit aware bulk pipeline):
     • Create multiple bookings
     • Apply filters to retrieve subset
     • Update filtered results and validate
+    Size and concurrency: "bulk" in config.json
     """
-    created_bookings = []
+    bulk_config = config.get("bulk", {})
+    options = {"max_concurrency": bulk_config.get("max_concurrency", 16),
+               "initial_concurrency": bulk_config.get("initial_concurrency", 4)}
 
     # -------------------------------
     # 1. Create multiple bookings
     # -------------------------------
-    for _ in range(5):
-        builder = BookingDataBuilder()
-        booking_data = builder.build()
-        response = api_client.post("/booking", json=booking_data)
-        response.raise_for_status()
-        booking_id = response.json()["bookingid"]
+    created = pipeline_create_bookings(api_client, payload_stream.take(bulk_config.get("bookings", 5)), **options)
+    created_bookings = [{"id": b["bookingid"], "data": b["data"]} for b in created.succeeded]
+    logger.info("Bulk create: %s", created.stats)
+    try:
+        created.raise_for_failures()
 
-        created_bookings.append({"id": booking_id, "data": booking_data})
-        logger.info(
-            "Booking created: ID=%s, payload=%s",
-            booking_id,
-            json.dumps(booking_data, indent=2),
-        )
+        # -------------------------------
+        # 2. Filter each booking, update all & validate
+        # -------------------------------
+        for b in created_bookings:
+            filters = {"firstname": b["data"]["firstname"]}
+            filtered_ids = get_bookings(api_client, filters)
 
-    # -------------------------------
-    # 2. Filter, update & validate each booking
-    # -------------------------------
-    for b in created_bookings:
-        filters = {"firstname": b["data"]["firstname"]}
-        filtered_ids = get_bookings(api_client, filters)
+            logger.info("Filtered bookings by %s: %s", filters, filtered_ids)
+            assert b["id"] in filtered_ids, \
+                f"Booking {b['id']} not found in filtered results {filtered_ids}"
+
+        updated_payload = {"lastname": "BulkUpdated"}
+        updated = pipeline_patch_bookings(
+            api_client, [(b["id"], updated_payload) for b in created_bookings], **options)
+        logger.info("Bulk update: %s", updated.stats)
+        updated.raise_for_failures()
+
+        for b in created_bookings:
+            validate_booking_by_id(
+                api_client,
+                {"bookingid": b["id"], "data": {**b["data"], **updated_payload}},
+                {"firstname": b["data"]["firstname"]},
+            )
+            logger.info("Booking %s updated successfully with %s", b["id"], updated_payload)
+    finally:
+        # -------------------------------
+        # 3. Cleanup all created bookings
+        # -------------------------------
+        deleted = pipeline_delete_bookings(api_client, [b["id"] for b in created_bookings], **options)
+        logger.info("Bulk delete: %s", deleted.stats)
+    deleted.raise_for_failures()
+
+
+# -----------------------------
+# E2E Test: Concurrent bulk booking operations
+# -----------------------------
+def test_bulk_booking_operations_concurrent(async_api_client, payload_stream):
+    """
+    Same flow as test_bulk_booking_operations, executed concurrently:
+    • Create bookings in parallel (bounded by async_max_concurrency)
+    • Filter, update & validate each booking in parallel
+    • Delete all bookings in parallel
+    """
+    booking_count = 20
 
-        logger.info("Filtered bookings by %s: %s", filters, filtered_ids)
+    async def create(booking_data):
+        response = await async_api_client.post("/booking", json=booking_data)
+        response.raise_for_status()
+        return {"id": response.json()["bookingid"], "data": booking_data}
+
+    async def filter_update_validate(b):
+        filters = {"firstname": b["data"]["firstname"]}
+        filtered_ids = await get_bookings_async(async_api_client, filters)
         assert b["id"] in filtered_ids, \
             f"Booking {b['id']} not found in filtered results {filtered_ids}"
 
         updated_payload = {"lastname": "BulkUpdated"}
-        resp_update = api_client.patch(f"/booking/{b['id']}", json=updated_payload)
+        resp_update = await async_api_client.patch(f"/booking/{b['id']}", json=updated_payload)
         assert resp_update.status_code == 200, \
             f"Unexpected status {resp_update.status_code} for booking {b['id']}"
 
-        # Validate booking after update
-        validate_booking_by_id(
-            api_client,
+        await validate_booking_by_id_async(
+            async_api_client,
             {"bookingid": b["id"], "data": {**b["data"], **updated_payload}},
             filters,
         )
-        logger.info("Booking %s updated successfully with %s", b["id"], updated_payload)
 
-    # -------------------------------
-    # 3. Cleanup all created bookings
-    # -------------------------------
-    for b in created_bookings:
-        resp_del = api_client.delete(f"/booking/{b['id']}")
-        assert resp_del.status_code in [200, 201, 204], \
-            f"Unexpected delete status {resp_del.status_code} for booking {b['id']}"
-        logger.info("Booking %s deleted successfully", b["id"])
+    async def scenario():
+        payloads = payload_stream.take(booking_count)
+        created = await async_api_client.map(create, payloads, return_exceptions=True)
+        created_bookings = [b for b in created if isinstance(b, dict)]
+        try:
+            errors = [e for e in created if not isinstance(e, dict)]
+            assert not errors, f"{len(errors)} booking(s) failed to create: {errors[:3]}"
+            await async_api_client.map(filter_update_validate, created_bookings)
+        finally:
+            deletes = await async_api_client.map(
+                lambda b: async_api_client.delete(f"/booking/{b['id']}"), created_bookings)
+        statuses = [r.status_code for r in deletes]
+        logger.info("Concurrently processed %d bookings | delete statuses: %s", len(created_bookings), statuses)
+        assert all(code in [200, 201, 204] for code in statuses), f"Unexpected delete statuses {statuses}"
 
+    asyncio.run(scenario())
 
 
 # -----------------------------
@@ -177,7 +226,7 @@ def test_cross_endpoint_consistency(api_client, create_e2e_booking):
     booking_by_id = resp_by_id.json()
     logger.info(
         "Booking fetched by ID | ID=%s | Data:\n%s",
-        booking_id, json.dumps(booking_by_id, indent=2)
+        booking_id, lazy_json(booking_by_id)
     )
 
     # -------------------------------
@@ -193,7 +242,7 @@ def test_cross_endpoint_consistency(api_client, create_e2e_booking):
     booking_filtered = resp_filtered.json()
     logger.info(
         "Booking fetched via filter | ID=%s | Data:\n%s",
-        booking_id, json.dumps(booking_filtered, indent=2)
+        booking_id, lazy_json(booking_filtered)
     )
 
     # -------------------------------
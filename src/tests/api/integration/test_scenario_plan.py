@@ -0,0 +1,40 @@
+import pytest
+import functools
+import logging
+
+from tests.api.utils.data_loader import load_cases
+from tests.api.utils.http_log import lazy_json
+from tests.api.utils.scenario_engine import compile_plan, run_plan
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Data-driven scenario plan: every filters.json / update_payloads.json case,
+# compiled into one plan (shared bookings, deduplicated reads, concurrent
+# stages) and executed once; each case still reports as its own test.
+# Enabled with --scenario-plan
+# -----------------------------
+@functools.cache
+def _plan():
+    return compile_plan(load_cases("filters.json"), load_cases("update_payloads.json"))
+
+
+def pytest_generate_tests(metafunc):
+    if "scenario_id" in metafunc.fixturenames:
+        metafunc.parametrize("scenario_id", [scenario.id for scenario in _plan().scenarios])
+
+
+@pytest.fixture(scope="module")
+def scenario_run(pytestconfig, config, api_client):
+    """Run the whole plan once for this module's tests."""
+    if not pytestconfig.getoption("--scenario-plan"):
+        pytest.skip("Scenario plan disabled; run with --scenario-plan")
+    result = run_plan(api_client, _plan(), max_workers=config.get("fixture_parallelism", 8))
+    logger.info("Scenario plan summary:\n%s", lazy_json(result.summary()))
+    return result
+
+
+def test_scenario(scenario_run, scenario_id):
+    """One compiled filters.json / update_payloads.json case"""
+    result = scenario_run.results[scenario_id]
+    assert result.ok, result.error
@@ -0,0 +1,49 @@
+import pytest
+import logging
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.load_runner import LoadRunner, render_html_table, write_report
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Load mode: replay the E2E booking lifecycle under load
+# Enabled with --load-duration=<seconds>; see `pytest --help` (load group)
+# -----------------------------
+@pytest.mark.load
+def test_booking_lifecycle_load(pytestconfig, config, token_provider, booking_journal, payload_stream, report_section):
+    """Create → Filter → Update → Delete at the configured concurrency / RPS"""
+    duration = pytestconfig.getoption("--load-duration")
+    if not duration:
+        pytest.skip("Load mode disabled; run with --load-duration=<seconds>")
+
+    concurrency = pytestconfig.getoption("--load-concurrency")
+    target_rps = pytestconfig.getoption("--load-rps")
+    max_error_rate = pytestconfig.getoption("--load-max-error-rate")
+
+    # Dedicated client so every worker thread gets its own pooled connection
+    pool_settings = dict(config.get("http_pool", {}))
+    pool_settings["pool_maxsize"] = max(pool_settings.get("pool_maxsize", 0), concurrency)
+    client = ApiClient(config["base_url"], pool_settings=pool_settings, token_provider=token_provider,
+                       booking_journal=booking_journal)
+
+    # Seeded payloads: runs with the same --payload-seed send the same bookings
+    report = LoadRunner(
+        client, duration=duration, concurrency=concurrency, target_rps=target_rps,
+        payloads=payload_stream).run()
+    report["payload_stream"] = payload_stream.checkpoint()
+
+    write_report(report, pytestconfig.getoption("--load-report"))
+    report_section("load", render_html_table(report))
+    logger.info("Load run: %s req in %ss (%s req/s), error rate %.2f%%",
+                report["requests"], report["duration_s"], report["throughput_rps"],
+                report["error_rate"] * 100)
+    for label, stats in report["endpoints"].items():
+        logger.info("%-22s p50=%sms p95=%sms p99=%sms max=%sms errors=%s",
+                    label, stats["p50_ms"], stats["p95_ms"], stats["p99_ms"],
+                    stats["max_ms"], stats["errors"])
+
+    assert report["requests"] > 0, "Load run issued no requests"
+    assert not report["scenario_errors"], f"Scenario iterations raised: {report['scenario_errors']}"
+    assert report["error_rate"] <= max_error_rate, \
+        f"Error rate {report['error_rate']:.2%} above {max_error_rate:.2%}: {report['endpoints']}"
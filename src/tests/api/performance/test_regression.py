@@ -0,0 +1,153 @@
+import pytest
+import logging
+import os
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.booking_data_builder import BookingDataBuilder
+from tests.api.utils.bulk_booking import create_bookings, delete_bookings
+from tests.api.utils.data_loader import load_cases
+from tests.api.utils.load_runner import write_report
+from tests.api.utils.perf_baseline import (
+    BaselineStore, baseline_entry, compare, endpoint_name, environment_name, measure, render_regression_html,
+    summarize)
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Performance regression suite: warmup + measured calls per endpoint,
+# compared with the stored per-environment baseline (Mann-Whitney on
+# batch p95s) instead of a fixed threshold.
+# Enabled with --regression (record with --update-baseline); run with -n 0
+# -----------------------------
+BOOKING_METHODS = ("GET", "PATCH", "PUT", "DELETE")
+
+
+def _endpoints():
+    """(name, kind, filters.json case) per benchmarked call; GET /booking once per distinct query."""
+    endpoints = [("GET /ping", "ping", None), ("POST /auth", "auth", None)]
+    seen = set()
+    for case in load_cases("filters.json"):
+        name = endpoint_name("GET", "/booking", case.get("params"))
+        if name not in seen:
+            seen.add(name)
+            endpoints.append((name, "filter", case))
+    endpoints += [(endpoint_name(method, "/booking/{id}"), method.lower(), None) for method in BOOKING_METHODS]
+    return endpoints
+
+
+def pytest_generate_tests(metafunc):
+    if "endpoint" in metafunc.fixturenames:
+        endpoints = _endpoints()
+        metafunc.parametrize("endpoint", endpoints, ids=[name for name, _, _ in endpoints])
+
+
+@pytest.fixture(scope="module")
+def regression(pytestconfig, config, cassette, token_provider, report_section):
+    """Settings, client and baseline store of the run; writes the verdicts at module teardown."""
+    if not pytestconfig.getoption("--regression"):
+        pytest.skip("Regression benchmarks disabled; run with --regression")
+    if int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1")) > 1:
+        pytest.skip("Regression benchmarks need a quiet client; run with -n 0")
+    if cassette is not None:
+        pytest.skip("Regression benchmarks measure the API, not the cassette; run with --cassette-mode=off")
+
+    settings = config.get("regression", {})
+    environment = (pytestconfig.getoption("--baseline-env") or settings.get("environment")
+                   or environment_name(config["base_url"]))
+    run = {
+        # no response cache / HTTP log: only the API and the connection pool are measured
+        "client": ApiClient(config["base_url"], pool_settings=config.get("http_pool"),
+                            token_provider=token_provider),
+        "credentials": {"username": config["username"], "password": config["password"]},
+        "store": BaselineStore(settings.get("baseline_dir", "resources/baselines"), environment),
+        "update": pytestconfig.getoption("--update-baseline"),
+        "iterations": pytestconfig.getoption("--regression-iterations") or settings.get("iterations", 200),
+        "warmup": settings.get("warmup", 20),
+        "batch_size": settings.get("batch_size", 20),
+        "alpha": settings.get("alpha", 0.01),
+        "min_increase": settings.get("min_increase", 0.1),
+        "min_delta_ms": settings.get("min_delta_ms", 2.0),
+        "verdicts": {},
+    }
+    yield run
+
+    if run["verdicts"]:
+        write_report({"environment": environment, "base_url": config["base_url"], "endpoints": run["verdicts"]},
+                     pytestconfig.getoption("--regression-report"))
+        report_section("regression", render_regression_html(environment, run["verdicts"]))
+
+
+@pytest.fixture(scope="module")
+def target_booking(regression):
+    """Booking used by GET/PATCH/PUT /booking/{id}"""
+    client = regression["client"]
+    response = client.post("/booking", json=BookingDataBuilder().build())
+    assert response.status_code == 200, f"Booking creation failed: {response.status_code}"
+    booking_id = response.json()["bookingid"]
+    yield booking_id
+    client.delete(f"/booking/{booking_id}")
+
+
+def _measure(regression, kind, case, request):
+    client = regression["client"]
+    iterations, warmup = regression["iterations"], regression["warmup"]
+
+    if kind == "ping":
+        return measure(lambda i: client.get("/ping"), iterations, warmup, expected=(201,))
+    if kind == "auth":
+        return measure(lambda i: client.post("/auth", json=regression["credentials"]),
+                       iterations, warmup, expected=(200,))
+    if kind == "filter":
+        # realistic result sets: the filters.json bookings exist while filtering
+        request.getfixturevalue("shared_booking_registry")
+        params = case.get("params") or None
+        # invalid filters are timed whatever they answer; their statuses are the functional tests' concern
+        expected = (200,) if case.get("valid") or not params else None
+        return measure(lambda i: client.get("/booking", params=params), iterations, warmup, expected=expected)
+    if kind == "delete":
+        payloads = BookingDataBuilder.build_many(warmup + iterations)
+        created = create_bookings(client, payloads, max_workers=8)
+        remaining = [booking["bookingid"] for booking in created.succeeded]
+        created.raise_for_failures()
+        try:
+            return measure(lambda i: client.delete(f"/booking/{remaining.pop()}"),
+                           iterations, warmup, expected=(201,))
+        finally:
+            delete_bookings(client, remaining, max_workers=8)
+
+    endpoint = f"/booking/{request.getfixturevalue('target_booking')}"
+    if kind == "get":
+        return measure(lambda i: client.get(endpoint), iterations, warmup, expected=(200,))
+    if kind == "patch":
+        return measure(lambda i: client.patch(endpoint, json={"firstname": f"Perf{i}"}),
+                       iterations, warmup, expected=(200,))
+    booking = BookingDataBuilder().build()
+    return measure(lambda i: client.put(endpoint, json={**booking, "totalprice": i}),
+                   iterations, warmup, expected=(200,))
+
+
+@pytest.mark.regression
+def test_endpoint_latency(regression, endpoint, request):
+    """Endpoint p95 must not regress significantly against the stored baseline"""
+    name, kind, case = endpoint
+    store = regression["store"]
+    baseline = store.get(name)
+    if baseline is None and not regression["update"]:
+        pytest.skip(f"No {store.environment} baseline for {name}; record one with --update-baseline")
+    samples = _measure(regression, kind, case, request)
+
+    if regression["update"]:
+        store.update(name, baseline_entry(samples, regression["batch_size"], regression["warmup"]))
+        regression["verdicts"][name] = summarize(samples)
+        logger.info("Baseline recorded for %s (%s): %s", name, store.environment, summarize(samples))
+        return
+
+    verdict = compare(baseline, samples, alpha=regression["alpha"], min_increase=regression["min_increase"],
+                      min_delta_ms=regression["min_delta_ms"])
+    regression["verdicts"][name] = verdict
+    logger.info("%s: p95 %sms vs baseline %sms (%+.1f%%), p=%s",
+                name, verdict["p95_ms"], verdict["baseline_p95_ms"], verdict["change"] * 100, verdict["p_value"])
+
+    assert not verdict["regression"], (
+        f"{name} regressed: median batch p95 {verdict['p95_ms']}ms vs baseline {verdict['baseline_p95_ms']}ms "
+        f"({verdict['delta_ms']:+}ms, {verdict['change']:+.1%}, Mann-Whitney p={verdict['p_value']} < {regression['alpha']})")
@@ -0,0 +1,45 @@
+import pytest
+import logging
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.load_runner import write_report
+from tests.api.utils.soak_runner import SoakRunner, render_soak_html, soak_violations
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Soak mode: keep the E2E booking lifecycle running for hours
+# Enabled with --soak-duration=<seconds>; thresholds under "soak" in config.json
+# -----------------------------
+@pytest.mark.soak
+def test_booking_lifecycle_soak(pytestconfig, config, token_provider, booking_journal, payload_stream, report_section):
+    """Create → Filter → Update → Delete continuously; fail on p99 drift, client leaks or orphans"""
+    duration = pytestconfig.getoption("--soak-duration")
+    if not duration:
+        pytest.skip("Soak mode disabled; run with --soak-duration=<seconds>")
+
+    concurrency = pytestconfig.getoption("--soak-concurrency")
+    soak_config = config.get("soak", {})
+
+    pool_settings = dict(config.get("http_pool", {}))
+    pool_settings["pool_maxsize"] = max(pool_settings.get("pool_maxsize", 0), concurrency)
+    client = ApiClient(config["base_url"], pool_settings=pool_settings, token_provider=token_provider,
+                       booking_journal=booking_journal)
+
+    report = SoakRunner(
+        client, window=pytestconfig.getoption("--soak-window"),
+        warmup_windows=soak_config.get("warmup_windows", 1), min_trend_span=soak_config.get("min_trend_span_s", 600),
+        duration=duration, concurrency=concurrency, payloads=payload_stream).run()
+    report["payload_stream"] = payload_stream.checkpoint()
+
+    write_report(report, pytestconfig.getoption("--soak-report"))
+    report_section("soak", render_soak_html(report))
+    for window in report["windows"]:
+        logger.info("t=%ss requests=%s errors=%s p99=%sms rss=%sMB fds=%s sockets=%s outstanding=%s",
+                    window["t_s"], window["requests"], window["errors"], window["p99_ms"],
+                    window["rss_mb"], window["fds"], window["sockets"], window["outstanding"])
+    logger.info("Soak trends per hour: %s | orphans: %s", report["trends"], report["orphans"])
+
+    assert report["requests"] > 0, "Soak run issued no requests"
+    violations = soak_violations(report, soak_config)
+    assert not violations, f"Soak thresholds exceeded: {violations}"
@@ -1,71 +1,183 @@
-import requests
+import time
+
+from tests.api.utils.http_pool import get_shared_session, thread_connections_opened
+from tests.api.utils.metrics import api_metrics
 
 """
 ApiClient class
 
 Wrapper around `requests` to simplify API calls.
 - Handles base URL and auth token (as Cookie).
+- Sends every call through a pooled keep-alive session (see http_pool.py),
+  shared by all clients created with the same pool settings.
+- Records latency, status, bytes and connection reuse of every call into
+  `metrics` (process-wide api_metrics by default, None to disable).
+- Optional `token_provider` (see auth_helper.TokenCache.provider) keeps the
+  token current and retries a request once with a fresh token when the
+  API rejects it (401, or 403 as Booker does for expired tokens). The
+  token and its headers are swapped as one (token, headers) pair, so
+  threads sharing a client never send a half-updated set.
+- Optional `response_cache` (see response_cache.py) serves repeated GETs
+  from an LRU cache and drops entries when a write touches the resource.
+- Optional `cassette` (see cassette.py) records responses to disk and
+  replays them without network.
+- Optional `http_log` (see http_log.HttpLog) logs sampled calls with their
+  bodies as structured records, formatted only when a handler emits them.
+- Optional `booking_journal` (see booking_journal.py) journals the bookings
+  it creates, updates and deletes, so an interrupted run's leftovers can
+  be swept by the next one.
+- GET supports `stream=True` for large bodies (see booking_ids.py); such
+  calls record time to headers and the Content-Length as bytes in.
 - Provides helper methods: GET, POST, PATCH, PUT, DELETE.
 """
+AUTH_RETRY_STATUSES = (401, 403)
+
+
 class ApiClient:
-    def __init__(self, base_url, auth_token=None):
+    def __init__(self, base_url, auth_token=None, session=None, pool_settings=None, metrics=api_metrics,
+                 token_provider=None, cassette=None, response_cache=None, http_log=None, booking_journal=None):
         self.base_url = base_url.rstrip("/")
+        self.pool_settings = pool_settings or {}
+        self.session = session or get_shared_session(**self.pool_settings)
+        self.metrics = metrics
+        self.token_provider = token_provider
+        self.cassette = cassette
+        self.response_cache = response_cache
+        self.http_log = http_log
+        self.booking_journal = booking_journal
+        if auth_token is None and token_provider is not None:
+            auth_token = token_provider()
         self.auth_token = auth_token
 
-    def _headers(self):
-        """Build default headers (adds Cookie if auth_token is set)."""
+    @property
+    def auth_token(self):
+        return self._auth[0]
+
+    @auth_token.setter
+    def auth_token(self, token):
+        """Store token and precompute the default headers once per token."""
         headers = {"Content-Type": "application/json"}
-        if self.auth_token:
+        if token:
             # Booker API expects token as cookie
-            headers["Cookie"] = f"token={self.auth_token}"
-        return headers
+            headers["Cookie"] = f"token={token}"
+        self._auth = (token, headers)  # one assignment: readers see the old pair or the new one
 
-    # GET request
-    def get(self, endpoint, params=None):
-        """Send GET request with optional query parameters."""
-        return requests.get(
-            f"{self.base_url}{endpoint}",
-            headers=self._headers(),
-            params=params
+    def _headers(self):
+        """Return default headers (includes Cookie if auth_token is set)."""
+        return self._auth[1]
+
+    def _refresh_token(self, rejected=None):
+        """
+        Adopt the provider's current token (a new one if `rejected` was refused).
+        TokenCache answers from memory without locking while its token is
+        fresh, so this only blocks when the token expired or was rejected.
+        """
+        token = self.token_provider(rejected=rejected)
+        if token != self._auth[0]:
+            self.auth_token = token
+
+    def _request(self, method, endpoint, extra_headers=None, **kwargs):
+        """Answer from the response cache when enabled, otherwise send the request."""
+        if self.response_cache is not None:
+            return self.response_cache.fetch(
+                method, endpoint, extra_headers, kwargs,
+                lambda: self._request_with_auth_retry(method, endpoint, extra_headers, **kwargs),
+                authenticated=bool(self._auth[0]))
+        return self._request_with_auth_retry(method, endpoint, extra_headers, **kwargs)
+
+    def _request_with_auth_retry(self, method, endpoint, extra_headers=None, **kwargs):
+        """
+        Send one request through the pooled session and record its metrics.
+        With a token_provider, a 401/403 on a request authenticated by our own
+        cookie is retried once with a freshly issued token.
+        """
+        if self.token_provider is not None:
+            self._refresh_token()
+        token = self._auth[0]
+        response = self._send(method, endpoint, extra_headers, **kwargs)
+
+        if (self.token_provider is not None and token
+                and response.status_code in AUTH_RETRY_STATUSES
+                and not (extra_headers and "Cookie" in extra_headers)):
+            response.close()
+            self._refresh_token(rejected=token)
+            response = self._send(method, endpoint, extra_headers, **kwargs)
+        return response
+
+    def _send(self, method, endpoint, extra_headers=None, **kwargs):
+        """
+        Replay/record through the cassette when one is set, otherwise go to
+        the network; the call is handed to http_log and booking writes to
+        booking_journal when those are set.
+        """
+        start = time.perf_counter()
+        if self.cassette is not None:
+            response = self.cassette.play(
+                method, self.base_url, endpoint, extra_headers, kwargs,
+                lambda: self._send_live(method, endpoint, extra_headers, **kwargs),
+                authenticated=bool(self._auth[0]))
+        else:
+            response = self._send_live(method, endpoint, extra_headers, **kwargs)
+        if self.http_log is not None:
+            self.http_log.record(method, endpoint, response, time.perf_counter() - start,
+                                 streamed=kwargs.get("stream", False))
+        if self.booking_journal is not None and method != "GET":
+            self.booking_journal.record(method, endpoint, response)
+        return response
+
+    def _send_live(self, method, endpoint, extra_headers=None, **kwargs):
+        headers = self._headers()
+        if extra_headers:
+            headers = {**headers, **extra_headers}
+        url = f"{self.base_url}{endpoint}"
+        if self.metrics is None:
+            return self.session.request(method, url, headers=headers, **kwargs)
+
+        opened_before = thread_connections_opened()
+        start = time.perf_counter()
+        response = self.session.request(method, url, headers=headers, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        body = response.request.body
+        if kwargs.get("stream"):
+            bytes_in = int(response.headers.get("Content-Length", 0))  # body not read yet
+        else:
+            bytes_in = len(response.content)
+        self.metrics.record(
+            method,
+            endpoint,
+            response.status_code,
+            elapsed,
+            bytes_out=len(body) if body else 0,
+            bytes_in=bytes_in,
+            new_connection=thread_connections_opened() != opened_before,
         )
+        return response
+
+    # GET request
+    def get(self, endpoint, params=None, headers=None, stream=False):
+        """
+        Send GET request with optional query parameters and extra headers.
+        With `stream=True` the body is left unread for incremental parsing.
+        """
+        return self._request("GET", endpoint, extra_headers=headers, params=params, stream=stream)
 
     # POST request
     def post(self, endpoint, data=None, json=None):
         """Send POST request with data or JSON payload."""
-        return requests.post(
-            f"{self.base_url}{endpoint}",
-            headers=self._headers(),
-            data=data,
-            json=json
-        )
+        return self._request("POST", endpoint, data=data, json=json)
 
     # PATCH request
     def patch(self, endpoint, data=None, json=None):
         """Send PATCH request for partial updates."""
-        return requests.patch(
-            f"{self.base_url}{endpoint}",
-            headers=self._headers(),
-            data=data,
-            json=json
-        )
+        return self._request("PATCH", endpoint, data=data, json=json)
 
     # PUT request (optional, for full updates)
     def put(self, endpoint, data=None, json=None):
         """Send PUT request for full updates/replacements."""
-        return requests.put(
-            f"{self.base_url}{endpoint}",
-            headers=self._headers(),
-            data=data,
-            json=json
-        )
+        return self._request("PUT", endpoint, data=data, json=json)
 
     # DELETE request
     def delete(self, endpoint, headers=None):
         """Send DELETE request with optional custom headers."""
-        final_headers = self._headers()
-        if headers:
-            final_headers.update(headers)
-        return requests.delete(
-            f"{self.base_url}{endpoint}",
-            headers=final_headers
-        )
+        return self._request("DELETE", endpoint, extra_headers=headers)
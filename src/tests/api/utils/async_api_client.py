@@ -0,0 +1,128 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.http_pool import DEFAULT_POOL_SETTINGS
+
+"""
+AsyncApiClient class
+
+asyncio variant of ApiClient with the same get/post/patch/put/delete surface.
+- Each call runs the pooled ApiClient on a dedicated worker thread, so
+  responses are ordinary `requests.Response` objects and every existing
+  helper/validator keeps working.
+- A semaphore bounds the number of in-flight requests (max_concurrency);
+  the HTTP pool is sized so every in-flight request gets its own connection.
+- gather()/map() schedule many calls at once while respecting the limit.
+
+Usage:
+    async with AsyncApiClient.from_client(api_client, max_concurrency=20) as client:
+        responses = await client.map(lambda p: client.post("/booking", json=p), payloads)
+"""
+class AsyncApiClient:
+    def __init__(self, base_url, auth_token=None, max_concurrency=10, session=None, pool_settings=None,
+                 token_provider=None, cassette=None, response_cache=None, http_log=None, booking_journal=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        settings = dict(pool_settings or {})
+        settings["pool_maxsize"] = max(
+            settings.get("pool_maxsize", DEFAULT_POOL_SETTINGS["pool_maxsize"]), max_concurrency)
+
+        self.max_concurrency = max_concurrency
+        self.client = ApiClient(base_url, auth_token=auth_token, session=session, pool_settings=settings,
+                                token_provider=token_provider, cassette=cassette,
+                                response_cache=response_cache, http_log=http_log,
+                                booking_journal=booking_journal)
+        self._semaphore = None
+        self._loop = None
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="async-api")
+
+    @classmethod
+    def from_client(cls, api_client, max_concurrency=10):
+        """
+        Build an async client sharing base URL, token (provider), pool settings,
+        cassette, cache, HTTP log and booking journal with `api_client`.
+        """
+        return cls(
+            api_client.base_url,
+            auth_token=api_client.auth_token,
+            max_concurrency=max_concurrency,
+            pool_settings=api_client.pool_settings,
+            token_provider=api_client.token_provider,
+            cassette=api_client.cassette,
+            response_cache=api_client.response_cache,
+            http_log=api_client.http_log,
+            booking_journal=api_client.booking_journal,
+        )
+
+    @property
+    def base_url(self):
+        return self.client.base_url
+
+    @property
+    def auth_token(self):
+        return self.client.auth_token
+
+    @auth_token.setter
+    def auth_token(self, token):
+        self.client.auth_token = token
+
+    def _get_semaphore(self):
+        """Semaphores are bound to one event loop; create one per running loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _call(self, method, *args, **kwargs):
+        """Run one ApiClient call on the worker pool once a concurrency slot is free."""
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, partial(getattr(self.client, method), *args, **kwargs))
+
+    # GET request
+    async def get(self, endpoint, params=None, headers=None):
+        """Send GET request with optional query parameters and extra headers."""
+        return await self._call("get", endpoint, params=params, headers=headers)
+
+    # POST request
+    async def post(self, endpoint, data=None, json=None):
+        """Send POST request with data or JSON payload."""
+        return await self._call("post", endpoint, data=data, json=json)
+
+    # PATCH request
+    async def patch(self, endpoint, data=None, json=None):
+        """Send PATCH request for partial updates."""
+        return await self._call("patch", endpoint, data=data, json=json)
+
+    # PUT request
+    async def put(self, endpoint, data=None, json=None):
+        """Send PUT request for full updates/replacements."""
+        return await self._call("put", endpoint, data=data, json=json)
+
+    # DELETE request
+    async def delete(self, endpoint, headers=None):
+        """Send DELETE request with optional custom headers."""
+        return await self._call("delete", endpoint, headers=headers)
+
+    # Scheduling helpers
+    async def gather(self, *coros, return_exceptions=False):
+        """Run coroutines concurrently; in-flight requests stay bounded by the semaphore."""
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+    async def map(self, fn, items, return_exceptions=False):
+        """Apply coroutine function `fn` to every item concurrently, preserving order."""
+        return await self.gather(*(fn(item) for item in items), return_exceptions=return_exceptions)
+
+    def close(self):
+        """Stop the worker threads (the shared HTTP pool stays open)."""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,16 +1,125 @@
-import requests
+import hashlib
+import json
+import os
+import threading
+import time
+
+from filelock import FileLock
+
+from tests.api.utils.api_client import ApiClient
+
 """
 AuthenticationHelper class
 
 Utility for handling authentication.
 - Provides method to fetch auth token from API.
+- TokenCache shares tokens between xdist workers and separate runs:
+  an on-disk JSON file guarded by a file lock, keyed by base_url+username,
+  with a TTL and proactive refresh once `refresh_ratio` of the TTL has passed.
+  Each process keeps an in-memory copy, read without locking while the
+  token is fresh, so locks and the file are only touched when a token is
+  missing, due for refresh or rejected by the API.
+- TokenCache.provider() returns the callable ApiClient uses to pick up
+  refreshed tokens and to retry once on 401/403.
 """
 class AuthenticationHelper:
-    @staticmethod    
-    def get_token(base_url, username, password):
+    @staticmethod
+    def get_token(base_url, username, password, cassette=None):
         """Send credentials to /auth endpoint and return token."""
-        url = f"{base_url}/auth"
         payload = {"username": username, "password": password}
-        response = requests.post(url, json=payload)
+        response = ApiClient(base_url, cassette=cassette).post("/auth", json=payload)
         response.raise_for_status()
         return response.json().get("token")
+
+
+DEFAULT_TOKEN_CACHE = os.path.join(".pytest_cache", "booker", "tokens.json")
+
+
+class TokenCache:
+    def __init__(self, path=DEFAULT_TOKEN_CACHE, ttl=600, refresh_ratio=0.8, fetch=AuthenticationHelper.get_token):
+        self.path = path
+        self.ttl = ttl
+        self.refresh_after = ttl * refresh_ratio
+        self.fetch = fetch
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = FileLock(f"{path}.lock")
+        self._memory = {}
+        self._memory_lock = threading.Lock()
+
+    @staticmethod
+    def _key(base_url, username):
+        return hashlib.sha256(f"{base_url.rstrip('/')}\0{username}".encode()).hexdigest()
+
+    def _fresh(self, entry):
+        return entry is not None and time.time() - entry["issued_at"] < self.refresh_after
+
+    def _valid(self, entry):
+        return entry is not None and time.time() - entry["issued_at"] < self.ttl
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, base_url, username, password, force_refresh=False, rejected=None):
+        """
+        Return a valid token, fetching a new one only when forced or when the
+        cached token is missing, past its refresh point, or equal to `rejected`
+        (a token the API just refused; another worker may already have
+        replaced it, in which case that replacement is reused).
+        A fresh token is read from memory without locking; one past its
+        refresh point but not expired keeps being returned to other threads
+        while one of them fetches the replacement.
+        """
+        key = self._key(base_url, username)
+        # lock-free hot path: entries are replaced whole, never mutated in place
+        entry = self._memory.get(key)
+        if not force_refresh and entry is not None and entry["token"] != rejected:
+            if self._fresh(entry):
+                return entry["token"]
+            if self._valid(entry):
+                if not self._memory_lock.acquire(blocking=False):
+                    return entry["token"]  # not expired yet, and another thread is refreshing it
+                self._memory_lock.release()
+
+        with self._memory_lock:
+            entry = self._memory.get(key)  # another thread may have refreshed it meanwhile
+            if not force_refresh and self._fresh(entry) and entry["token"] != rejected:
+                return entry["token"]
+
+            with self.lock:
+                entries = self._read()
+                entry = entries.get(key)
+                if force_refresh or not self._fresh(entry) or entry["token"] == rejected:
+                    token = self.fetch(base_url, username, password)
+                    if not token:
+                        return token  # bad credentials: nothing worth caching
+                    entry = {"token": token, "issued_at": time.time()}
+                    entries = {k: v for k, v in entries.items() if time.time() - v["issued_at"] < self.ttl}
+                    entries[key] = entry
+                    self._write(entries)
+            self._memory[key] = entry
+            return entry["token"]
+
+    def invalidate(self, base_url, username):
+        """Drop the cached token everywhere (memory and disk)."""
+        key = self._key(base_url, username)
+        with self._memory_lock, self.lock:
+            self._memory.pop(key, None)
+            entries = self._read()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def provider(self, base_url, username, password):
+        """Callable for ApiClient(token_provider=...): provider(rejected=None) → token."""
+        def token_provider(rejected=None):
+            return self.get(base_url, username, password, rejected=rejected)
+        return token_provider
@@ -1,6 +1,12 @@
 from faker import Faker
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, date
+import itertools
+import json
 import random
+import secrets
+import threading
+
+import numpy as np
 
 faker = Faker()
 
@@ -11,7 +17,49 @@ Generates dynamic booking payloads for testing.
 - Uses Faker to create realistic defaults (names, dates, prices).
 - Supports overriding fields with custom params (e.g., from filters.json).
 - Provides `build()` to return final booking dictionary.
+- Provides `build_many()` for bulk generation (load/soak runs): fields are
+  drawn as NumPy columns per chunk of CHUNK_SIZE (names from pre-sampled
+  Faker pools, dates from a pre-formatted lookup table) and payloads are
+  built lazily, as new dicts or as pre-serialized JSON bytes.
+- PayloadStream → seeded, resumable payload sequence for reproducible
+  performance runs: payload i depends only on (seed, start date, params, i),
+  can be checkpointed by index and sharded across xdist workers without
+  overlap. build_many(n, seed=s) is the first n payloads of stream s.
+- base_date → anchor for generated dates (None = today); pinned when
+  replaying cassettes so payloads match the recording day.
 """
+ADDITIONAL_NEEDS = ("Breakfast", "Lunch", "Dinner", "None")
+NAME_POOL_SIZE = 1000
+BATCH_SIZE = 10_000
+CHUNK_SIZE = 256
+CHECKIN_WINDOW_DAYS = 30
+MAX_STAY_DAYS = 7
+
+# Field → coercion applied to overrides (same rules as _apply_params)
+FIELD_TYPES = {
+    "firstname": str,
+    "lastname": str,
+    "totalprice": int,
+    "depositpaid": bool,
+    "checkin": str,
+    "checkout": str,
+    "additionalneeds": str,
+}
+
+# Anchor for generated check-in dates; None means today
+base_date = None
+
+
+def get_base_date():
+    return base_date or date.today()
+
+
+_JSON_TEMPLATE = (
+    '{"firstname":%s,"lastname":%s,"totalprice":%s,"depositpaid":%s,'
+    '"bookingdates":{"checkin":%s,"checkout":%s},"additionalneeds":%s}'
+)
+
+
 class BookingDataBuilder:
     def __init__(self, params: dict = None):
         """
@@ -25,7 +73,8 @@ class BookingDataBuilder:
         self.depositpaid = random.choice([True, False])
 
         # Generate future check-in/check-out dates
-        checkin_date = faker.date_between(start_date="today", end_date="+30d")
+        start = get_base_date()
+        checkin_date = faker.date_between(start_date=start, end_date=start + timedelta(days=30))
         checkout_date = checkin_date + timedelta(days=random.randint(1, 7))
         self.checkin = checkin_date.strftime("%Y-%m-%d")
         self.checkout = checkout_date.strftime("%Y-%m-%d")
@@ -67,3 +116,180 @@ class BookingDataBuilder:
             },
             "additionalneeds": self.additionalneeds
         }
+
+    @staticmethod
+    def build_many(n: int, params: dict = None, seed: int = None, as_json: bool = False):
+        """
+        Lazily yield `n` booking payloads with the same value ranges as build().
+        `params` overrides fields for every payload; `seed` makes the sequence
+        reproducible; `as_json=True` yields compact UTF-8 JSON bytes instead of
+        dicts (ready to send as a request body).
+        """
+        return itertools.islice(PayloadStream(seed, params=params, as_json=as_json), n)
+
+
+def _name_pool(faker_instance, method, size=NAME_POOL_SIZE):
+    return [getattr(faker_instance, method)() for _ in range(size)]
+
+
+class _PayloadColumns:
+    """
+    Value pools for build_many(). Everything that does not depend on the
+    random draw (names, date strings, JSON encodings) is prepared once, so a
+    batch is a handful of NumPy draws plus fancy indexing into the pools.
+    """
+
+    def __init__(self, faker_instance, today, params, as_json):
+        self.as_json = as_json
+        encode = json.dumps if as_json else (lambda value: value)
+        dates = [(today + timedelta(days=offset)).isoformat()
+                 for offset in range(CHECKIN_WINDOW_DAYS + MAX_STAY_DAYS + 1)]
+        self.pools = {
+            "firstname": _name_pool(faker_instance, "first_name"),
+            "lastname": _name_pool(faker_instance, "last_name"),
+            "depositpaid": [False, True],
+            "dates": dates,
+            "additionalneeds": list(ADDITIONAL_NEEDS),
+        }
+        self.pools = {name: np.array([encode(v) for v in pool], dtype=object)
+                      for name, pool in self.pools.items()}
+        self.overrides = {field: encode(FIELD_TYPES[field](params[field]))
+                          for field in FIELD_TYPES if field in params}
+
+    def _pick(self, rng, field, size):
+        pool = self.pools[field]
+        return pool[rng.integers(0, len(pool), size)].tolist()
+
+    def rows(self, rng, size):
+        """`size` drawn payloads as immutable row tuples (FIELD_TYPES order)."""
+        checkin_offsets = rng.integers(0, CHECKIN_WINDOW_DAYS + 1, size)
+        checkout_offsets = checkin_offsets + rng.integers(1, MAX_STAY_DAYS + 1, size)
+        prices = rng.integers(50, 501, size)
+        columns = {
+            "firstname": self._pick(rng, "firstname", size),
+            "lastname": self._pick(rng, "lastname", size),
+            "totalprice": prices.astype(str).tolist() if self.as_json else prices.tolist(),
+            "depositpaid": self._pick(rng, "depositpaid", size),
+            "checkin": self.pools["dates"][checkin_offsets].tolist(),
+            "checkout": self.pools["dates"][checkout_offsets].tolist(),
+            "additionalneeds": self._pick(rng, "additionalneeds", size),
+        }
+        for field, value in self.overrides.items():
+            columns[field] = itertools.repeat(value, size)
+
+        return list(zip(*(columns[field] for field in FIELD_TYPES)))
+
+    def payload(self, row):
+        """A new payload (dict, or JSON bytes) for a row; callers may mutate it freely."""
+        if self.as_json:
+            return (_JSON_TEMPLATE % row).encode()
+        firstname, lastname, totalprice, depositpaid, checkin, checkout, additionalneeds = row
+        return {
+            "firstname": firstname,
+            "lastname": lastname,
+            "totalprice": totalprice,
+            "depositpaid": depositpaid,
+            "bookingdates": {"checkin": checkin, "checkout": checkout},
+            "additionalneeds": additionalneeds,
+        }
+
+
+class PayloadStream:
+    """
+    Deterministic sequence of booking payloads.
+    The sequence is cut into blocks of `block_size`, and blocks into chunks
+    of CHUNK_SIZE; chunk c of block b is drawn from its own generator seeded
+    with (seed, b, c), so any position can be reached without generating the
+    payloads before it, and take(5) draws one chunk, not a whole block.
+    Only the drawn rows are cached: every read builds a new payload, so a
+    caller mutating one cannot change what later reads of its index return.
+    - shard / shards → yield only blocks with b % shards == shard, so workers
+      consume disjoint parts of one sequence
+    - position → global index of the next payload; checkpoint() returns
+      everything needed to rebuild the stream at that point (from_checkpoint)
+    Iteration is thread-safe, so load-runner threads can share one stream.
+    """
+
+    def __init__(self, seed=None, params=None, as_json=False, start_date=None,
+                 shard=0, shards=1, position=0, block_size=BATCH_SIZE):
+        if seed is None:
+            seed = secrets.randbits(32)
+        if seed < 0:
+            raise ValueError("seed must be a non-negative integer")
+        if not 0 <= shard < shards:
+            raise ValueError(f"shard must be in [0, {shards}), got {shard}")
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+        self.seed = seed
+        self.params = dict(params or {})
+        self.as_json = as_json
+        self.start_date = start_date or get_base_date()
+        self.shard = shard
+        self.shards = shards
+        self.block_size = block_size
+        self.position = position
+
+        faker_instance = Faker()
+        faker_instance.seed_instance(seed)
+        self._columns = _PayloadColumns(faker_instance, self.start_date, self.params, as_json)
+        self._lock = threading.Lock()
+        self._cached_chunk = None
+        self._cached_rows = None
+
+    def _payload(self, index):
+        """New payload for global `index`, drawing (and caching) its chunk's rows."""
+        block, offset = divmod(index, self.block_size)
+        chunk, row = divmod(offset, CHUNK_SIZE)
+        if (block, chunk) != self._cached_chunk:
+            rng = np.random.default_rng([self.seed, block, chunk])
+            size = min(CHUNK_SIZE, self.block_size - chunk * CHUNK_SIZE)
+            self._cached_rows = self._columns.rows(rng, size)
+            self._cached_chunk = (block, chunk)
+        return self._columns.payload(self._cached_rows[row])
+
+    def _owned(self, index):
+        """First index >= `index` that belongs to this shard."""
+        block = index // self.block_size
+        skip = (self.shard - block) % self.shards
+        return index if not skip else (block + skip) * self.block_size
+
+    def payload(self, index):
+        """Payload at global `index` (regardless of shard and position)."""
+        with self._lock:
+            return self._payload(index)
+
+    def next_indexed(self):
+        """Return (index, payload) for the next payload of this shard and advance."""
+        with self._lock:
+            index = self._owned(self.position)
+            payload = self._payload(index)
+            self.position = index + 1
+            return index, payload
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.next_indexed()[1]
+
+    def take(self, n):
+        """The next `n` payloads as a list."""
+        return [next(self) for _ in range(n)]
+
+    def checkpoint(self):
+        """JSON-serializable state; from_checkpoint() resumes exactly here."""
+        with self._lock:
+            return {
+                "seed": self.seed,
+                "params": self.params,
+                "as_json": self.as_json,
+                "start_date": self.start_date.isoformat(),
+                "shard": self.shard,
+                "shards": self.shards,
+                "position": self.position,
+                "block_size": self.block_size,
+            }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint):
+        return cls(**checkpoint)
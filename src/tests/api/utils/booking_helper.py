@@ -1,32 +1,36 @@
 from datetime import datetime
-import json
-import time
 import logging
 
+from tests.api.utils.booking_ids import BookingIds, stream_booking_ids
+from tests.api.utils.booking_registry import BookingRegistry
+from tests.api.utils.http_log import lazy_json
+from tests.api.utils.polling import poll_request, poll_request_async
+
 logger = logging.getLogger(__name__)
 
 """
 Booking validation utilities
 
 Provides helper functions for testing booking API:
+- validate_booking_fields → compare a booking body against expected filters
+  (exact names, checkin >=, checkout <=)
 - validate_booking_by_id → fetch & compare booking against expected filters
-- get_bookings → retrieve booking IDs with optional filters & retries
+- booking_query_params → the filters GET /booking supports, as query params
+- get_bookings → retrieve booking IDs with optional filters, polling with backoff;
+  the body is streamed and IDs are returned as a BookingIds set (O(1) `in`)
 - validate_updated_fields → ensure payload changes applied correctly
 - validate_unchanged_fields → ensure fields not meant to change remain same
-- wait_for_booking → poll until booking exists or timeout
-- find_matching_bookings → (stub for filtering registry entries)
+- wait_for_booking → poll (exponential backoff + jitter) until booking exists or timeout
+- find_matching_bookings → first registry booking matching the filters
+  (indexed lookup through BookingRegistry)
+- validate_booking_by_id_async / get_bookings_async / wait_for_booking_async
+  → asyncio versions for use with AsyncApiClient
 """
-def validate_booking_by_id(api_client, booking_data, expected_filters):
+def validate_booking_fields(booking, expected_filters):
     """
-    Retrieve booking by ID and validate fields against expected filters.
+    Compare a retrieved booking against expected filters.
     Handles checkin (>=) and checkout (<=) comparisons.
     """
-    booking_id = booking_data["bookingid"]
-    response = api_client.get(f"/booking/{booking_id}")
-    assert response.status_code == 200, f"Booking {booking_id} not found"
-    booking = response.json()
-    logger.info("Booking retrieved successfully: %s", json.dumps(booking, indent=2))
-
     for key, expected_value in expected_filters.items():
         if key in ["checkin", "checkout"]:
             actual_date = datetime.strptime(
@@ -40,39 +44,100 @@ def validate_booking_by_id(api_client, booking_data, expected_filters):
         elif key in ["firstname", "lastname"]:
             assert booking[key] == expected_value, f"{key} does not match expected value"
 
+
+def _check_booking_response(response, booking_id, expected_filters):
+    """Shared sync/async tail of validate_booking_by_id."""
+    assert response.status_code == 200, f"Booking {booking_id} not found"
+    booking = response.json()
+    logger.info("Booking retrieved successfully: %s", lazy_json(booking))
+
+    validate_booking_fields(booking, expected_filters)
+
     logger.info("Booking %s validated successfully against filters", booking_id)
     return booking
 
 
-def get_bookings(api_client, filters=None, retries=3, wait=2):
+def validate_booking_by_id(api_client, booking_data, expected_filters):
     """
-    Retrieve booking IDs from /booking endpoint using filter parameters.
-    Retries a few times if no bookings found (handles eventual consistency).
+    Retrieve booking by ID and validate fields against expected filters.
+    Handles checkin (>=) and checkout (<=) comparisons.
     """
+    booking_id = booking_data["bookingid"]
+    response = api_client.get(f"/booking/{booking_id}")
+    return _check_booking_response(response, booking_id, expected_filters)
+
+
+async def validate_booking_by_id_async(async_client, booking_data, expected_filters):
+    """Async version of validate_booking_by_id for AsyncApiClient."""
+    booking_id = booking_data["bookingid"]
+    response = await async_client.get(f"/booking/{booking_id}")
+    return _check_booking_response(response, booking_id, expected_filters)
+
+
+def booking_query_params(filters):
+    """Keep only the query params supported by GET /booking."""
     params = {}
     if filters:
         # Only include allowed query params
         for key in ["firstname", "lastname", "checkin", "checkout"]:
             if key in filters:
                 params[key] = filters[key]
+    return params
 
-    for attempt in range(1, retries + 1):
-        response = api_client.get("/booking", params=params)
-        assert response.status_code == 200, f"Failed to get bookings: {response.text}"
 
-        booking_list = response.json()
-        booking_ids = [b["bookingid"] for b in booking_list]
+def _booking_ids_from_response(response):
+    """Parse IDs incrementally (works for streamed and already-read responses)."""
+    assert response.status_code == 200, f"Failed to get bookings: {response.text}"
+    return BookingIds(stream_booking_ids(response))
 
-        if booking_ids:
-            logger.info("Retrieved %d booking(s) with filters %s: %s", len(booking_ids), params, booking_ids,)
-            return booking_ids
 
-        logger.warning("No bookings found for filters %s. Retry %d/%d after %ss...", params, attempt, retries, wait,)
-        time.sleep(wait)
+def _bookings_ready(response):
+    """Polling condition for get_bookings: done once any booking ID is returned."""
+    booking_ids = _booking_ids_from_response(response)
+    return bool(booking_ids), booking_ids
 
-    # Return whatever is retrieved after retries (could be empty)
-    logger.error("After %d retries, bookings found: %s", retries, booking_ids)
-    return booking_ids
+
+def _log_bookings_result(result, params):
+    if result.done:
+        logger.info("Retrieved %d booking(s) with filters %s after %d attempt(s) in %.2fs: %r",
+                    len(result.value), params, result.attempts, result.elapsed, result.value)
+    else:
+        # Return whatever is retrieved after the deadline (could be empty)
+        logger.error("No bookings found for filters %s after %d attempt(s) in %.2fs",
+                     params, result.attempts, result.elapsed)
+    return result.value
+
+
+def get_bookings(api_client, filters=None, retries=3, wait=2):
+    """
+    Retrieve booking IDs from /booking endpoint using filter parameters.
+    Polls with jittered exponential backoff if no bookings are found
+    (handles eventual consistency), returning as soon as any appear.
+    The overall deadline is retries * wait seconds; `wait` caps the backoff.
+    Returns a BookingIds set; the body is parsed as it streams in.
+    """
+    params = booking_query_params(filters)
+    result = poll_request(
+        lambda headers: api_client.get("/booking", params=params, headers=headers, stream=True),
+        _bookings_ready,
+        timeout=retries * wait,
+        label="get_bookings",
+        max_delay=wait,
+    )
+    return _log_bookings_result(result, params)
+
+
+async def get_bookings_async(async_client, filters=None, retries=3, wait=2):
+    """Async version of get_bookings; waits with asyncio.sleep between attempts."""
+    params = booking_query_params(filters)
+    result = await poll_request_async(
+        lambda headers: async_client.get("/booking", params=params, headers=headers),
+        _bookings_ready,
+        timeout=retries * wait,
+        label="get_bookings",
+        max_delay=wait,
+    )
+    return _log_bookings_result(result, params)
 
 
 def validate_updated_fields(updated: dict, payload: dict):
@@ -95,43 +160,56 @@ def validate_unchanged_fields(original: dict, updated: dict, exclude: list):
         assert updated[key] == value, f"Field {key} unexpectedly changed"
 
 
+def _booking_exists(response):
+    return response.status_code == 200, response.status_code == 200
+
+
 def wait_for_booking(api_client, booking_id, timeout=10, interval=0.5):
     """
     Polls the server until the booking exists or timeout is reached.
     :param api_client: your ApiClient instance
     :param booking_id: booking ID to check
     :param timeout: maximum time to wait (seconds)
-    :param interval: poll interval (seconds)
+    :param interval: longest pause between polls (seconds); pauses start
+                     short and back off exponentially with jitter
     :return: True if booking exists, else False
     """
-    end_time = time.time() + timeout
-    while time.time() < end_time:
-        response = api_client.get(f"/booking/{booking_id}")
-        if response.status_code == 200:
-            return True
-        time.sleep(interval)
-    return False
+    result = poll_request(
+        lambda headers: api_client.get(f"/booking/{booking_id}", headers=headers),
+        _booking_exists,
+        timeout=timeout,
+        label="wait_for_booking",
+        max_delay=interval,
+        conditional=False,
+    )
+    return result.done
+
+
+async def wait_for_booking_async(async_client, booking_id, timeout=10, interval=0.5):
+    """Async version of wait_for_booking; other tasks keep running while it polls."""
+    result = await poll_request_async(
+        lambda headers: async_client.get(f"/booking/{booking_id}", headers=headers),
+        _booking_exists,
+        timeout=timeout,
+        label="wait_for_booking",
+        max_delay=interval,
+        conditional=False,
+    )
+    return result.done
 
 
 def find_matching_bookings(registry, filter_params):
     """
     Returns the first booking from the registry that matches the filter parameters.
+    `registry` is a BookingRegistry (indexed lookup) or a plain list of
+    {"bookingid", "data"} entries, which is indexed on the fly.
     Raises ValueError if no booking matches.
     """
-    for booking in registry:
-        payload = booking["data"]
-        match = True
-        for key, value in filter_params.items():
-            if key in ["checkin", "checkout"]:
-                if payload["bookingdates"].get(key) != value:
-                    match = False
-                    break
-            else:
-                if payload.get(key) != value:
-                    match = False
-                    break
-        if match:
-            return booking  # return first matching booking
+    if not isinstance(registry, BookingRegistry):
+        registry = BookingRegistry(registry)
+    booking = registry.find_first(filter_params)
+    if booking is not None:
+        return booking  # return first matching booking
 
     # No match found
     raise ValueError(f"No booking in registry matches filter {filter_params}")
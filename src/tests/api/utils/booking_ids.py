@@ -0,0 +1,121 @@
+import re
+
+import numpy as np
+
+"""
+Booking ID streaming and membership
+
+Handles large GET /booking result sets ([{"bookingid": 1}, ...]) without
+materializing the whole JSON document or a list of dicts.
+- iter_booking_ids → incremental parser: yields IDs from an iterable of body
+  chunks, keeping only a small carry-over buffer between chunks
+- stream_booking_ids → iter_booking_ids over a `stream=True` response
+- BookingIds → ID container with O(1) membership: a dense bitmap for IDs
+  below `bitmap_limit` (Booker IDs are sequential) and a set for the rest
+
+Non-integer IDs and bodies that are not a JSON array raise ValueError.
+"""
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_BITMAP_LIMIT = 1 << 24  # 2 MiB of bitmap at most
+
+_ID_FIELD = re.compile(rb'"bookingid"\s*:\s*([^,}\]\s]+)')
+_INTEGER = re.compile(rb"-?\d+")
+_CARRY_OVER = 64  # longest partial '"bookingid": <value>' kept between chunks
+
+
+def _parse_id(raw):
+    if not _INTEGER.fullmatch(raw):
+        raise ValueError(f"Booking ID is not an integer: {raw[:40]!r}")
+    return int(raw)
+
+
+def iter_booking_ids(chunks):
+    """Yield booking IDs from the chunks of a GET /booking body, in order."""
+    buffer = b""
+    started = False
+    for chunk in chunks:
+        buffer += chunk
+        if not started:
+            stripped = buffer.lstrip()
+            if not stripped:
+                continue
+            if not stripped.startswith(b"["):
+                raise ValueError(f"Response is not a JSON list: {stripped[:40]!r}")
+            started = True
+
+        consumed = 0
+        for match in _ID_FIELD.finditer(buffer):
+            if match.end() == len(buffer):
+                break  # value may continue in the next chunk
+            yield _parse_id(match.group(1))
+            consumed = match.end()
+        buffer = buffer[max(consumed, len(buffer) - _CARRY_OVER):]
+
+    if not started:
+        raise ValueError("Response is not a JSON list: empty body")
+    for match in _ID_FIELD.finditer(buffer):
+        yield _parse_id(match.group(1))
+
+
+def stream_booking_ids(response, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield IDs from a `stream=True` GET /booking response as it downloads."""
+    return iter_booking_ids(response.iter_content(chunk_size))
+
+
+class BookingIds:
+    """Set of booking IDs with O(1) add/membership and compact storage."""
+
+    def __init__(self, ids=(), bitmap_limit=DEFAULT_BITMAP_LIMIT):
+        self.bitmap_limit = bitmap_limit
+        self._bits = bytearray()
+        self._overflow = set()
+        self._count = 0
+        self.update(ids)
+
+    def add(self, booking_id):
+        if 0 <= booking_id < self.bitmap_limit:
+            byte, mask = booking_id >> 3, 1 << (booking_id & 7)
+            if byte >= len(self._bits):
+                # grow geometrically so sequential IDs don't resize per add
+                self._bits.extend(bytes(max(byte + 1, 2 * len(self._bits)) - len(self._bits)))
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                self._count += 1
+        elif booking_id not in self._overflow:
+            self._overflow.add(booking_id)
+            self._count += 1
+
+    def update(self, ids):
+        for booking_id in ids:
+            self.add(booking_id)
+
+    def __contains__(self, booking_id):
+        if not isinstance(booking_id, int):
+            return False
+        if 0 <= booking_id < self.bitmap_limit:
+            byte = booking_id >> 3
+            return byte < len(self._bits) and bool(self._bits[byte] & (1 << (booking_id & 7)))
+        return booking_id in self._overflow
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        """Ascending bitmap IDs, then the overflow IDs in ascending order."""
+        bits = np.unpackbits(np.frombuffer(bytes(self._bits), dtype=np.uint8), bitorder="little")
+        yield from np.flatnonzero(bits).tolist()
+        yield from sorted(self._overflow)
+
+    def __repr__(self):
+        preview = []
+        for booking_id in self:
+            if len(preview) == 10:
+                preview.append("...")
+                break
+            preview.append(str(booking_id))
+        return f"BookingIds({self._count} ids: [{', '.join(preview)}])"
+
+    @classmethod
+    def from_response(cls, response, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Collect the IDs of a `stream=True` GET /booking response."""
+        return cls(stream_booking_ids(response, chunk_size))
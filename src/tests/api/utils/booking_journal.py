@@ -0,0 +1,243 @@
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from filelock import FileLock, Timeout
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.auth_helper import AuthenticationHelper
+from tests.api.utils.bulk_pipeline import BulkPipeline, pipeline_delete_bookings
+
+"""
+Booking journal and orphan sweeper
+
+Run-tagged record of the bookings a test run creates, so bookings left
+behind by a killed run (its fixture teardowns never ran) are deleted by a
+later run instead of slowing down every unfiltered GET /booking.
+- start_run(directory, base_url) → run id; <directory>/<run id>/run.json
+  names the API, and run.lock is held until finish_run. The OS drops the
+  lock when the process dies, so a locked run is a live one
+- BookingJournal(directory, run_id, name) → append-only JSON lines, one
+  file per process (controller, gw0, ...), flushed per line. ApiClient
+  (booking_journal=...) records each booking it creates (POST /booking),
+  its last known state (PUT/PATCH) and its deletion (DELETE 201, or
+  404/405: already gone)
+- outstanding(run_dir) → {id: last known booking} still to delete, merged
+  across the run's files in time order
+- finish_run(directory, run_id, lock) → releases the run, removing its
+  directory when nothing is outstanding
+- sweep_orphans(client, directory) → for every unlocked run against
+  client.base_url, GETs each outstanding booking in parallel and DELETEs
+  only those still exactly as journaled: IDs are reused after a server
+  reset, and someone else's booking must never be deleted. Swept IDs are
+  journaled as deleted; emptied runs are removed, and runs against other
+  APIs are pruned after max_age_days
+Bookings whose creation response never arrived cannot be journaled.
+
+Journal line: {"t": 1700000000.123, "op": "create" | "update" | "delete", "id": 12, "booking": {...}}
+
+Usage (outside pytest):
+    PYTHONPATH=src python -m tests.api.utils.booking_journal --base-url https://... --dry-run
+"""
+logger = logging.getLogger(__name__)
+BOOKING_PATH = re.compile(r"^/booking/(\d+)$")
+GONE_STATUSES = (404, 405)  # Booker answers 405 for DELETE/PATCH/PUT on an unknown ID
+
+
+def _json(response):
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+class BookingJournal:
+    def __init__(self, directory, run_id, name="controller"):
+        self.run_dir = Path(directory) / run_id
+        self.path = self.run_dir / f"{name}.jsonl"
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _append(self, op, booking_id, booking=None):
+        entry = {"t": time.time(), "op": op, "id": booking_id}
+        if op != "delete":
+            entry["booking"] = booking
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.run_dir.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()  # on disk even if the run is killed right after
+
+    def record(self, method, endpoint, response):
+        """Journal the booking write answered by `response`; other calls are ignored."""
+        status = response.status_code
+        if method == "POST":
+            body = _json(response) if endpoint == "/booking" and status == 200 else None
+            if isinstance(body, dict) and "bookingid" in body:
+                self._append("create", body["bookingid"], body.get("booking"))
+            return
+        match = BOOKING_PATH.match(endpoint)
+        if match is None:
+            return
+        booking_id = int(match.group(1))
+        if method in ("PUT", "PATCH") and status == 200:
+            self._append("update", booking_id, _json(response))
+        elif method == "DELETE" and (status == 201 or status in GONE_STATUSES):
+            self._append("delete", booking_id)
+
+    def forget(self, booking_ids):
+        """Journal bookings as deleted (used by the sweeper)."""
+        for booking_id in booking_ids:
+            self._append("delete", booking_id)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _run_lock(run_dir):
+    return FileLock(str(run_dir / "run.lock"), blocking=False)
+
+
+def start_run(directory, base_url):
+    """Create and lock a new run; returns (run_id, lock) — pass both to finish_run."""
+    run_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{socket.gethostname()}-{os.getpid()}"
+    run_dir = Path(directory) / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    lock = _run_lock(run_dir)
+    lock.acquire()
+    with open(run_dir / "run.json", "w") as f:
+        json.dump({"run_id": run_id, "base_url": base_url.rstrip("/"), "started_at": time.time()}, f)
+    return run_id, lock
+
+
+def outstanding(run_dir):
+    """{booking id: last journaled booking (None if unknown)} created by the run and not deleted."""
+    entries = []
+    for path in Path(run_dir).glob("*.jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # torn last line of a killed process
+    live = {}
+    for entry in sorted(entries, key=lambda e: e["t"]):
+        if entry["op"] == "create":
+            live[entry["id"]] = entry.get("booking")
+        elif entry["id"] in live:
+            if entry["op"] == "update":
+                live[entry["id"]] = entry.get("booking")
+            else:
+                del live[entry["id"]]
+    return live
+
+
+def finish_run(directory, run_id, lock):
+    """Release the run; its directory is kept only while bookings are outstanding."""
+    run_dir = Path(directory) / run_id
+    left = outstanding(run_dir)
+    lock.release()
+    if left:
+        logger.warning("Run %s left %d bookings behind; the next run sweeps them", run_id, len(left))
+    else:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def _verify(client, live, **options):
+    """GET each outstanding booking: ids still as journaled, and ids gone or changed since."""
+    def accept(booking_id, response):
+        if response.status_code in GONE_STATUSES:
+            return booking_id, False
+        if response.status_code != 200:
+            raise RuntimeError(f"status {response.status_code}: {response.text[:200]}")
+        return booking_id, live[booking_id] is not None and _json(response) == live[booking_id]
+
+    result = BulkPipeline("verify orphans", lambda booking_id: client.get(f"/booking/{booking_id}"), accept,
+                          idempotent=True, **options).run(list(live))
+    owned = [booking_id for booking_id, mine in result.succeeded if mine]
+    dropped = [booking_id for booking_id, mine in result.succeeded if not mine]
+    return owned, dropped, len(result.failed)
+
+
+def sweep_orphans(client, directory, max_age_days=7, dry_run=False, **options):
+    """
+    Delete what finished or killed runs against client.base_url left behind.
+    Live runs (locked) are skipped. Returns counts for logging.
+    """
+    stats = {"runs": 0, "outstanding": 0, "deleted": 0, "dropped": 0, "failed": 0, "pruned_runs": 0}
+    directory = Path(directory)
+    if not directory.is_dir():
+        return stats
+    base_url = client.base_url.rstrip("/")
+    for run_dir in sorted(path for path in directory.iterdir() if path.is_dir()):
+        lock = _run_lock(run_dir)
+        try:
+            lock.acquire()
+        except Timeout:
+            continue  # still running
+        try:
+            with open(run_dir / "run.json") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {"base_url": None, "started_at": run_dir.stat().st_mtime}
+        remove = False
+        try:
+            if meta["base_url"] != base_url:
+                remove = time.time() - meta["started_at"] > max_age_days * 86400
+                stats["pruned_runs"] += int(remove)
+                continue
+            live = outstanding(run_dir)
+            stats["runs"] += 1
+            stats["outstanding"] += len(live)
+            if dry_run or not live:
+                remove = not live and not dry_run
+                continue
+            owned, dropped, failed = _verify(client, live, **options)
+            deleted = pipeline_delete_bookings(client, owned, **options)
+            stats["deleted"] += len(deleted.succeeded)
+            stats["dropped"] += len(dropped)
+            stats["failed"] += failed + len(deleted.failed)
+            journal = BookingJournal(directory, run_dir.name, name="sweep")
+            journal.forget(deleted.succeeded + dropped)
+            journal.close()
+            remove = not failed and deleted.ok
+        finally:
+            lock.release()
+            if remove:
+                shutil.rmtree(run_dir, ignore_errors=True)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete bookings left behind by interrupted test runs")
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--journal-dir", default=".booker/journal")
+    parser.add_argument("--max-age-days", type=float, default=7)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--dry-run", action="store_true", help="only count what would be swept")
+    args = parser.parse_args()
+
+    token = None if args.dry_run else AuthenticationHelper.get_token(args.base_url, args.username, args.password)
+    client = ApiClient(args.base_url, auth_token=token, metrics=None,
+                       pool_settings={"pool_maxsize": args.concurrency})
+    print(sweep_orphans(client, args.journal_dir, max_age_days=args.max_age_days, dry_run=args.dry_run,
+                        max_concurrency=args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
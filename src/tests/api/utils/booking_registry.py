@@ -0,0 +1,251 @@
+import bisect
+from types import MappingProxyType
+
+"""
+BookingRegistry class
+
+Indexed in-memory registry of created bookings ({"bookingid", "data"}
+entries as returned by create_bookings), used by the registry fixtures and
+find_matching_bookings.
+- BookingRecord → __slots__ record; still readable as booking["bookingid"]
+  / booking["data"] like the plain dicts it replaces
+- exact-match hash indexes on firstname, lastname, checkin and checkout:
+  find() intersects from the smallest matching bucket instead of scanning
+- date_range() → bookings whose checkin/checkout falls in [start, end],
+  via bisect over per-field sorted (date, seq) arrays
+- list-like access (iteration in creation order, len, [0], pop) so tests
+  that consume the registry keep working
+- ReadOnlyBookingRegistry → the same lookups without add/append/extend/
+  pop/remove (TypeError), for the registry shared by xdist workers; its
+  records' data is frozen (MappingProxyType / tuples), so editing a
+  shared booking cannot desync the indexes, and to_list() returns
+  mutable copies
+
+Dates are compared as ISO "YYYY-MM-DD" strings, which sort chronologically.
+"""
+INDEXED_FIELDS = ("firstname", "lastname", "checkin", "checkout")
+DATE_FIELDS = ("checkin", "checkout")
+
+
+def _freeze(value):
+    """Read-only copy of nested booking data: dicts → MappingProxyType, lists → tuples."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Mutable (and JSON-serializable) copy of data frozen by _freeze."""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class BookingRecord:
+    __slots__ = ("bookingid", "data", "firstname", "lastname", "checkin", "checkout", "seq")
+
+    def __init__(self, bookingid, data, seq):
+        dates = data.get("bookingdates") or {}
+        self.bookingid = bookingid
+        self.data = data
+        self.firstname = data.get("firstname")
+        self.lastname = data.get("lastname")
+        self.checkin = dates.get("checkin")
+        self.checkout = dates.get("checkout")
+        self.seq = seq
+
+    def __getitem__(self, key):
+        if key in ("bookingid", "data"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        return {"bookingid": self.bookingid, "data": self.data}
+
+    def __repr__(self):
+        return f"BookingRecord(bookingid={self.bookingid!r}, data={self.data!r})"
+
+    def matches(self, filter_params):
+        """Exact match on every key (dates compared against bookingdates)."""
+        for key, value in filter_params.items():
+            if key in INDEXED_FIELDS:
+                if getattr(self, key) != value:
+                    return False
+            elif self.data.get(key) != value:
+                return False
+        return True
+
+
+class BookingRegistry:
+    def __init__(self, bookings=()):
+        self._records = {}   # seq → record, in creation order
+        self._by_id = {}
+        self._indexes = {field: {} for field in INDEXED_FIELDS}   # field → value → {seq: record}
+        self._dates = {field: [] for field in DATE_FIELDS}        # field → [(date, seq)], sorted lazily
+        self._dates_sorted = True
+        self._next_seq = 0
+        self.extend(bookings)
+
+    # -----------------------------
+    # Building
+    # -----------------------------
+    def add(self, booking):
+        """Add a {"bookingid", "data"} entry (or a record) and return its record."""
+        record = BookingRecord(booking["bookingid"], booking["data"], self._next_seq)
+        self._next_seq += 1
+        self._records[record.seq] = record
+        self._by_id[record.bookingid] = record
+        for field in INDEXED_FIELDS:
+            index, value = self._indexes[field], getattr(record, field)
+            bucket = index.get(value)
+            if bucket is None:
+                bucket = index[value] = {}
+            bucket[record.seq] = record
+        for field in DATE_FIELDS:
+            value = getattr(record, field)
+            if value is not None:
+                self._dates[field].append((value, record.seq))
+        self._dates_sorted = False  # sorted once on the next range lookup, not per add
+        return record
+
+    def _sorted_dates(self, field=None):
+        if not self._dates_sorted:
+            for dates in self._dates.values():
+                dates.sort()
+            self._dates_sorted = True
+        return self._dates.get(field)
+
+    def extend(self, bookings):
+        for booking in bookings:
+            self.add(booking)
+        self._sorted_dates()
+
+    append = add
+
+    def _unlink(self, record):
+        del self._records[record.seq]
+        if self._by_id.get(record.bookingid) is record:
+            del self._by_id[record.bookingid]
+        for field in INDEXED_FIELDS:
+            bucket = self._indexes[field][getattr(record, field)]
+            del bucket[record.seq]
+            if not bucket:
+                del self._indexes[field][getattr(record, field)]
+        for field in DATE_FIELDS:
+            value = getattr(record, field)
+            if value is not None:
+                dates = self._sorted_dates(field)
+                del dates[bisect.bisect_left(dates, (value, record.seq))]
+        return record
+
+    def pop(self, index=-1):
+        """Remove and return the record at `index` (creation order), like list.pop."""
+        return self._unlink(self[index])
+
+    def remove(self, booking_id):
+        """Remove and return the record for `booking_id` (KeyError if unknown)."""
+        return self._unlink(self._by_id[booking_id])
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+    def get(self, booking_id):
+        return self._by_id.get(booking_id)
+
+    def find(self, filter_params):
+        """Yield records matching every filter exactly, in creation order."""
+        candidates = self._records
+        for field in INDEXED_FIELDS:
+            if field in filter_params:
+                bucket = self._indexes[field].get(filter_params[field], {})
+                if len(bucket) < len(candidates):
+                    candidates = bucket
+        return (record for record in list(candidates.values()) if record.matches(filter_params))
+
+    def find_first(self, filter_params):
+        """First record matching every filter exactly, or None."""
+        return next(self.find(filter_params), None)
+
+    def date_range(self, field, start=None, end=None):
+        """Records whose `field` (checkin/checkout) is within [start, end], ordered by date."""
+        if field not in DATE_FIELDS:
+            raise ValueError(f"date_range supports {DATE_FIELDS}, got {field!r}")
+        dates = self._sorted_dates(field)
+        low = 0 if start is None else bisect.bisect_left(dates, (start,))
+        high = len(dates) if end is None else bisect.bisect_left(dates, (end + "\0",))
+        return [self._records[seq] for _, seq in dates[low:high]]
+
+    # -----------------------------
+    # List-like access
+    # -----------------------------
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(list(self._records.values()))
+
+    def __getitem__(self, index):
+        if not self._records:
+            raise IndexError("registry is empty")
+        if index == 0:
+            return next(iter(self._records.values()))
+        if index == -1:
+            return next(reversed(self._records.values()))
+        return list(self._records.values())[index]
+
+    def __contains__(self, booking_id):
+        return booking_id in self._by_id
+
+    def to_list(self):
+        return [record.to_dict() for record in self._records.values()]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} bookings)"
+
+
+class ReadOnlyBookingRegistry(BookingRegistry):
+    """
+    Registry frozen once built: its bookings are shared, so mutating it, or
+    a record's data, fails loudly.
+    """
+    _frozen = False
+
+    def __init__(self, bookings=()):
+        super().__init__(bookings)
+        self._frozen = True
+
+    def _check_writable(self, operation):
+        if self._frozen:
+            raise TypeError(f"{operation}() on a read-only registry; tests that modify bookings "
+                            f"use booking_registry")
+
+    def add(self, booking):
+        self._check_writable("add")
+        return super().add({"bookingid": booking["bookingid"], "data": _freeze(booking["data"])})
+
+    append = add
+
+    def extend(self, bookings):
+        self._check_writable("extend")
+        super().extend(bookings)
+
+    def pop(self, index=-1):
+        self._check_writable("pop")
+        return super().pop(index)
+
+    def remove(self, booking_id):
+        self._check_writable("remove")
+        return super().remove(booking_id)
+
+    def to_list(self):
+        return [{"bookingid": record.bookingid, "data": _thaw(record.data)} for record in self._records.values()]
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+"""
+Bulk booking helpers
+
+Runs many POST/DELETE /booking calls through a thread pool that shares the
+ApiClient's keep-alive connection pool.
+- run_parallel → apply a function to items with bounded parallelism,
+  collecting every failure instead of stopping at the first one
+- create_bookings → POST payloads in parallel, keeping input order
+- delete_bookings → DELETE booking IDs in parallel
+
+Both return a BulkResult; call `raise_for_failures()` to turn aggregated
+failures into a single BulkOperationError.
+"""
+class BulkOperationError(Exception):
+    """Raised once per bulk run with every failed item attached."""
+
+    def __init__(self, operation, failures):
+        self.operation = operation
+        self.failures = failures
+        details = "; ".join(f"{item!r}: {error}" for item, error in failures[:5])
+        more = f" (+{len(failures) - 5} more)" if len(failures) > 5 else ""
+        super().__init__(f"{operation} failed for {len(failures)} item(s): {details}{more}")
+
+
+class BulkResult:
+    """Outcome of a bulk run: succeeded results (input order) and (item, error) failures."""
+
+    def __init__(self, operation, succeeded, failed):
+        self.operation = operation
+        self.succeeded = succeeded
+        self.failed = failed
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def raise_for_failures(self):
+        if self.failed:
+            raise BulkOperationError(self.operation, self.failed)
+        return self.succeeded
+
+
+def run_parallel(fn, items, max_workers=8, operation="bulk operation"):
+    """
+    Call fn(item) for every item using up to max_workers threads.
+    Exceptions are collected per item; successful results keep input order.
+    """
+    items = list(items)
+    if not items:
+        return BulkResult(operation, [], [])
+
+    results = [None] * len(items)
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        futures = {pool.submit(fn, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as error:
+                errors[index] = error
+
+    succeeded = [result for index, result in enumerate(results) if index not in errors]
+    failed = [(items[index], errors[index]) for index in sorted(errors)]
+    return BulkResult(operation, succeeded, failed)
+
+
+def create_bookings(api_client, payloads, max_workers=8):
+    """POST each payload to /booking; succeeded entries are {"bookingid", "data"}."""
+    def create(payload):
+        response = api_client.post("/booking", json=payload)
+        response.raise_for_status()
+        return {"bookingid": response.json()["bookingid"], "data": payload}
+
+    return run_parallel(create, payloads, max_workers, operation="create bookings")
+
+
+def delete_bookings(api_client, booking_ids, max_workers=8, headers=None):
+    """DELETE each booking; any status other than 201 counts as a failure."""
+    def delete(booking_id):
+        response = api_client.delete(f"/booking/{booking_id}", headers=headers)
+        if response.status_code != 201:
+            raise RuntimeError(f"status {response.status_code}: {response.text}")
+        return booking_id
+
+    return run_parallel(delete, booking_ids, max_workers, operation="delete bookings")
@@ -0,0 +1,278 @@
+import queue
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from tests.api.utils.bulk_booking import BulkResult
+from tests.api.utils.polling import backoff_delays
+
+"""
+Rate-limit aware bulk pipeline
+
+Producer/consumer pipeline for bulk create/patch/delete that backs off when
+the server throttles, instead of a fixed-size thread pool hammering it.
+- items are read lazily by a producer thread into a bounded queue, so a
+  generator of 100k payloads is never materialized
+- consumer threads (up to max_concurrency) send through an AimdLimiter:
+  in-flight requests are capped at its current limit, which grows by
+  ~1 per limit's worth of successes (additive increase) and is halved when
+  429/5xx make up `throttle_threshold` of the recent window (multiplicative
+  decrease, at most once per `cooldown` seconds)
+- 429/503 are always retried; other 5xx and connection errors only for
+  idempotent operations (PATCH/DELETE), never for POST. Retry-After
+  (seconds or HTTP date, capped at max_retry_after) pauses every consumer,
+  else the item backs off with jittered exponential delays
+- run(items) → PipelineResult: a BulkResult (input order, raise_for_failures)
+  plus `stats`: attempts, retries, 429s, 5xx, Retry-After waits, elapsed,
+  achieved throughput and the concurrency limit's trajectory
+- pipeline_create_bookings / pipeline_patch_bookings /
+  pipeline_delete_bookings → the booking operations on top of it
+"""
+THROTTLE_STATUSES = (429, 503)
+
+
+def retry_after_seconds(response, limit=60.0):
+    """Retry-After of a response in seconds (delta-seconds or HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), limit)
+
+
+class AimdLimiter:
+    """Concurrency limit with additive increase / multiplicative decrease and a shared pause."""
+
+    def __init__(self, initial=4, minimum=1, maximum=32, increase=1.0, decrease=0.5,
+                 window=20, throttle_threshold=0.1, cooldown=1.0):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.throttle_threshold = throttle_threshold
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.peak = self.lowest = self.limit
+        self.decreases = 0
+        self._recent = deque(maxlen=window)
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Block until below the limit and not paused by a Retry-After."""
+        with self._cond:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                elif self.in_flight < int(self.limit):
+                    break
+                else:
+                    self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled, retry_after=None):
+        """Record one response (throttled = 429/5xx/connection error) and adapt the limit."""
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            self._recent.append(throttled)
+            if throttled:
+                rate = sum(self._recent) / len(self._recent)
+                if rate >= self.throttle_threshold and now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self.lowest = min(self.lowest, self.limit)
+                    self.decreases += 1
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+                self.peak = max(self.peak, self.limit)
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            self._cond.notify_all()
+
+    def stats(self):
+        return {"final": round(self.limit, 2), "peak": round(self.peak, 2), "lowest": round(self.lowest, 2),
+                "decreases": self.decreases}
+
+
+class PipelineResult(BulkResult):
+    def __init__(self, operation, succeeded, failed, stats):
+        super().__init__(operation, succeeded, failed)
+        self.stats = stats
+
+
+class BulkPipeline:
+    """
+    send(item) → Response; accept(item, response) → result, raising for a
+    failed item. accept() also sees the final response of retried items.
+    """
+    _DONE = object()
+
+    def __init__(self, operation, send, accept, idempotent=False, max_concurrency=32, initial_concurrency=4,
+                 min_concurrency=1, queue_size=None, max_attempts=6, max_retry_after=60.0, backoff=None,
+                 limiter_options=None, seed=None):
+        self.operation = operation
+        self.send = send
+        self.accept = accept
+        self.idempotent = idempotent
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size or 2 * max_concurrency
+        self.max_attempts = max_attempts
+        self.max_retry_after = max_retry_after
+        self.backoff = {"initial_delay": 0.1, "max_delay": 5.0, **(backoff or {})}
+        self.limiter = AimdLimiter(initial_concurrency, min_concurrency, max_concurrency, **(limiter_options or {}))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {"attempts": 0, "retries": 0, "throttled_429": 0, "server_errors": 0,
+                        "connection_errors": 0, "retry_after_waits": 0, "retry_after_s": 0.0}
+
+    def _count(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self._counts[key] += value
+
+    def _retryable(self, status):
+        return status in THROTTLE_STATUSES or (self.idempotent and status >= 500)
+
+    def _process(self, item):
+        delays = backoff_delays(rng=self._random, **self.backoff)
+        attempt = 0
+        while True:
+            attempt += 1
+            self.limiter.acquire()
+            try:
+                response = self.send(item)
+            except requests.ConnectionError:
+                self.limiter.release(throttled=True)
+                self._count(attempts=1, connection_errors=1)
+                if not self.idempotent or attempt == self.max_attempts:
+                    raise
+                self._count(retries=1)
+                time.sleep(next(delays))
+                continue
+            except Exception:
+                self.limiter.release(throttled=False)
+                self._count(attempts=1)
+                raise
+
+            status = response.status_code
+            throttled = status == 429 or status >= 500
+            retry_after = retry_after_seconds(response, self.max_retry_after) if throttled else None
+            self.limiter.release(throttled, retry_after)
+            self._count(attempts=1, throttled_429=int(status == 429), server_errors=int(status >= 500))
+            if not (self._retryable(status) and attempt < self.max_attempts):
+                return self.accept(item, response)
+            response.close()
+            self._count(retries=1)
+            if retry_after:
+                self._count(retry_after_waits=1, retry_after_s=retry_after)  # acquire() waits out the pause
+            else:
+                time.sleep(next(delays))
+
+    def _consume(self, work, results, errors):
+        while True:
+            entry = work.get()
+            if entry is self._DONE:
+                return
+            index, item = entry
+            try:
+                results[index] = self._process(item)
+            except Exception as error:
+                errors[index] = (item, error)
+
+    def run(self, items):
+        work = queue.Queue(maxsize=self.queue_size)
+        results, errors = {}, {}
+        consumers = [threading.Thread(target=self._consume, args=(work, results, errors),
+                                      name=f"bulk-pipeline-{n}", daemon=True)
+                     for n in range(self.max_concurrency)]
+        start = time.perf_counter()
+        for consumer in consumers:
+            consumer.start()
+        produced = 0
+        try:
+            for produced, item in enumerate(items, start=1):
+                work.put((produced - 1, item))  # blocks while the queue is full
+        finally:
+            for _ in consumers:
+                work.put(self._DONE)
+            for consumer in consumers:
+                consumer.join()
+        elapsed = time.perf_counter() - start
+
+        stats = {
+            "items": produced,
+            "succeeded": len(results),
+            "failed": len(errors),
+            **self._counts,
+            "retry_after_s": round(self._counts["retry_after_s"], 3),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(len(results) / elapsed, 2) if elapsed else 0.0,
+            "concurrency": self.limiter.stats(),
+        }
+        return PipelineResult(self.operation, [results[i] for i in sorted(results)],
+                              [errors[i] for i in sorted(errors)], stats)
+
+
+def _expect(response, statuses):
+    if response.status_code not in statuses:
+        raise RuntimeError(f"status {response.status_code}: {response.text[:200]}")
+
+
+def pipeline_create_bookings(api_client, payloads, **options):
+    """POST each payload to /booking; succeeded entries are {"bookingid", "data"} (as create_bookings)."""
+    def accept(payload, response):
+        _expect(response, (200,))
+        return {"bookingid": response.json()["bookingid"], "data": payload}
+
+    return BulkPipeline("create bookings", lambda payload: api_client.post("/booking", json=payload), accept,
+                        idempotent=False, **options).run(payloads)
+
+
+def pipeline_patch_bookings(api_client, updates, **options):
+    """PATCH (booking_id, changes) pairs; succeeded entries are the updated bookings."""
+    def accept(update, response):
+        _expect(response, (200,))
+        return response.json()
+
+    return BulkPipeline("patch bookings", lambda update: api_client.patch(f"/booking/{update[0]}", json=update[1]),
+                        accept, idempotent=True, **options).run(updates)
+
+
+def pipeline_delete_bookings(api_client, booking_ids, headers=None, **options):
+    """
+    DELETE each booking (201). A 405 after an attempt that ended in a 5xx or
+    a dropped connection counts as deleted: that attempt may have gone through.
+    """
+    uncertain = set()
+
+    def send(booking_id):
+        try:
+            response = api_client.delete(f"/booking/{booking_id}", headers=headers)
+        except requests.ConnectionError:
+            uncertain.add(booking_id)
+            raise
+        if response.status_code >= 500 and response.status_code != 503:
+            uncertain.add(booking_id)
+        return response
+
+    def accept(booking_id, response):
+        if not (response.status_code == 405 and booking_id in uncertain):
+            _expect(response, (201,))
+        return booking_id
+
+    return BulkPipeline("delete bookings", send, accept, idempotent=True, **options).run(booking_ids)
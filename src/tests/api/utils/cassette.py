@@ -0,0 +1,250 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from filelock import FileLock
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+"""
+HTTP record/replay cassettes for ApiClient
+
+Records request/response pairs on disk and replays them without network.
+- normalize_url → "/path?sorted=query" for an endpoint plus params
+- request_key → (label, key): label is "METHOD /path?sorted=query"; key
+  hashes the label, explicitly passed headers, the canonical body (JSON
+  with sorted keys) and whether the client sent its auth cookie. The
+  token itself is not part of the key, so recordings survive token renewal.
+- Cassette(path, mode, max_age) → two files:
+    <path>.dat       append-only zlib-compressed responses, memory-mapped
+    <path>.idx.json  key → recordings [{scope, seq, offset, length, recorded_at}]
+                     plus "meta" (payload seed/base date used when recording)
+- Recordings are per scope (the running test's node id) and occurrence, so
+  a stateful sequence (GET → DELETE → GET 404) replays in order.
+
+Modes:
+- record-once → replay what is recorded, record the rest
+- replay-only → never touch the network; a missing recording raises
+  CassetteMiss (falls back to the same request from another scope, so
+  running a subset of tests still replays)
+- refresh-stale → like record-once, but recordings older than max_age
+  seconds are fetched again and replaced
+
+Replayed responses are plain requests.Response objects (status, headers,
+body); they are not counted in the latency metrics. Request bodies are
+never stored (only their hash), so credentials stay out of the cassette.
+"""
+MODES = ("off", "record-once", "replay-only", "refresh-stale")
+
+# Hop-by-hop / per-connection headers, and ones that no longer match the decoded body
+_SKIPPED_HEADERS = {"set-cookie", "date", "connection", "keep-alive",
+                    "content-encoding", "transfer-encoding", "content-length"}
+_META_LENGTH = struct.Struct(">I")
+
+
+class CassetteMiss(LookupError):
+    """replay-only mode found no recording for a request."""
+
+
+def _canonical_body(data=None, json_body=None):
+    if json_body is not None:
+        return json.dumps(json_body, sort_keys=True, separators=(",", ":"), default=str).encode()
+    if data is None:
+        return b""
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, str):
+        return data.encode()
+    return urlencode(sorted(dict(data).items())).encode()
+
+
+def normalize_url(endpoint, params=None):
+    """Path plus sorted query (from the endpoint and `params`), as requests would send it."""
+    parts = urlsplit(endpoint)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        query += [(str(k), str(v)) for k, v in items if v is not None]
+    url = parts.path or "/"
+    return f"{url}?{urlencode(sorted(query))}" if query else url
+
+
+def request_key(method, endpoint, params=None, data=None, json_body=None, extra_headers=None,
+                authenticated=False):
+    """Return (label, key) identifying a request independently of host and auth token."""
+    label = f"{method.upper()} {normalize_url(endpoint, params)}"
+
+    headers = sorted((k.lower(), str(v)) for k, v in (extra_headers or {}).items() if v is not None)
+    digest = hashlib.sha256(label.encode())
+    digest.update(json.dumps([headers, bool(authenticated)]).encode())
+    digest.update(b"\0")
+    digest.update(_canonical_body(data, json_body))
+    return label, digest.hexdigest()[:32]
+
+
+class Cassette:
+    def __init__(self, path, mode="record-once", max_age=None):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Cassette mode must be one of {MODES[1:]}, got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.max_age = max_age
+        self.data_path = f"{path}.dat"
+        self.index_path = f"{path}.idx.json"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = FileLock(f"{path}.lock")
+
+        self.scope = ""
+        self.stats = {"replayed": 0, "recorded": 0, "missed": 0}
+        index = self._load_index()
+        self.meta = index["meta"]
+        self._entries = index["entries"]
+        self._saved_meta = dict(self.meta)
+        self._new_entries = {}
+        self._occurrences = {}
+        self._mmap = None
+        self._lock = threading.RLock()
+
+    # -----------------------------
+    # Storage
+    # -----------------------------
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"meta": {}, "entries": {}}
+
+    def _read(self, offset, length):
+        end = offset + length
+        if self._mmap is None or end > len(self._mmap):
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self.data_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap[offset:end]
+
+    @staticmethod
+    def _put(entries, entry):
+        """Insert `entry`, replacing an existing recording of the same scope/occurrence."""
+        for i, existing in enumerate(entries):
+            if existing["scope"] == entry["scope"] and existing["seq"] == entry["seq"]:
+                entries[i] = entry
+                return
+        entries.append(entry)
+
+    def save(self):
+        """Merge this process's recordings into the on-disk index (xdist-safe)."""
+        with self._lock:
+            if not self._new_entries and self.meta == self._saved_meta:
+                return
+            with self.lock:
+                index = self._load_index()
+                index["meta"].update(self.meta)
+                for key, entries in self._new_entries.items():
+                    for entry in entries:
+                        self._put(index["entries"].setdefault(key, []), entry)
+                tmp_path = f"{self.index_path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(index, f, separators=(",", ":"))
+                os.replace(tmp_path, self.index_path)
+            self.meta = index["meta"]
+            self._entries = index["entries"]
+            self._saved_meta = dict(self.meta)
+            self._new_entries = {}
+
+    def close(self):
+        self.save()
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    # -----------------------------
+    # Record / replay
+    # -----------------------------
+    def _lookup(self, key, scope, seq, fallback):
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        in_scope = [e for e in entries if e["scope"] == scope]
+        for entry in in_scope:
+            if entry["seq"] == seq:
+                return entry
+        if not fallback:
+            return None
+        earlier = [e for e in in_scope if e["seq"] < seq]
+        if earlier:
+            return max(earlier, key=lambda e: e["seq"])  # repeat the last recorded occurrence
+        return in_scope[0] if in_scope else entries[0]
+
+    def _fresh(self, entry):
+        return self.max_age is None or time.time() - entry["recorded_at"] <= self.max_age
+
+    def _replay(self, entry, method, url):
+        blob = zlib.decompress(self._read(entry["offset"], entry["length"]))
+        (meta_length,) = _META_LENGTH.unpack_from(blob)
+        meta = json.loads(blob[_META_LENGTH.size:_META_LENGTH.size + meta_length])
+        body = blob[_META_LENGTH.size + meta_length:]
+
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response.reason = meta["reason"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True
+        response.url = url
+        response.request = requests.Request(method, url).prepare()
+        return response
+
+    def _record(self, key, label, scope, seq, response):
+        meta = json.dumps({
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _SKIPPED_HEADERS},
+        }).encode()
+        blob = zlib.compress(_META_LENGTH.pack(len(meta)) + meta + response.content)
+        with self._lock, self.lock:
+            with open(self.data_path, "ab") as f:
+                offset = f.tell()
+                f.write(blob)
+            entry = {"scope": scope, "seq": seq, "offset": offset, "length": len(blob),
+                     "recorded_at": time.time(), "request": label}
+            self._put(self._entries.setdefault(key, []), entry)
+            self._new_entries.setdefault(key, []).append(entry)
+            self.stats["recorded"] += 1
+
+    def play(self, method, base_url, endpoint, extra_headers, request_kwargs, send, authenticated=False):
+        """Replay the matching recording, or call send() and record its response."""
+        label, key = request_key(
+            method, endpoint,
+            params=request_kwargs.get("params"),
+            data=request_kwargs.get("data"),
+            json_body=request_kwargs.get("json"),
+            extra_headers=extra_headers,
+            authenticated=authenticated,
+        )
+        with self._lock:
+            scope = self.scope
+            seq = self._occurrences.get((scope, key), 0)
+            self._occurrences[(scope, key)] = seq + 1
+            entry = self._lookup(key, scope, seq, fallback=self.mode == "replay-only")
+            if entry is not None and (self.mode != "refresh-stale" or self._fresh(entry)):
+                self.stats["replayed"] += 1
+                return self._replay(entry, method, f"{base_url}{endpoint}")
+            if self.mode == "replay-only":
+                self.stats["missed"] += 1
+                raise CassetteMiss(f"No recording for {label} (test {scope or '<session>'}) in {self.path}")
+
+        response = send()
+        self._record(key, label, scope, seq, response)
+        return response
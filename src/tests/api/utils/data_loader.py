@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+"""
+Cached test-data loading
+
+Parses a resources/test-data JSON file once per process and keeps a compiled
+copy on disk, so later processes (xdist workers, the next run) skip the JSON
+parse and the per-test filtering.
+- load_cases(name) → the file's list of cases
+- select_cases(name, description=None, where=None) → cases with that
+  "description" (pre-grouped, no scan) and/or matching where(case), in
+  file order
+- warm_cache(names) → compile the files up front (the controller does this
+  before xdist workers start, so they only read the compiled copy)
+
+Compiled copies are pickles under .pytest_cache/booker/test-data keyed by the
+source path; each stores the source's mtime and size and is rebuilt when
+they change. Writes are atomic, so concurrent workers never read a partial
+file. The directory is local to the checkout, like the token cache.
+
+Tests use the `test_data` marker instead of opening files at import time;
+conftest's pytest_generate_tests parametrizes `data` from it:
+    @pytest.mark.test_data("filters.json", description="Individual filter", ids=...)
+"""
+DATA_DIR = os.environ.get("BOOKER_TEST_DATA_DIR", os.path.join("resources", "test-data"))
+CACHE_DIR = os.path.join(".pytest_cache", "booker", "test-data")
+_FORMAT = 1
+
+_loaded = {}   # path → (stamp, CaseTable)
+_lock = threading.Lock()
+
+
+class CaseTable:
+    """A data file's cases plus a description → cases index."""
+
+    def __init__(self, cases):
+        self.cases = cases
+        self.by_description = {}
+        for case in cases:
+            if isinstance(case, dict):
+                self.by_description.setdefault(case.get("description"), []).append(case)
+
+
+def _path(name):
+    return name if os.path.isabs(name) or os.path.dirname(name) else os.path.join(DATA_DIR, name)
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return _FORMAT, stat.st_mtime_ns, stat.st_size
+
+
+def _cache_path(path, cache_dir):
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{digest}.pickle")
+
+
+def _read_compiled(cache_path, stamp):
+    try:
+        with open(cache_path, "rb") as f:
+            cached_stamp, table = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError):
+        return None  # unreadable or pickled by an older version of this module: re-parse the JSON
+    return table if cached_stamp == stamp else None
+
+
+def _write_compiled(cache_path, stamp, table):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((stamp, table), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # read-only checkout: the in-process copy still works
+
+
+def load_table(name, cache_dir=CACHE_DIR):
+    """CaseTable for a data file: in-process copy, else compiled copy, else parse JSON."""
+    path = _path(name)
+    stamp = _stamp(path)
+    with _lock:
+        loaded = _loaded.get(path)
+        if loaded is not None and loaded[0] == stamp:
+            return loaded[1]
+        cache_path = _cache_path(path, cache_dir) if cache_dir else None
+        table = _read_compiled(cache_path, stamp) if cache_path else None
+        if table is None:
+            with open(path) as f:
+                table = CaseTable(json.load(f))
+            if cache_path:
+                _write_compiled(cache_path, stamp, table)
+        _loaded[path] = (stamp, table)
+        return table
+
+
+def load_cases(name):
+    """Every case in the data file (shared list; don't mutate)."""
+    return load_table(name).cases
+
+
+def select_cases(name, description=None, where=None):
+    """Cases with the given description(s) and/or for which where(case) is true, in file order."""
+    table = load_table(name)
+    if description is None:
+        cases = table.cases
+    elif isinstance(description, str):
+        cases = table.by_description.get(description, [])
+    else:
+        wanted = set(description)
+        cases = [case for case in table.cases if isinstance(case, dict) and case.get("description") in wanted]
+    return [case for case in cases if where(case)] if where else list(cases)
+
+
+def warm_cache(names=None):
+    """Compile the given data files (default: every *.json in DATA_DIR)."""
+    if names is None:
+        try:
+            names = sorted(n for n in os.listdir(DATA_DIR) if n.endswith(".json"))
+        except OSError:
+            return
+    for name in names:
+        load_table(name)
+
+
+def clear_memory():
+    """Drop in-process copies (the compiled copies on disk are kept)."""
+    with _lock:
+        _loaded.clear()
@@ -0,0 +1,92 @@
+import html
+import math
+
+"""
+Lightweight pytest-html summary rendering
+
+Dependency-free replacements for the matplotlib pie chart, so importing
+conftest (collection, every xdist worker) no longer loads a plotting stack.
+- svg_pie → inline <svg> pie chart from {label: count}; zero counts are
+  skipped and an all-zero run renders an empty ring instead of failing
+- svg_latency_bar → inline <svg> bar showing p50/p95/p99 on a shared scale,
+  used in the per-endpoint metrics table
+- render_results_summary → pie + legend with counts/percentages, plus
+  the slowest tests of the run
+"""
+RESULT_COLORS = {"passed": "#28a745", "failed": "#dc3545", "skipped": "#ffc107"}
+_FALLBACK_COLORS = ("#17a2b8", "#6f42c1", "#fd7e14", "#6c757d")
+
+
+def _point(cx, cy, r, angle):
+    return cx + r * math.cos(angle), cy + r * math.sin(angle)
+
+
+def svg_pie(counts, colors=RESULT_COLORS, size=160):
+    """Inline SVG pie of {label: count}, starting at 12 o'clock, clockwise."""
+    r = size / 2 - 2
+    c = size / 2
+    total = sum(counts.values())
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+             f'viewBox="0 0 {size} {size}" role="img">']
+    if not total:
+        parts.append(f'<circle cx="{c}" cy="{c}" r="{r}" fill="none" stroke="#ccc" stroke-width="2"/>')
+    angle = -math.pi / 2
+    for i, (label, count) in enumerate(counts.items()):
+        if not count:
+            continue
+        color = colors.get(label) or _FALLBACK_COLORS[i % len(_FALLBACK_COLORS)]
+        title = f"<title>{html.escape(label)}: {count} ({count / total:.1%})</title>"
+        if count == total:
+            parts.append(f'<circle cx="{c}" cy="{c}" r="{r}" fill="{color}">{title}</circle>')
+            break
+        sweep = 2 * math.pi * count / total
+        x0, y0 = _point(c, c, r, angle)
+        x1, y1 = _point(c, c, r, angle + sweep)
+        large = 1 if sweep > math.pi else 0
+        parts.append(f'<path d="M{c},{c} L{x0:.2f},{y0:.2f} A{r},{r} 0 {large} 1 {x1:.2f},{y1:.2f} Z" '
+                     f'fill="{color}">{title}</path>')
+        angle += sweep
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def svg_latency_bar(p50, p95, p99, scale, width=140, height=12):
+    """Stacked p50 | p95 | p99 bar, `scale` ms wide (e.g. the largest p99 in the table)."""
+    if not scale:
+        return ""
+    widths = []
+    previous = 0.0
+    for value in (p50, p95, p99):
+        value = max(value, previous)
+        widths.append((value - previous) / scale * width)
+        previous = value
+    x = 0.0
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">']
+    for w, color, label, value in zip(widths, ("#28a745", "#ffc107", "#dc3545"),
+                                      ("p50", "p95", "p99"), (p50, p95, p99)):
+        parts.append(f'<rect x="{x:.2f}" width="{w:.2f}" height="{height}" fill="{color}">'
+                     f'<title>{label} {value:.2f} ms</title></rect>')
+        x += w
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def render_results_summary(counts, durations=(), slowest=10, title="📊 Test Results Summary"):
+    """Results pie with a counts legend, and a table of the slowest test calls."""
+    total = sum(counts.values())
+    legend = "".join(
+        f'<tr><td><span style="color:{RESULT_COLORS.get(label, "#6c757d")}">■</span> {html.escape(label)}</td>'
+        f"<td>{count}</td><td>{count / total:.1%}</td></tr>" if total else
+        f"<tr><td>{html.escape(label)}</td><td>{count}</td><td>–</td></tr>"
+        for label, count in counts.items()
+    )
+    body = (
+        f'<div style="display:flex;gap:24px;align-items:center">{svg_pie(counts)}'
+        f"<table><tr><th>Result</th><th>Tests</th><th>Share</th></tr>{legend}</table></div>"
+    )
+    top = sorted(durations, key=lambda item: item[1], reverse=True)[:slowest]
+    if top:
+        rows = "".join(f"<tr><td>{html.escape(nodeid)}</td><td>{duration:.3f}</td></tr>" for nodeid, duration in top)
+        body += (f"<h4>Slowest {len(top)} tests</h4>"
+                 f"<table><tr><th>Test</th><th>Call s</th></tr>{rows}</table>")
+    return f"<div><h3>{html.escape(title)}</h3>{body}</div>"
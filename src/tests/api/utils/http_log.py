@@ -0,0 +1,171 @@
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+
+"""
+Structured, lazily formatted request/response logging
+
+Keeps the cost of logging bookings and response bodies independent of the
+payload size when nobody reads the records.
+- lazy_json(value) → argument for "%s" in logger calls; json.dumps(indent=2)
+  runs only when a handler formats the record, and the text is capped at
+  `max_chars`. A requests Response is parsed only then as well.
+- HttpLog → ApiClient's `http_log`: one record per call on the "booker.http"
+  logger, with the fields in a structured `http` attribute (method,
+  endpoint, status, elapsed_ms, bytes, request/response bodies).
+    level              level of sampled calls (DEBUG: off unless enabled)
+    sample_rate        share of successful calls that are logged
+    always_log_errors  4xx/5xx bypass sampling and log at `error_level`
+    max_body_bytes     bodies are kept as the raw bytes and only decoded
+                       and truncated when the record is formatted
+  Nothing is built for a call whose level is disabled or that is not sampled.
+- JsonLinesFormatter → one JSON object per record (the `http` fields when
+  present, else the message)
+- start_queue_logging(handlers) → records of the "booker.http" logger go
+  through a queue to a background QueueListener, which formats and writes
+  them; returns stop() (flushes and detaches)
+"""
+MAX_JSON_CHARS = 4096
+HTTP_LOGGER = "booker.http"
+
+
+def _truncate(text, limit):
+    if limit is None or len(text) <= limit:
+        return text
+    return f"{text[:limit]}… [{len(text) - limit} more chars]"
+
+
+def _level(level):
+    """logging level from a name ("DEBUG") or number."""
+    return level if isinstance(level, int) else logging.getLevelName(level.upper())
+
+
+class _LazyJson:
+    __slots__ = ("value", "indent", "max_chars")
+
+    def __init__(self, value, indent, max_chars):
+        self.value = value
+        self.indent = indent
+        self.max_chars = max_chars
+
+    def __str__(self):
+        value = self.value
+        if hasattr(value, "status_code") and hasattr(value, "json"):  # requests.Response
+            try:
+                value = value.json()
+            except ValueError:
+                value = value.text
+        text = value if isinstance(value, str) else json.dumps(value, indent=self.indent, default=str)
+        return _truncate(text, self.max_chars)
+
+
+def lazy_json(value, indent=2, max_chars=MAX_JSON_CHARS):
+    """Pretty-printed JSON of `value`, rendered only if the log record is emitted."""
+    return _LazyJson(value, indent, max_chars)
+
+
+class _Body:
+    """Raw request/response body, decoded and truncated on formatting."""
+    __slots__ = ("raw", "limit")
+
+    def __init__(self, raw, limit):
+        self.raw = raw
+        self.limit = limit
+
+    def __str__(self):
+        raw = self.raw
+        if not raw:
+            return ""
+        if isinstance(raw, str):
+            raw = raw.encode()
+        if self.limit is None or len(raw) <= self.limit:
+            return raw.decode("utf-8", "replace")
+        return f"{raw[:self.limit].decode('utf-8', 'replace')}… [{len(raw) - self.limit} more bytes]"
+
+
+class HttpLog:
+    def __init__(self, logger=HTTP_LOGGER, level=logging.DEBUG, sample_rate=1.0, always_log_errors=True,
+                 error_level=logging.WARNING, max_body_bytes=2048, seed=None):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = _level(level)
+        self.error_level = _level(error_level)
+        self.sample_rate = sample_rate
+        self.always_log_errors = always_log_errors
+        self.max_body_bytes = max_body_bytes
+        # own generator: sampling must not consume the seeded payload randomness
+        self._random = random.Random(seed)
+
+    def record(self, method, endpoint, response, elapsed, streamed=False):
+        """Log one call if its level is enabled and it is sampled (errors always are)."""
+        error = self.always_log_errors and response.status_code >= 400
+        level = self.error_level if error else self.level
+        if not self.logger.isEnabledFor(level):
+            return
+        if not error and self.sample_rate < 1 and self._random.random() >= self.sample_rate:
+            return
+
+        request_body = response.request.body if response.request is not None else None
+        # a streamed body has not been read yet; reading it here would consume it
+        response_body = None if streamed else response.content
+        fields = {
+            "method": method,
+            "endpoint": endpoint,
+            "status": response.status_code,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "request_bytes": len(request_body) if request_body else 0,
+            "response_bytes": int(response.headers.get("Content-Length", 0)) if streamed else len(response_body),
+            "request_body": _Body(request_body, self.max_body_bytes),
+            "response_body": _Body(response_body, self.max_body_bytes),
+        }
+        self.logger.log(level, "%s %s → %s in %.1f ms\n  request: %s\n  response: %s",
+                        method, endpoint, fields["status"], fields["elapsed_ms"],
+                        fields["request_body"], fields["response_body"], extra={"http": fields})
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {"time": round(record.created, 3), "level": record.levelname, "logger": record.name}
+        http = getattr(record, "http", None)
+        if http is not None:
+            entry.update(http)
+        else:
+            entry["message"] = record.getMessage()
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread. The stock
+    prepare() formats the message on the logging thread, which is the cost
+    this handler exists to move; HttpLog's arguments are immutable
+    snapshots (bytes, numbers), so formatting them later is safe.
+    """
+
+    def prepare(self, record):
+        return copy.copy(record)
+
+
+def start_queue_logging(handlers, logger=HTTP_LOGGER, propagate=False):
+    """Send `logger`'s records through a queue to `handlers` on a background thread; returns stop()."""
+    log = logging.getLogger(logger) if isinstance(logger, str) else logger
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    queue_handler = _DeferredQueueHandler(records)
+    previous_propagate = log.propagate
+    log.addHandler(queue_handler)
+    log.propagate = propagate
+    listener.start()
+
+    def stop():
+        listener.stop()
+        log.removeHandler(queue_handler)
+        log.propagate = previous_propagate
+        for handler in handlers:
+            handler.close()
+
+    return stop
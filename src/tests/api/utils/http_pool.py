@@ -0,0 +1,132 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+"""
+HTTP connection pooling
+
+Keeps TCP/TLS connections alive between API calls instead of opening a
+new one per request.
+- build_session → create a requests.Session backed by a sized urllib3 pool
+- get_shared_session → return a process-wide session for the given settings
+- close_shared_sessions → close all shared sessions (end of test session)
+- thread_connections_opened → connections opened so far by the calling
+  thread (lets ApiClient tell new connections from reused ones)
+
+Pool settings (all optional, see DEFAULT_POOL_SETTINGS):
+- pool_connections → number of per-host pools kept in the adapter
+- pool_maxsize → max open connections kept per host
+- pool_block → block instead of opening extra connections above pool_maxsize
+- max_retries → retries for connection errors (requests are never re-sent
+  after the server has read them)
+- backoff_factor → sleep factor between connection retries
+- keep_alive → reuse connections; False sends "Connection: close"
+"""
+DEFAULT_POOL_SETTINGS = {
+    "pool_connections": 10,
+    "pool_maxsize": 20,
+    "pool_block": False,
+    "max_retries": 0,
+    "backoff_factor": 0.1,
+    "keep_alive": True,
+}
+
+_shared_sessions = {}
+_shared_lock = threading.Lock()
+_connection_events = threading.local()
+
+
+def thread_connections_opened():
+    """Number of TCP connections opened by the current thread."""
+    return getattr(_connection_events, "opened", 0)
+
+
+def _count_new_connection():
+    _connection_events.opened = thread_connections_opened() + 1
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count_new_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count_new_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools report every newly opened connection."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def _settings_key(settings):
+    """Merge settings with defaults and return them as a hashable key."""
+    merged = {**DEFAULT_POOL_SETTINGS, **(settings or {})}
+    unknown = set(merged) - set(DEFAULT_POOL_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown HTTP pool setting(s): {sorted(unknown)}")
+    return tuple(sorted(merged.items()))
+
+
+def build_session(**settings):
+    """
+    Create a requests.Session with a keep-alive connection pool.
+    The session ignores Set-Cookie so it can be shared safely between clients
+    that send different auth cookies.
+    """
+    options = dict(_settings_key(settings))
+
+    retries = Retry(
+        total=options["max_retries"],
+        read=False,   # never replay a request the server may have processed
+        status=0,
+        backoff_factor=options["backoff_factor"],
+        raise_on_status=False,
+    )
+    adapter = _CountingHTTPAdapter(
+        pool_connections=options["pool_connections"],
+        pool_maxsize=options["pool_maxsize"],
+        pool_block=options["pool_block"],
+        max_retries=retries,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    if not options["keep_alive"]:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_shared_session(**settings):
+    """Return the process-wide session for these pool settings, creating it once."""
+    key = _settings_key(settings)
+    with _shared_lock:
+        session = _shared_sessions.get(key)
+        if session is None:
+            session = build_session(**dict(key))
+            _shared_sessions[key] = session
+        return session
+
+
+def close_shared_sessions():
+    """Close every shared session and drop its pooled connections."""
+    with _shared_lock:
+        sessions = list(_shared_sessions.values())
+        _shared_sessions.clear()
+    for session in sessions:
+        session.close()
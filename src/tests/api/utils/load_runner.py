@@ -0,0 +1,242 @@
+import html
+import json
+import math
+import os
+import threading
+import time
+
+import requests
+
+from tests.api.utils.metrics import LatencyHistogram
+from tests.api.utils.scenarios import StepError, booking_lifecycle
+
+"""
+Load generation for booking scenarios
+
+Replays a scenario (default: booking_lifecycle) from many threads for a
+fixed duration and reports per-endpoint latency and error rates.
+- concurrency → number of worker threads looping the scenario (closed loop)
+- target_rps → optional cap on requests/sec across all workers; each
+  request waits for its slot from a shared RatePacer
+- payloads → optional shared iterator (e.g. a seeded PayloadStream) feeding
+  each scenario iteration, so two runs send the same data
+- keep_samples → per-request latencies are kept for exact percentiles;
+  subclasses running for hours (SoakRunner) set it False and only keep a
+  fixed-size LatencyHistogram per endpoint
+- any exception fails only its iteration: a failed step (StepError,
+  transport error) is already counted per endpoint, anything else the
+  scenario raises (e.g. KeyError on an unexpected 200 body) is counted
+  by type under "scenario_errors"; a worker stops only when `payloads`
+  runs out
+- LoadRunner.run() returns a JSON-serializable report:
+    {"duration_s", "requests", "iterations", "failed_iterations",
+     "scenario_errors": {type: count}, "throughput_rps", "errors",
+     "error_rate", "endpoints": {label: {"count", "errors", "error_rate",
+     "p50_ms", "p95_ms", "p99_ms", "max_ms", "mean_ms", "statuses"}}}
+- write_report / render_html_table → persist the report and embed it in
+  the pytest-html summary
+"""
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class EndpointStats:
+    """
+    Latencies (seconds), error count and status codes for one endpoint label.
+    With keep_samples=False latencies only go into a LatencyHistogram
+    (constant memory, percentiles within the histogram's bucket precision).
+    """
+
+    def __init__(self, keep_samples=True):
+        self.latencies = [] if keep_samples else None
+        self.histogram = None if keep_samples else LatencyHistogram()
+        self.errors = 0
+        self.statuses = {}
+
+    def add(self, elapsed):
+        if self.histogram is None:
+            self.latencies.append(elapsed)
+        else:
+            self.histogram.record(elapsed * 1_000_000)
+
+    def _latency_summary(self):
+        """count, p50/p95/p99/max/mean in ms."""
+        if self.histogram is not None:
+            h = self.histogram
+            return h.total, {
+                "p50_ms": round(h.percentile(50) / 1000, 2),
+                "p95_ms": round(h.percentile(95) / 1000, 2),
+                "p99_ms": round(h.percentile(99) / 1000, 2),
+                "max_ms": round(h.max_us / 1000, 2),
+                "mean_ms": round(h.sum_us / h.total / 1000, 2) if h.total else 0.0,
+            }
+        values = sorted(self.latencies)
+        count = len(values)
+        return count, {
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+            "mean_ms": round(sum(values) / count * 1000, 2) if count else 0.0,
+        }
+
+    def summary(self):
+        count, latency = self._latency_summary()
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            **latency,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items(), key=lambda i: str(i[0]))},
+        }
+
+
+class RatePacer:
+    """Hands out evenly spaced request slots to reach a target requests/sec."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.perf_counter()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class LoadRunner:
+    keep_samples = True
+
+    def __init__(self, client, scenario=booking_lifecycle, duration=30, concurrency=8, target_rps=None,
+                 payloads=None):
+        if duration <= 0 or concurrency < 1:
+            raise ValueError("duration must be > 0 and concurrency >= 1")
+        self.client = client
+        self.scenario = scenario
+        self.duration = duration
+        self.concurrency = concurrency
+        self.target_rps = target_rps
+        self.payloads = payloads
+        self._pacer = RatePacer(target_rps) if target_rps else None
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._iterations = 0
+        self._failed_iterations = 0
+        self._scenario_errors = {}
+
+    def _record(self, label, elapsed, status, error):
+        with self._lock:
+            stats = self._stats.get(label)
+            if stats is None:
+                stats = self._stats[label] = EndpointStats(self.keep_samples)
+            stats.add(elapsed)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if error:
+                stats.errors += 1
+
+    def step(self, label, send, expected):
+        """Time one request; transport errors and unexpected statuses count as errors."""
+        if self._pacer:
+            self._pacer.wait()
+        start = time.perf_counter()
+        try:
+            response = send()
+        except requests.RequestException:
+            self._record(label, time.perf_counter() - start, "exception", True)
+            raise
+        ok = response.status_code in expected
+        self._record(label, time.perf_counter() - start, response.status_code, not ok)
+        if not ok:
+            raise StepError(label, response)
+        return response
+
+    def _worker(self, deadline):
+        while time.perf_counter() < deadline:
+            kwargs = {}
+            if self.payloads is not None:
+                try:
+                    kwargs["payload"] = next(self.payloads)
+                except StopIteration:
+                    return
+            error = None
+            try:
+                self.scenario(self.client, self.step, **kwargs)
+            except (StepError, requests.RequestException):
+                error = "step"  # already recorded against its endpoint
+            except Exception as exc:
+                error = type(exc).__name__
+            with self._lock:
+                self._iterations += 1
+                self._failed_iterations += error is not None
+                if error not in (None, "step"):
+                    self._scenario_errors[error] = self._scenario_errors.get(error, 0) + 1
+
+    def run(self):
+        """Run the scenario until the duration elapses and return the report."""
+        start = time.perf_counter()
+        deadline = start + self.duration
+        threads = [
+            threading.Thread(target=self._worker, args=(deadline,), name=f"load-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        endpoints = {label: stats.summary() for label, stats in sorted(self._stats.items())}
+        requests_total = sum(e["count"] for e in endpoints.values())
+        errors_total = sum(e["errors"] for e in endpoints.values())
+        return {
+            "scenario": self.scenario.__name__,
+            "duration_s": round(elapsed, 2),
+            "concurrency": self.concurrency,
+            "target_rps": self.target_rps,
+            "iterations": self._iterations,
+            "failed_iterations": self._failed_iterations,
+            "scenario_errors": dict(sorted(self._scenario_errors.items())),
+            "requests": requests_total,
+            "throughput_rps": round(requests_total / elapsed, 2) if elapsed else 0.0,
+            "errors": errors_total,
+            "error_rate": round(errors_total / requests_total, 4) if requests_total else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def write_report(report, path):
+    """Write the report as JSON, creating parent directories."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def render_html_table(report, title="Load Test Results"):
+    """Per-endpoint latency/error table for the pytest-html summary."""
+    rows = "".join(
+        "<tr>"
+        f"<td>{html.escape(label)}</td><td>{e['count']}</td><td>{e['errors']} ({e['error_rate']:.2%})</td>"
+        f"<td>{e['p50_ms']}</td><td>{e['p95_ms']}</td><td>{e['p99_ms']}</td><td>{e['max_ms']}</td>"
+        "</tr>"
+        for label, e in report["endpoints"].items()
+    )
+    return (
+        f"<div><h3>{html.escape(title)}</h3>"
+        f"<p>{report['scenario']}: {report['requests']} requests in {report['duration_s']}s "
+        f"({report['throughput_rps']} req/s, concurrency {report['concurrency']}, "
+        f"target rps {report['target_rps'] or 'unbounded'}), error rate {report['error_rate']:.2%}</p>"
+        "<table><tr><th>Endpoint</th><th>Requests</th><th>Errors</th>"
+        "<th>p50 ms</th><th>p95 ms</th><th>p99 ms</th><th>max ms</th></tr>"
+        f"{rows}</table></div>"
+    )
@@ -0,0 +1,496 @@
+import argparse
+import base64
+import json
+import math
+import secrets
+import threading
+import time
+import zlib
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+"""
+Local Restful-Booker stand-in
+
+In-process fake of https://restful-booker.herokuapp.com for offline and
+high-throughput runs. Mirrors the live API's observable behaviour:
+- GET  /ping              → 201 Created
+- POST /auth              → {"token": ...} or {"reason": "Bad credentials"}
+- GET  /booking           → [{"bookingid": id}, ...], filters: firstname,
+                            lastname (exact), checkin (>=), checkout (<=)
+- POST /booking           → {"bookingid": id, "booking": {...}}
+- GET/PUT/PATCH/DELETE /booking/{id}
+  (PUT/PATCH/DELETE need a `token` cookie or Basic auth; unknown IDs give
+  404 on GET and 405 on PUT/PATCH/DELETE like the live service)
+- JSON GET responses carry a weak ETag and honour If-None-Match with 304,
+  as the live Express app does
+- optional `rate_limit` (requests/s, token bucket of `burst`) answers
+  excess requests with 429 and a Retry-After in whole seconds, like a
+  throttling proxy in front of a deployment
+
+Bookings live in BookingStore, which keeps exact-match indexes on names and
+sorted (date, id) arrays on checkin/checkout so filtered GET /booking stays
+fast with millions of bookings.
+
+Usage:
+    with LocalBookerServer() as server:
+        client = ApiClient(server.base_url)
+
+    # or standalone
+    PYTHONPATH=src python -m tests.api.utils.local_booker_server --port 3001
+"""
+BOOKING_FIELDS = {
+    "firstname": str,
+    "lastname": str,
+    "totalprice": int,
+    "depositpaid": bool,
+    "bookingdates": dict,
+}
+DATE_FILTERS = ("checkin", "checkout")
+
+
+def _parse_date(value):
+    """Normalize YYYY-MM-DD; raises ValueError for other formats."""
+    return datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+
+
+def _is_valid_booking(payload):
+    """Full bookings (POST/PUT) must carry every field with the right type."""
+    if not isinstance(payload, dict):
+        return False
+    for field, field_type in BOOKING_FIELDS.items():
+        value = payload.get(field)
+        if not isinstance(value, field_type) or (field_type is int and isinstance(value, bool)):
+            return False
+    dates = payload["bookingdates"]
+    try:
+        _parse_date(dates.get("checkin"))
+        _parse_date(dates.get("checkout"))
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _normalize_booking(payload):
+    booking = {
+        "firstname": payload["firstname"],
+        "lastname": payload["lastname"],
+        "totalprice": payload["totalprice"],
+        "depositpaid": payload["depositpaid"],
+        "bookingdates": {
+            "checkin": _parse_date(payload["bookingdates"]["checkin"]),
+            "checkout": _parse_date(payload["bookingdates"]["checkout"]),
+        },
+    }
+    if "additionalneeds" in payload:
+        booking["additionalneeds"] = payload["additionalneeds"]
+    return booking
+
+
+def _name_key(booking, key):
+    """Only string names are indexed (query params are always strings)."""
+    value = booking.get(key)
+    return value if isinstance(value, str) else None
+
+
+def _date_key(booking, key):
+    value = (booking.get("bookingdates") or {}).get(key)
+    return "" if value is None else str(value)
+
+
+class BookingStore:
+    """
+    Thread-safe in-memory booking table with secondary indexes.
+    - firstname/lastname → dict of value → set(ids)        (exact match)
+    - checkin/checkout  → sorted list of (date, id) tuples (range via bisect)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._bookings = {}
+        self._next_id = 1
+        self._name_index = {"firstname": {}, "lastname": {}}
+        self._date_index = {"checkin": [], "checkout": []}
+
+    def __len__(self):
+        return len(self._bookings)
+
+    # Index maintenance
+    def _index(self, booking_id, booking):
+        for key, index in self._name_index.items():
+            index.setdefault(_name_key(booking, key), set()).add(booking_id)
+        for key, index in self._date_index.items():
+            insort(index, (_date_key(booking, key), booking_id))
+
+    def _unindex(self, booking_id, booking):
+        for key, index in self._name_index.items():
+            name = _name_key(booking, key)
+            ids = index.get(name)
+            if ids is not None:
+                ids.discard(booking_id)
+                if not ids:
+                    del index[name]
+        for key, index in self._date_index.items():
+            entry = (_date_key(booking, key), booking_id)
+            pos = bisect_left(index, entry)
+            if pos < len(index) and index[pos] == entry:
+                del index[pos]
+
+    # CRUD
+    def create(self, booking):
+        with self._lock:
+            booking_id = self._next_id
+            self._next_id += 1
+            self._bookings[booking_id] = booking
+            self._index(booking_id, booking)
+            return booking_id
+
+    def bulk_create(self, payloads):
+        """
+        Insert many booking payloads at once (normalized as POST /booking
+        does, one sort per date index); returns their IDs.
+        """
+        bookings = [_normalize_booking(payload) for payload in payloads]
+        with self._lock:
+            first_id = self._next_id
+            ids = list(range(first_id, first_id + len(bookings)))
+            self._next_id += len(bookings)
+            for booking_id, booking in zip(ids, bookings):
+                self._bookings[booking_id] = booking
+                for key, index in self._name_index.items():
+                    index.setdefault(_name_key(booking, key), set()).add(booking_id)
+            for key, index in self._date_index.items():
+                index.extend((_date_key(b, key), i) for i, b in zip(ids, bookings))
+                index.sort()
+            return ids
+
+    def get(self, booking_id):
+        with self._lock:
+            return self._bookings.get(booking_id)
+
+    def replace(self, booking_id, booking):
+        with self._lock:
+            current = self._bookings.get(booking_id)
+            if current is None:
+                return None
+            self._unindex(booking_id, current)
+            self._bookings[booking_id] = booking
+            self._index(booking_id, booking)
+            return booking
+
+    def update(self, booking_id, changes):
+        """Merge partial changes (PATCH semantics) and re-index."""
+        with self._lock:
+            current = self._bookings.get(booking_id)
+            if current is None:
+                return None
+            merged = {**current, **changes}
+            merged["bookingdates"] = {**current["bookingdates"], **(changes.get("bookingdates") or {})}
+            return self.replace(booking_id, merged)
+
+    def delete(self, booking_id):
+        with self._lock:
+            booking = self._bookings.pop(booking_id, None)
+            if booking is None:
+                return False
+            self._unindex(booking_id, booking)
+            return True
+
+    # Queries
+    def _date_range_ids(self, key, value):
+        index = self._date_index[key]
+        if key == "checkin":
+            return (entry[1] for entry in index[bisect_left(index, (value,)):])
+        return (entry[1] for entry in index[:bisect_right(index, (value, float("inf")))])
+
+    def find(self, filters):
+        """
+        Return booking IDs matching all filters.
+        Name filters are intersected first; date filters are then either
+        range-scanned via bisect or checked per remaining candidate.
+        """
+        with self._lock:
+            if not filters:
+                return list(self._bookings)
+
+            candidates = None
+            for key in ("firstname", "lastname"):
+                if key in filters:
+                    ids = self._name_index[key].get(filters[key], set())
+                    candidates = ids if candidates is None else candidates & ids
+                    if not candidates:
+                        return []
+
+            date_filters = [(k, filters[k]) for k in DATE_FILTERS if k in filters]
+            if candidates is None:
+                if not date_filters:
+                    return list(self._bookings)
+                # Start from the first date range, check the rest per booking
+                key, value = date_filters.pop(0)
+                candidates = self._date_range_ids(key, value)
+
+            result = []
+            for booking_id in candidates:
+                booking = self._bookings[booking_id]
+                if all(
+                    _date_key(booking, k) >= v if k == "checkin" else _date_key(booking, k) <= v
+                    for k, v in date_filters
+                ):
+                    result.append(booking_id)
+            return sorted(result) if isinstance(candidates, set) else result
+
+
+class RateLimit:
+    """Token bucket: `rate` requests/s, bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Take a token; 0 when allowed, else the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
+class _BookerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    # Response helpers
+    def _send(self, status, body=b"", content_type="text/plain; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        if self.command == "GET":
+            etag = f'W/"{len(body):x}-{zlib.crc32(body):08x}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def _send_text(self, status, text):
+        self._send(status, text.encode())
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"null")
+        except ValueError:
+            return None
+
+    def _authorized(self):
+        server = self.server
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "token" and value in server.tokens:
+                return True
+        auth = self.headers.get("Authorization") or ""
+        if auth.startswith("Basic "):
+            try:
+                user, _, password = base64.b64decode(auth[6:]).decode().partition(":")
+            except ValueError:
+                return False
+            return (user, password) == (server.username, server.password)
+        return False
+
+    def _booking_id(self, path):
+        try:
+            return int(path.rsplit("/", 1)[1])
+        except ValueError:
+            return None
+
+    def _throttled(self):
+        """429 + Retry-After when the rate limit is exhausted (body drained to keep the connection usable)."""
+        rate_limit = self.server.rate_limit
+        wait = rate_limit.take() if rate_limit is not None else 0
+        if not wait:
+            return False
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = b"Too Many Requests"
+        self.send_response(429)
+        self.send_header("Retry-After", str(max(1, math.ceil(wait))))
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+
+    # Routing
+    def _route(self, method):
+        if self._throttled():
+            return
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        store = self.server.store
+
+        if path == "/ping" and method == "GET":
+            return self._send_text(201, "Created")
+
+        if path == "/auth" and method == "POST":
+            body = self._read_json() or {}
+            if (body.get("username"), body.get("password")) == (self.server.username, self.server.password):
+                token = secrets.token_hex(8)[:15]
+                self.server.tokens.add(token)
+                return self._send_json({"token": token})
+            return self._send_json({"reason": "Bad credentials"})
+
+        if path == "/booking":
+            if method == "GET":
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                filters = {k: query[k] for k in ("firstname", "lastname") if k in query}
+                try:
+                    for key in DATE_FILTERS:
+                        if key in query:
+                            filters[key] = _parse_date(query[key])
+                except ValueError:
+                    return self._send_text(500, "Internal Server Error")
+                return self._send_json([{"bookingid": i} for i in store.find(filters)])
+            if method == "POST":
+                body = self._read_json()
+                if not _is_valid_booking(body):
+                    return self._send_text(500, "Internal Server Error")
+                booking = _normalize_booking(body)
+                return self._send_json({"bookingid": store.create(booking), "booking": booking})
+            return self._send_text(404, "Not Found")
+
+        if path.startswith("/booking/"):
+            booking_id = self._booking_id(path)
+            if method == "GET":
+                booking = store.get(booking_id)
+                if booking is None:
+                    return self._send_text(404, "Not Found")
+                return self._send_json(booking)
+
+            if method in ("PUT", "PATCH", "DELETE"):
+                body = self._read_json() if method != "DELETE" else None
+                if not self._authorized():
+                    return self._send_text(403, "Forbidden")
+                if method == "DELETE":
+                    if store.delete(booking_id):
+                        return self._send_text(201, "Created")
+                    return self._send_text(405, "Method Not Allowed")
+                if store.get(booking_id) is None:
+                    return self._send_text(405, "Method Not Allowed")
+                if method == "PUT":
+                    if not _is_valid_booking(body):
+                        return self._send_text(400, "Bad Request")
+                    return self._send_json(store.replace(booking_id, _normalize_booking(body)))
+                if not isinstance(body, dict) or not isinstance(body.get("bookingdates", {}), dict):
+                    return self._send_text(400, "Bad Request")
+                return self._send_json(store.update(booking_id, body))
+
+        return self._send_text(404, "Not Found")
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def do_PATCH(self):
+        self._route("PATCH")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+
+class LocalBookerServer:
+    """Runs the fake Booker API on a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=0, username="admin", password="password123", store=None,
+                 rate_limit=None, burst=None):
+        self.httpd = ThreadingHTTPServer((host, port), _BookerHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.store = store or BookingStore()
+        self.httpd.tokens = set()
+        self.httpd.username = username
+        self.httpd.password = password
+        self.httpd.rate_limit = RateLimit(rate_limit, burst) if rate_limit else None
+        self._thread = None
+
+    @property
+    def store(self):
+        return self.httpd.store
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.httpd.serve_forever, name="local-booker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local Restful-Booker stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests/s before answering 429")
+    parser.add_argument("--burst", type=int, default=None)
+    args = parser.parse_args()
+
+    server = LocalBookerServer(args.host, args.port, rate_limit=args.rate_limit, burst=args.burst)
+    print(f"Local Booker API listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
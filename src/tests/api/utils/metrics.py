@@ -0,0 +1,304 @@
+import html
+import re
+import threading
+
+from tests.api.utils.html_summary import svg_latency_bar
+
+"""
+API call metrics
+
+Low-overhead instrumentation fed by ApiClient on every request.
+- LatencyHistogram → HDR-style log-linear histogram (microseconds, <1%
+  relative error, fixed memory) that can be merged across processes
+- ApiMetrics → per "METHOD /endpoint/{template}" histogram plus status
+  codes, bytes in/out and new vs reused connections; also per-label wait
+  histograms from the polling engine (record_wait)
+- endpoint_template → "/booking/123?x=1" → "/booking/{id}"
+- api_metrics → process-wide collector used by ApiClient by default
+
+Summaries are plain dicts (see ApiMetrics.summary) so they can be written
+as JSON, merged from xdist workers and rendered into the HTML report
+(render_html_table: per-endpoint timings, error share, share of total
+API time and an inline p50/p95/p99 bar).
+"""
+_ID_SEGMENT = re.compile(r"^(/booking)/[^/?]+|/\d+(?=/|$)")
+
+
+def endpoint_template(endpoint):
+    """Collapse IDs so metrics aggregate per endpoint, not per booking."""
+    path = endpoint.split("?", 1)[0]
+    return _ID_SEGMENT.sub(lambda m: f"{m.group(1) or ''}/{{id}}", path) or "/"
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram in the spirit of HdrHistogram.
+    Values below 2**SUB_BUCKET_BITS are counted exactly; above that each
+    power-of-two range is split into 2**(SUB_BUCKET_BITS - 1) buckets.
+    """
+    SUB_BUCKET_BITS = 8
+    SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+    SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+    def __init__(self, max_value_us=120_000_000):
+        self.max_value_us = max_value_us
+        self.counts = [0] * (self._index(max_value_us) + 1)
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value):
+        if value < self.SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - self.SUB_BUCKET_BITS
+        return self.SUB_BUCKET_COUNT + (shift - 1) * self.SUB_BUCKET_HALF + ((value >> shift) - self.SUB_BUCKET_HALF)
+
+    def _highest_equivalent(self, index):
+        if index < self.SUB_BUCKET_COUNT:
+            return index
+        shift, sub = divmod(index - self.SUB_BUCKET_COUNT, self.SUB_BUCKET_HALF)
+        return ((sub + self.SUB_BUCKET_HALF + 1) << (shift + 1)) - 1
+
+    def record(self, value_us):
+        value_us = min(max(int(value_us), 0), self.max_value_us)
+        self.counts[self._index(value_us)] += 1
+        self.total += 1
+        self.sum_us += value_us
+        self.max_us = max(self.max_us, value_us)
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+
+    def percentile(self, q):
+        """Highest value (us) within the bucket holding the q-th percentile."""
+        if not self.total:
+            return 0
+        target = max(1, -(-self.total * q // 100))
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return min(self._highest_equivalent(index), self.max_us)
+        return self.max_us
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def to_dict(self):
+        """Sparse, JSON-friendly form (only non-empty buckets)."""
+        return {
+            "max_value_us": self.max_value_us,
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c},
+            "total": self.total,
+            "sum_us": self.sum_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["max_value_us"])
+        for index, count in data["buckets"].items():
+            histogram.counts[int(index)] = count
+        histogram.total = data["total"]
+        histogram.sum_us = data["sum_us"]
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        return histogram
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.statuses = {}
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def to_dict(self):
+        return {
+            "latency": self.latency.to_dict(),
+            "statuses": dict(self.statuses),
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+        }
+
+    def merge_dict(self, data):
+        self.latency.merge(LatencyHistogram.from_dict(data["latency"]))
+        for status, count in data["statuses"].items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.bytes_out += data["bytes_out"]
+        self.bytes_in += data["bytes_in"]
+        self.new_connections += data["new_connections"]
+        self.reused_connections += data["reused_connections"]
+
+    def summary(self):
+        hist = self.latency
+        errors = sum(n for status, n in self.statuses.items() if not status.isdigit() or int(status) >= 400)
+        return {
+            "count": hist.total,
+            "errors": errors,
+            "min_ms": (hist.min_us or 0) / 1000,
+            "p50_ms": hist.percentile(50) / 1000,
+            "p95_ms": hist.percentile(95) / 1000,
+            "p99_ms": hist.percentile(99) / 1000,
+            "max_ms": hist.max_us / 1000,
+            "mean_ms": round(hist.sum_us / hist.total / 1000, 3) if hist.total else 0.0,
+            "total_s": round(hist.sum_us / 1_000_000, 3),
+            "statuses": dict(sorted(self.statuses.items())),
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+        }
+
+
+class WaitMetrics:
+    """How long polling waits took, how many attempts they made and how many timed out."""
+
+    def __init__(self):
+        self.duration = LatencyHistogram()
+        self.attempts = 0
+        self.timeouts = 0
+
+    def to_dict(self):
+        return {"duration": self.duration.to_dict(), "attempts": self.attempts, "timeouts": self.timeouts}
+
+    def merge_dict(self, data):
+        self.duration.merge(LatencyHistogram.from_dict(data["duration"]))
+        self.attempts += data["attempts"]
+        self.timeouts += data["timeouts"]
+
+    def summary(self):
+        hist = self.duration
+        return {
+            "waits": hist.total,
+            "timeouts": self.timeouts,
+            "avg_attempts": round(self.attempts / hist.total, 2) if hist.total else 0.0,
+            "p50_ms": hist.percentile(50) / 1000,
+            "p95_ms": hist.percentile(95) / 1000,
+            "max_ms": hist.max_us / 1000,
+            "total_s": round(hist.sum_us / 1_000_000, 3),
+        }
+
+
+class ApiMetrics:
+    """Thread-safe per-endpoint (and per-wait) metrics for one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+        self.waits = {}
+
+    def record(self, method, endpoint, status, elapsed_s, bytes_out=0, bytes_in=0, new_connection=False):
+        key = f"{method} {endpoint_template(endpoint)}"
+        status = str(status)
+        with self._lock:
+            metrics = self.endpoints.get(key)
+            if metrics is None:
+                metrics = self.endpoints[key] = EndpointMetrics()
+            metrics.latency.record(elapsed_s * 1_000_000)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.bytes_out += bytes_out
+            metrics.bytes_in += bytes_in
+            if new_connection:
+                metrics.new_connections += 1
+            else:
+                metrics.reused_connections += 1
+
+    def record_wait(self, label, elapsed_s, attempts, succeeded):
+        with self._lock:
+            metrics = self.waits.get(label)
+            if metrics is None:
+                metrics = self.waits[label] = WaitMetrics()
+            metrics.duration.record(elapsed_s * 1_000_000)
+            metrics.attempts += attempts
+            if not succeeded:
+                metrics.timeouts += 1
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            self.waits = {}
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "endpoints": {key: m.to_dict() for key, m in self.endpoints.items()},
+                "waits": {label: m.to_dict() for label, m in self.waits.items()},
+            }
+
+    def merge_dict(self, data):
+        with self._lock:
+            for key, endpoint_data in data.get("endpoints", {}).items():
+                self.endpoints.setdefault(key, EndpointMetrics()).merge_dict(endpoint_data)
+            for label, wait_data in data.get("waits", {}).items():
+                self.waits.setdefault(label, WaitMetrics()).merge_dict(wait_data)
+
+    def summary(self):
+        """Per-endpoint summaries, sorted by endpoint key."""
+        with self._lock:
+            return {key: self.endpoints[key].summary() for key in sorted(self.endpoints)}
+
+    def wait_summary(self):
+        """Per-label polling wait summaries."""
+        with self._lock:
+            return {label: self.waits[label].summary() for label in sorted(self.waits)}
+
+
+def render_waits_html_table(wait_summary, title="Polling Waits"):
+    """Per-label polling wait table for the pytest-html summary."""
+    rows = "".join(
+        "<tr>"
+        f"<td>{html.escape(label)}</td><td>{w['waits']}</td><td>{w['timeouts']}</td><td>{w['avg_attempts']}</td>"
+        f"<td>{w['p50_ms']:.2f}</td><td>{w['p95_ms']:.2f}</td><td>{w['max_ms']:.2f}</td><td>{w['total_s']}</td>"
+        "</tr>"
+        for label, w in wait_summary.items()
+    )
+    return (
+        f"<div><h3>{html.escape(title)}</h3>"
+        "<table><tr><th>Wait</th><th>Count</th><th>Timeouts</th><th>Avg attempts</th>"
+        "<th>p50 ms</th><th>p95 ms</th><th>max ms</th><th>Total s</th></tr>"
+        f"{rows}</table></div>"
+    )
+
+
+def render_html_table(summary, title="API Call Metrics"):
+    """Per-endpoint timing/status/bytes table for the pytest-html summary, slowest total first."""
+    total_s = sum(m["total_s"] for m in summary.values())
+    scale = max((m["p99_ms"] for m in summary.values()), default=0)
+    rows = "".join(
+        "<tr>"
+        f"<td>{html.escape(key)}</td><td>{m['count']}</td>"
+        f"<td>{m['errors']} ({m['errors'] / m['count'] if m['count'] else 0:.1%})</td>"
+        f"<td>{m['min_ms']:.2f}</td><td>{m['mean_ms']:.2f}</td>"
+        f"<td>{m['p50_ms']:.2f}</td><td>{m['p95_ms']:.2f}</td><td>{m['p99_ms']:.2f}</td><td>{m['max_ms']:.2f}</td>"
+        f"<td>{svg_latency_bar(m['p50_ms'], m['p95_ms'], m['p99_ms'], scale)}</td>"
+        f"<td>{m['total_s']:.3f}</td><td>{m['total_s'] / total_s if total_s else 0:.1%}</td>"
+        f"<td>{html.escape(', '.join(f'{s}×{n}' for s, n in m['statuses'].items()))}</td>"
+        f"<td>{m['bytes_out']}</td><td>{m['bytes_in']}</td>"
+        f"<td>{m['reused_connections']}/{m['count']}</td>"
+        "</tr>"
+        for key, m in sorted(summary.items(), key=lambda item: item[1]["total_s"], reverse=True)
+    )
+    return (
+        f"<div><h3>{html.escape(title)}</h3>"
+        f"<p>{sum(m['count'] for m in summary.values())} calls, {total_s:.3f}s total API time</p>"
+        "<table><tr><th>Endpoint</th><th>Calls</th><th>Errors</th><th>min ms</th><th>mean ms</th>"
+        "<th>p50 ms</th><th>p95 ms</th><th>p99 ms</th><th>max ms</th><th>p50 | p95 | p99</th>"
+        "<th>Total s</th><th>Share</th><th>Statuses</th><th>Bytes out</th><th>Bytes in</th>"
+        "<th>Reused conns</th></tr>"
+        f"{rows}</table></div>"
+    )
+
+
+api_metrics = ApiMetrics()
@@ -0,0 +1,230 @@
+import html
+import json
+import math
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from urllib.parse import urlencode, urlsplit
+
+from filelock import FileLock
+
+from tests.api.utils.load_runner import percentile
+
+"""
+Performance regression baselines
+
+Per-endpoint latency baselines, stored per environment, and a statistical
+comparison of a new run against them instead of a fixed threshold.
+- measure(call, iterations, warmup) → latencies (ms) of the measured calls;
+  warmup calls are sent but not kept
+- batch_p95(samples, batch_size) → p95 of each consecutive batch; the
+  comparison works on these, so it tests the tail, not the median
+- mann_whitney_greater(x, y) → (U, one-sided p) that x tends to be larger
+  than y; exact distribution for small tie-free samples, else the normal
+  approximation with tie and continuity correction
+- compare(baseline, samples) → verdict; a regression needs both
+  statistical significance (p < alpha) and a practical one (median batch
+  p95 up by at least max(min_delta_ms, min_increase × baseline p95)), so
+  noise on a quiet endpoint and tiny but "significant" shifts on large
+  samples or sub-millisecond endpoints all pass
+- BaselineStore(directory, environment) → <directory>/<environment>.json,
+  a versioned file (FORMAT_VERSION) meant to be committed; updates are
+  merged under a file lock, so xdist workers can record concurrently
+- environment_name(base_url) → "local" for the stand-in, else the host
+- render_regression_html → per-endpoint verdict table for the HTML report
+"""
+FORMAT_VERSION = 1
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def environment_name(base_url):
+    host = urlsplit(base_url).hostname or "unknown"
+    return "local" if host in LOCAL_HOSTS else host
+
+
+def endpoint_name(method, path, params=None):
+    """Baseline key: method, path and the query with sorted parameters."""
+    query = urlencode(sorted((params or {}).items()))
+    return f"{method} {path}?{query}" if query else f"{method} {path}"
+
+
+def measure(call, iterations, warmup=0, expected=None):
+    """
+    Send call(i) for i in range(warmup + iterations); latency in ms of the
+    measured ones. Any status outside `expected` fails the measurement.
+    """
+    samples = []
+    for i in range(warmup + iterations):
+        start = time.perf_counter()
+        response = call(i)
+        elapsed = time.perf_counter() - start
+        if expected is not None and response.status_code not in expected:
+            raise AssertionError(f"Unexpected status {response.status_code} (expected {expected}): "
+                                 f"{response.text[:200]}")
+        if i >= warmup:
+            samples.append(elapsed * 1000)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+def batch_p95(samples, batch_size):
+    """p95 of each full batch of `batch_size` consecutive samples (a trailing partial batch is dropped)."""
+    return [round(percentile(sorted(samples[i:i + batch_size]), 95), 3)
+            for i in range(0, len(samples) - batch_size + 1, batch_size)]
+
+
+def _ranks(values):
+    """Average ranks (1-based) of `values` and the tie correction term sum(t^3 - t)."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = 0
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        size = j - i + 1
+        ties += size ** 3 - size
+        i = j + 1
+    return ranks, ties
+
+
+@lru_cache(maxsize=None)
+def _u_counts(n1, n2):
+    """Number of orderings of n1 x's and n2 y's for every value of U (exact null distribution)."""
+    if n1 == 0 or n2 == 0:
+        return (1,)
+    # U(n1, n2) = U(n1 - 1, n2) + n2 when the largest value is an x, else U(n1, n2 - 1)
+    with_x = _u_counts(n1 - 1, n2)
+    with_y = _u_counts(n1, n2 - 1)
+    counts = [0] * (n1 * n2 + 1)
+    for u, count in enumerate(with_x):
+        counts[u + n2] += count
+    for u, count in enumerate(with_y):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_greater(x, y, exact_limit=20):
+    """One-sided Mann-Whitney U test of "x tends to be larger than y": (U of x, p-value)."""
+    n1, n2 = len(x), len(y)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    ranks, ties = _ranks(list(x) + list(y))
+    u = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+
+    if not ties and max(n1, n2) <= exact_limit:
+        counts = _u_counts(n1, n2)
+        return u, sum(counts[int(u):]) / math.comb(n1 + n2, n1)
+
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0  # every value tied
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(baseline, samples, alpha=0.01, min_increase=0.10, min_delta_ms=2.0):
+    """Verdict for `samples` against a baseline entry (batched with the baseline's batch size)."""
+    reference = baseline["batch_p95_ms"]
+    current = batch_p95(samples, baseline["batch_size"])
+    if math.comb(len(current) + len(reference), len(current)) * alpha <= 1:
+        raise ValueError(f"{len(current)} vs {len(reference)} batches can never reach p < {alpha}; "
+                         f"measure more iterations or use smaller batches")
+    _, p_value = mann_whitney_greater(current, reference)
+    current_p95 = statistics.median(current)
+    baseline_p95 = statistics.median(reference)
+    change = current_p95 / baseline_p95 - 1 if baseline_p95 else 0.0
+    delta = current_p95 - baseline_p95
+    return {
+        "p95_ms": round(current_p95, 3),
+        "baseline_p95_ms": round(baseline_p95, 3),
+        "change": round(change, 4),
+        "delta_ms": round(delta, 3),
+        "p_value": round(p_value, 6),
+        "regression": p_value < alpha and delta >= max(min_delta_ms, min_increase * baseline_p95),
+    }
+
+
+def baseline_entry(samples, batch_size, warmup):
+    return {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "iterations": len(samples),
+        "warmup": warmup,
+        "batch_size": batch_size,
+        **summarize(samples),
+        "batch_p95_ms": batch_p95(samples, batch_size),
+    }
+
+
+class BaselineStore:
+    def __init__(self, directory, environment):
+        self.environment = environment
+        self.path = os.path.join(directory, f"{environment}.json")
+        self.lock = FileLock(f"{self.path}.lock")
+        self._data = None
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {"format": FORMAT_VERSION, "environment": self.environment, "endpoints": {}}
+        if data.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: baseline format {data.get('format')}, expected {FORMAT_VERSION}; "
+                             f"re-record with --update-baseline")
+        return data
+
+    def get(self, name):
+        """Baseline entry for an endpoint, or None (file read once per store; writes are atomic)."""
+        if self._data is None:
+            self._data = self._read()
+        return self._data["endpoints"].get(name)
+
+    def update(self, name, entry):
+        """Replace one endpoint's baseline, keeping entries written meanwhile by other processes."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self.lock:
+            data = self._read()
+            data["endpoints"][name] = entry
+            data["endpoints"] = dict(sorted(data["endpoints"].items()))
+            data["updated_at"] = entry["recorded_at"]
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+                f.write("\n")
+            os.replace(tmp_path, self.path)
+            self._data = data
+
+
+def render_regression_html(environment, verdicts, title="Performance Regression"):
+    """Per-endpoint p95 vs baseline table for the pytest-html summary."""
+    rows = []
+    for name, v in verdicts.items():
+        if "baseline_p95_ms" not in v:  # recorded with --update-baseline
+            rows.append(f"<tr><td>{html.escape(name)}</td><td>{v['p95_ms']}</td>"
+                        "<td colspan=\"3\">baseline recorded</td><td>–</td></tr>")
+            continue
+        status = "❌ regression" if v["regression"] else "✅"
+        rows.append(f"<tr><td>{html.escape(name)}</td><td>{v['p95_ms']}</td><td>{v['baseline_p95_ms']}</td>"
+                    f"<td>{v['delta_ms']:+}ms ({v['change']:+.1%})</td><td>{v['p_value']}</td><td>{status}</td></tr>")
+    return (
+        f"<div><h3>{html.escape(title)} ({html.escape(environment)})</h3>"
+        "<table><tr><th>Endpoint</th><th>p95 ms</th><th>Baseline p95 ms</th><th>Change</th>"
+        "<th>p (Mann-Whitney)</th><th>Result</th></tr>"
+        f"{''.join(rows)}</table></div>"
+    )
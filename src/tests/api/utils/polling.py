@@ -0,0 +1,141 @@
+import asyncio
+import random
+import time
+
+from tests.api.utils.metrics import api_metrics
+
+"""
+Polling engine for eventual-consistency waits
+
+Replaces fixed-interval sleeps with exponential backoff plus jitter under an
+overall deadline, returning as soon as the condition is met.
+- backoff_delays → delay sequence: initial_delay * multiplier**n, capped at
+  max_delay, each reduced by up to `jitter` (fraction) at random
+- poll / poll_async → call attempt() until it reports done or the deadline passes
+- poll_request / poll_request_async → poll an HTTP endpoint, sending
+  If-None-Match / If-Modified-Since from the previous response so an
+  unchanged resource (304) is skipped without re-parsing the body
+- every wait is recorded in api_metrics (see ApiMetrics.record_wait) so the
+  report shows how long waits actually took
+
+Each call returns a PollResult(done, value, attempts, elapsed).
+"""
+DEFAULT_POLICY = {
+    "initial_delay": 0.05,
+    "max_delay": 2.0,
+    "multiplier": 2.0,
+    "jitter": 0.5,
+}
+
+
+class PollResult:
+    def __init__(self, done, value, attempts, elapsed):
+        self.done = done
+        self.value = value
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"PollResult(done={self.done}, attempts={self.attempts}, "
+                f"elapsed={self.elapsed:.3f}s)")
+
+
+def backoff_delays(initial_delay=0.05, max_delay=2.0, multiplier=2.0, jitter=0.5, rng=random):
+    """Infinite generator of jittered exponential backoff delays (seconds)."""
+    delay = initial_delay
+    while True:
+        yield delay * (1 - jitter * rng.random())
+        delay = min(delay * multiplier, max_delay)
+
+
+def _policy(overrides):
+    policy = {**DEFAULT_POLICY, **overrides}
+    unknown = set(policy) - set(DEFAULT_POLICY)
+    if unknown:
+        raise TypeError(f"Unknown polling option(s): {sorted(unknown)}")
+    return policy
+
+
+def poll(attempt, timeout=10, label="poll", **policy):
+    """
+    Call attempt() → (done, value) until done or `timeout` seconds have passed.
+    Always makes at least one attempt; never sleeps past the deadline.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    delays = backoff_delays(**_policy(policy))
+    attempts = 0
+    while True:
+        attempts += 1
+        done, value = attempt()
+        remaining = deadline - time.monotonic()
+        if done or remaining <= 0:
+            break
+        time.sleep(min(next(delays), remaining))
+    elapsed = time.monotonic() - start
+    api_metrics.record_wait(label, elapsed, attempts, done)
+    return PollResult(done, value, attempts, elapsed)
+
+
+async def poll_async(attempt, timeout=10, label="poll", **policy):
+    """asyncio version of poll(); attempt is a coroutine function."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+    delays = backoff_delays(**_policy(policy))
+    attempts = 0
+    while True:
+        attempts += 1
+        done, value = await attempt()
+        remaining = deadline - loop.time()
+        if done or remaining <= 0:
+            break
+        await asyncio.sleep(min(next(delays), remaining))
+    elapsed = loop.time() - start
+    api_metrics.record_wait(label, elapsed, attempts, done)
+    return PollResult(done, value, attempts, elapsed)
+
+
+class _ConditionalState:
+    """Tracks validators from the last response to build conditional headers."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.headers = None
+        self.last_value = None
+
+    def check(self, response, is_ready):
+        """Return (done, value); a 304 reuses the previous evaluation."""
+        if response.status_code == 304 and self.headers:
+            response.close()  # no body; hand a streamed connection back to the pool
+            return False, self.last_value
+        done, value = is_ready(response)
+        if self.enabled:
+            headers = {}
+            if response.headers.get("ETag"):
+                headers["If-None-Match"] = response.headers["ETag"]
+            if response.headers.get("Last-Modified"):
+                headers["If-Modified-Since"] = response.headers["Last-Modified"]
+            self.headers = headers or None
+        self.last_value = value
+        return done, value
+
+
+def poll_request(send, is_ready, timeout=10, label="poll", conditional=True, **policy):
+    """
+    Poll an HTTP resource.
+    send(headers) → response (headers carries conditional validators or None)
+    is_ready(response) → (done, value)
+    """
+    state = _ConditionalState(conditional)
+    return poll(lambda: state.check(send(state.headers), is_ready), timeout, label, **policy)
+
+
+async def poll_request_async(send, is_ready, timeout=10, label="poll", conditional=True, **policy):
+    """asyncio version of poll_request(); send is a coroutine function."""
+    state = _ConditionalState(conditional)
+
+    async def attempt():
+        return state.check(await send(state.headers), is_ready)
+
+    return await poll_async(attempt, timeout, label, **policy)
@@ -0,0 +1,215 @@
+import threading
+import time
+
+import requests
+
+from tests.api.utils.load_runner import EndpointStats, percentile
+
+"""
+Race harness for concurrent requests against one booking
+
+Fires N requests at the same instant (one thread per request, released
+together by a threading.Barrier) and checks invariants over many iterations.
+- race(calls) → run [(label, send), ...] simultaneously, return RaceOutcomes
+  in call order (status, start/finish times, response or transport error)
+- RaceHarness(iterations).run(setup, calls, invariant) → per iteration:
+  target = setup(i), outcomes = race(calls(target)), then
+  invariant(target, outcomes) returns a list of violation messages
+- report → {"iterations", "violations", "release_spread_ms", "endpoints":
+  {label: EndpointStats.summary()}}; release spread is how far apart the
+  racing requests actually started (p50/max), i.e. how real the race was
+
+Invariant helpers (each returns a list of violation messages):
+- single_delete_wins → exactly one DELETE 201, every other one "gone"
+- last_writer_wins → the final booking equals exactly one writer's PATCH
+  (no torn mix of fields), and not one that finished before another began
+  (check_order=False skips that part: replayed cassette responses carry the
+  recording's outcome but this run's timings)
+- consistent_reads → every GET saw the initial state or one whole PATCH
+
+Send racing and verifying GETs with NO_CACHE headers so an enabled
+ResponseCache cannot answer them instead of the server.
+"""
+DELETED_STATUSES = (404, 405)  # the live service answers 405 for an already deleted booking
+NO_CACHE = {"Cache-Control": "no-cache"}
+
+
+class RaceError(RuntimeError):
+    """The racing threads did not all start or finish within the timeout."""
+
+
+class RaceOutcome:
+    __slots__ = ("label", "response", "error", "started", "finished")
+
+    def __init__(self, label, response, error, started, finished):
+        self.label = label
+        self.response = response
+        self.error = error
+        self.started = started
+        self.finished = finished
+
+    @property
+    def status(self):
+        return self.response.status_code if self.response is not None else "exception"
+
+    @property
+    def elapsed(self):
+        return self.finished - self.started
+
+    def json(self):
+        try:
+            return self.response.json()
+        except (AttributeError, ValueError):
+            return None
+
+    def __repr__(self):
+        return f"RaceOutcome({self.label!r}, status={self.status}, {self.elapsed * 1000:.1f} ms)"
+
+
+def race(calls, timeout=30):
+    """
+    Run every (label, send) call at once and return their RaceOutcomes in
+    call order. Transport errors are captured on the outcome, not raised;
+    any other exception from a `send` (a cassette miss, a failed assertion)
+    is re-raised here with its own traceback.
+    """
+    calls = list(calls)
+    if not calls:
+        return []
+    barrier = threading.Barrier(len(calls))
+    outcomes = [None] * len(calls)
+    failures = []
+
+    def run(index, label, send):
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            return
+        started = time.perf_counter()
+        response, error = None, None
+        try:
+            response = send()
+        except requests.RequestException as exc:
+            error = exc
+        except Exception as exc:
+            failures.append(exc)
+            return
+        outcomes[index] = RaceOutcome(label, response, error, started, time.perf_counter())
+
+    threads = [
+        threading.Thread(target=run, args=(index, label, send), name=f"race-{index}", daemon=True)
+        for index, (label, send) in enumerate(calls)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    if failures:
+        barrier.abort()
+        raise failures[0]
+    if any(outcome is None for outcome in outcomes):
+        barrier.abort()
+        raise RaceError(f"{sum(o is None for o in outcomes)} of {len(calls)} racing requests did not complete in {timeout}s")
+    return outcomes
+
+
+class RaceHarness:
+    def __init__(self, iterations=20, timeout=30):
+        if iterations < 1:
+            raise ValueError("iterations must be >= 1")
+        self.iterations = iterations
+        self.timeout = timeout
+        self.violations = []
+        self._stats = {}
+        self._spreads = []
+
+    def _record(self, outcomes):
+        for outcome in outcomes:
+            stats = self._stats.setdefault(outcome.label, EndpointStats())
+            stats.add(outcome.elapsed)
+            stats.statuses[outcome.status] = stats.statuses.get(outcome.status, 0) + 1
+            if outcome.error is not None:
+                stats.errors += 1
+        starts = [outcome.started for outcome in outcomes]
+        self._spreads.append(max(starts) - min(starts))
+
+    def run(self, setup, calls, invariant):
+        """Race `calls(target)` for every iteration's `setup(i)` target and check `invariant`."""
+        for iteration in range(self.iterations):
+            target = setup(iteration)
+            outcomes = race(calls(target), timeout=self.timeout)
+            self._record(outcomes)
+            for message in invariant(target, outcomes):
+                self.violations.append(f"iteration {iteration}: {message}")
+        return self.report()
+
+    def report(self):
+        spreads = sorted(self._spreads)
+        return {
+            "iterations": len(self._spreads),
+            "violations": list(self.violations),
+            "release_spread_ms": {
+                "p50": round(percentile(spreads, 50) * 1000, 3),
+                "max": round(spreads[-1] * 1000, 3) if spreads else 0.0,
+            },
+            "endpoints": {label: stats.summary() for label, stats in sorted(self._stats.items())},
+        }
+
+
+# -----------------------------
+# Invariants
+# -----------------------------
+def single_delete_wins(outcomes, gone_statuses=DELETED_STATUSES):
+    """Exactly one DELETE succeeds (201); every other one finds the booking gone."""
+    statuses = [outcome.status for outcome in outcomes]
+    violations = []
+    if statuses.count(201) != 1:
+        violations.append(f"expected exactly one 201, got statuses {statuses}")
+    unexpected = [s for s in statuses if s != 201 and s not in gone_statuses]
+    if unexpected:
+        violations.append(f"unexpected DELETE statuses {unexpected} (expected 201 or {list(gone_statuses)})")
+    return violations
+
+
+def _fields(booking, fields):
+    return {field: (booking or {}).get(field) for field in fields}
+
+
+def last_writer_wins(final, outcomes, patches, check_order=True):
+    """
+    `patches` maps each PATCH label to its payload. Every PATCH must succeed,
+    the final booking must equal one whole payload, and (with check_order)
+    that winner must not have finished before another writer started (it
+    would have been overwritten).
+    """
+    violations = [f"{o.label} returned {o.status}" for o in outcomes if o.label in patches and o.status != 200]
+    fields = sorted({field for payload in patches.values() for field in payload})
+    state = _fields(final, fields)
+    winners = [label for label, payload in patches.items() if _fields(payload, fields) == state]
+    if not winners:
+        violations.append(f"final booking {state} matches no single PATCH (torn write)")
+        return violations
+    if not check_order:
+        return violations
+    writers = [o for o in outcomes if o.label in patches]
+    winner = next(o for o in writers if o.label in winners)
+    superseding = [o.label for o in writers if o.started > winner.finished]
+    if superseding:
+        violations.append(f"{winner.label} won although {superseding} started after it finished")
+    return violations
+
+
+def consistent_reads(outcomes, initial, patches):
+    """Every GET returned 200 with the initial state or one whole PATCH applied."""
+    fields = sorted({field for payload in patches.values() for field in payload})
+    allowed = [_fields(initial, fields)] + [_fields(payload, fields) for payload in patches.values()]
+    violations = []
+    for outcome in outcomes:
+        if outcome.label in patches:
+            continue
+        if outcome.status != 200:
+            violations.append(f"{outcome.label} returned {outcome.status}")
+        elif _fields(outcome.json(), fields) not in allowed:
+            violations.append(f"{outcome.label} saw a torn booking {_fields(outcome.json(), fields)}")
+    return violations
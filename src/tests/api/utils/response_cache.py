@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from tests.api.utils.cassette import normalize_url
+
+"""
+ResponseCache class
+
+Opt-in, per-session LRU cache for idempotent GETs made through ApiClient.
+- Only plain GETs are cached: no extra headers (conditional, custom auth),
+  no streaming, and only 200 responses, so polling for a booking to
+  appear (404 → 200) is never served a stale miss.
+- Entries expire after `ttl` seconds; the least recently used entry is
+  evicted beyond `max_entries`.
+- PATCH/PUT/POST/DELETE invalidate every cached response on the written
+  path, its ancestors and its descendants: a write to /booking/5 drops
+  GET /booking/5 and every GET /booking?… query.
+- stats → hits, misses, stores, expired, evictions, invalidations
+
+Writes made by other clients (e.g. other xdist workers) are not seen;
+keep the TTL short when tests share bookings across processes.
+"""
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+def _path(endpoint):
+    return urlsplit(endpoint).path.rstrip("/") or "/"
+
+
+def _related(cached_path, written_path):
+    """Same path, or one is an ancestor of the other (/booking ↔ /booking/5)."""
+    return (cached_path == written_path
+            or written_path.startswith(cached_path.rstrip("/") + "/")
+            or cached_path.startswith(written_path.rstrip("/") + "/"))
+
+
+class ResponseCache:
+    def __init__(self, max_entries=256, ttl=30):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+        self._entries = OrderedDict()   # key → (expires_at, path, response)
+        self._paths = {}                # path → {keys}
+        self._generation = 0            # bumped by every invalidation
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cacheable(method, extra_headers, request_kwargs):
+        return method == "GET" and not extra_headers and not request_kwargs.get("stream")
+
+    def _drop(self, key):
+        _, path, _ = self._entries.pop(key)
+        keys = self._paths[path]
+        keys.discard(key)
+        if not keys:
+            del self._paths[path]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[2]
+
+    def put(self, key, path, response, generation=None):
+        """Store a 200 response unless a write invalidated the cache since `generation`."""
+        if response.status_code != 200:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return  # a write raced with this GET; its response may be stale
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, path, response)
+            self._paths.setdefault(path, set()).add(key)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def invalidate(self, endpoint):
+        """Drop cached responses related to the written endpoint's path."""
+        written = _path(endpoint)
+        with self._lock:
+            self._generation += 1
+            for path in [p for p in self._paths if _related(p, written)]:
+                for key in list(self._paths[path]):
+                    self._drop(key)
+                    self.stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._paths.clear()
+
+    def fetch(self, method, endpoint, extra_headers, request_kwargs, send, authenticated=False):
+        """
+        Serve a cacheable GET from the cache (or send and store it); send any
+        other request and invalidate what a write may have changed.
+        """
+        if self.cacheable(method, extra_headers, request_kwargs):
+            key = (normalize_url(endpoint, request_kwargs.get("params")), authenticated)
+            response = self.get(key)
+            if response is None:
+                generation = self._generation
+                response = send()
+                self.put(key, _path(endpoint), response, generation)
+            return response
+
+        response = send()
+        if method in WRITE_METHODS:
+            self.invalidate(endpoint)
+        return response
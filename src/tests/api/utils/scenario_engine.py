@@ -0,0 +1,287 @@
+import logging
+import time
+
+from tests.api.utils.booking_data_builder import BookingDataBuilder
+from tests.api.utils.booking_helper import (
+    booking_query_params, get_bookings, validate_booking_fields, validate_unchanged_fields, validate_updated_fields)
+from tests.api.utils.bulk_booking import create_bookings, delete_bookings, run_parallel
+from tests.api.utils.cassette import normalize_url
+
+logger = logging.getLogger(__name__)
+
+"""
+Data-driven scenario engine
+
+Compiles the filter/update cases of filters.json and update_payloads.json
+into one execution plan instead of one hand-written test per description.
+- KINDS → "description" → scenario kind (list_all, filter_match,
+  filter_invalid, patch, patch_invalid, patch_idempotent); an unknown
+  description fails compile_plan with ValueError
+- compile_plan(filter_cases, update_cases) → ExecutionPlan:
+    bookings   one slot per group of compatible filter scenarios (params
+               that agree on every shared field share one booking)
+    reads      unique GETs: identical queries from different scenarios
+               are sent once and every scenario checks the same response
+    writes     PATCH scenarios, each on its own booking; they reuse the
+               filter bookings once all reads are done, so bookings are
+               only created for writes beyond that
+- run_plan(client, plan) → PlanResult, executed in stages, each stage as
+  one concurrent group (bulk_booking.run_parallel):
+    create bookings → reads → checks of read scenarios → writes → delete
+- PlanResult.results → {scenario id: ScenarioResult(ok, error)}, plus the
+  request counts and stage timings of the run
+
+Checks are the ones of the hand-written tests in test_01/test_02 (filter
+IDs + field validation, expected error statuses, updated/unchanged fields,
+identical idempotent responses).
+"""
+KINDS = {
+    "No filters": "list_all",
+    "Individual filter": "filter_match",
+    "Multiple filters": "filter_match",
+    "Invalid Value Format In filter": "filter_invalid",
+    "Update Individual Field": "patch",
+    "Update Multiple Fields": "patch",
+    "Invalid Value Format In Update": "patch_invalid",
+    "Idempotent update": "patch_idempotent",
+}
+READ_KINDS = ("list_all", "filter_match", "filter_invalid")
+INVALID_FILTER_STATUSES = (400, 422)
+INVALID_UPDATE_STATUSES = (400, 404, 422, 401, 403)
+
+
+class Scenario:
+    __slots__ = ("id", "case", "kind", "slot", "reads")
+
+    def __init__(self, scenario_id, case, kind):
+        self.id = scenario_id
+        self.case = case
+        self.kind = kind
+        self.slot = None     # booking slot, assigned by compile_plan
+        self.reads = ()      # read keys this scenario checks
+
+    def __repr__(self):
+        return f"Scenario({self.id!r}, {self.kind}, slot={self.slot})"
+
+
+class ExecutionPlan:
+    def __init__(self, scenarios, bookings, reads):
+        self.scenarios = scenarios
+        self.bookings = bookings   # slot → params the created booking must carry
+        self.reads = reads         # key → (kind, endpoint or slot, params)
+
+    @property
+    def writes(self):
+        return [s for s in self.scenarios if s.kind not in READ_KINDS]
+
+    def stats(self):
+        requested = sum(len(s.reads) for s in self.scenarios)
+        return {
+            "scenarios": len(self.scenarios),
+            "bookings": len(self.bookings),
+            "reads": len(self.reads),
+            "reads_deduplicated": requested - len(self.reads),
+            "writes": len(self.writes),
+        }
+
+
+class ScenarioResult:
+    __slots__ = ("ok", "error")
+
+    def __init__(self, ok, error=None):
+        self.ok = ok
+        self.error = error
+
+    def __repr__(self):
+        return "ScenarioResult(ok)" if self.ok else f"ScenarioResult(failed: {self.error})"
+
+
+class PlanResult:
+    def __init__(self, plan):
+        self.plan = plan
+        self.results = {}
+        self.timings = {}
+
+    @property
+    def failed(self):
+        return {sid: r for sid, r in self.results.items() if not r.ok}
+
+    def summary(self):
+        return {**self.plan.stats(), "failed": len(self.failed), "timings_s": self.timings}
+
+
+# -----------------------------
+# Compilation
+# -----------------------------
+def scenario_id(source, index, case):
+    detail = case.get("params", case.get("payload", {}))
+    return f"{source}[{index}] {case.get('description')}-{detail}"
+
+
+def _compatible(slot_params, params):
+    """Params fit a booking slot when they agree on shared fields and keep checkin <= checkout."""
+    if any(slot_params.get(key, value) != value for key, value in params.items()):
+        return False
+    merged = {**slot_params, **params}
+    return not ("checkin" in merged and "checkout" in merged and merged["checkin"] > merged["checkout"])
+
+
+def _slot_for(bookings, params):
+    for slot, slot_params in enumerate(bookings):
+        if _compatible(slot_params, params):
+            slot_params.update(params)
+            return slot
+    bookings.append(dict(params))
+    return len(bookings) - 1
+
+
+def compile_plan(filter_cases=(), update_cases=(), sources=("filters.json", "update_payloads.json")):
+    """Classify every case, share bookings between compatible scenarios and dedupe reads."""
+    scenarios = []
+    for source, cases in zip(sources, (filter_cases, update_cases)):
+        for index, case in enumerate(cases):
+            kind = KINDS.get(case.get("description"))
+            if kind is None:
+                raise ValueError(f"{source}[{index}]: unknown scenario description {case.get('description')!r} "
+                                 f"(known: {sorted(KINDS)})")
+            scenarios.append(Scenario(scenario_id(source, index, case), case, kind))
+
+    bookings, reads = [], {}
+
+    def read(kind, target, params=None):
+        key = ("booking", target) if kind == "booking" else (kind, normalize_url("/booking", params))
+        reads.setdefault(key, (kind, target, params))
+        return key
+
+    for scenario in scenarios:
+        if scenario.kind == "filter_match":
+            params = booking_query_params(scenario.case["params"])
+            scenario.slot = _slot_for(bookings, params)
+            scenario.reads = (read("ids", "/booking", params), read("booking", scenario.slot))
+        elif scenario.kind == "list_all":
+            scenario.reads = (read("ids", "/booking", {}),)
+        elif scenario.kind == "filter_invalid":
+            scenario.reads = (read("status", "/booking", scenario.case["params"]),)
+
+    # Writes run after every read, so they can take over the filter bookings
+    free_slots = iter(range(len(bookings)))
+    for scenario in scenarios:
+        if scenario.kind in READ_KINDS or "invalid_id" in scenario.case:
+            continue
+        scenario.slot = next(free_slots, None)
+        if scenario.slot is None:
+            bookings.append({})
+            scenario.slot = len(bookings) - 1
+    return ExecutionPlan(scenarios, bookings, reads)
+
+
+# -----------------------------
+# Execution
+# -----------------------------
+def _send_read(client, kind, target, params, booking_ids):
+    if kind == "ids":
+        return get_bookings(client, params)
+    if kind == "booking":
+        return client.get(f"/booking/{booking_ids[target]}")
+    return client.get(target, params=params)
+
+
+def _check_read(scenario, responses, booking_ids):
+    if scenario.kind == "list_all":
+        ids = responses[scenario.reads[0]]
+        assert len(ids) > 0, "Response is having zero booking"
+        missing = [b for b in booking_ids if b not in ids]
+        assert not missing, f"Booking IDs {missing} missing from API response"
+    elif scenario.kind == "filter_match":
+        ids, response = (responses[key] for key in scenario.reads)
+        booking_id = booking_ids[scenario.slot]
+        assert booking_id in ids, f"Booking {booking_id} not returned by API filter {scenario.case['params']}"
+        assert response.status_code == 200, f"Booking {booking_id} not found"
+        validate_booking_fields(response.json(), scenario.case["params"])
+    else:
+        response = responses[scenario.reads[0]]
+        assert response.status_code in INVALID_FILTER_STATUSES, \
+            f"Unexpected status code {response.status_code} for params {scenario.case['params']}"
+
+
+def _run_write(client, anonymous_client, scenario, booking_ids):
+    case = scenario.case
+    payload = case["payload"]
+    booking_id = case.get("invalid_id", booking_ids[scenario.slot] if scenario.slot is not None else None)
+    endpoint = f"/booking/{booking_id}"
+
+    if scenario.kind == "patch_invalid":
+        sender = anonymous_client if case.get("auth") == "none" else client
+        response = sender.patch(endpoint, json=payload)
+        assert response.status_code in INVALID_UPDATE_STATUSES, \
+            f"Unexpected status {response.status_code} for invalid case {case['description']}"
+    elif scenario.kind == "patch_idempotent":
+        first = client.patch(endpoint, json=payload)
+        second = client.patch(endpoint, json=payload)
+        assert first.status_code == 200, f"First PATCH returned {first.status_code} unexpectedly"
+        assert second.status_code == 200, f"Second PATCH returned {second.status_code} unexpectedly"
+        assert first.json() == second.json(), "PATCH responses are not identical for idempotent update"
+    else:
+        original = client.get(endpoint).json()
+        response = client.patch(endpoint, json=payload)
+        assert response.status_code == 200, f"Unexpected status {response.status_code} for payload {payload}"
+        updated = client.get(endpoint).json()
+        validate_updated_fields(updated, payload)
+        validate_unchanged_fields(original, updated, exclude=list(payload))
+
+
+def _outcome(check):
+    try:
+        check()
+    except AssertionError as exc:
+        return ScenarioResult(False, str(exc) or repr(exc))
+    except Exception as exc:
+        return ScenarioResult(False, f"{type(exc).__name__}: {exc}")
+    return ScenarioResult(True)
+
+
+def run_plan(client, plan, max_workers=8, anonymous_client=None):
+    """Execute the plan stage by stage; every scenario gets a ScenarioResult."""
+    if anonymous_client is None:
+        anonymous_client = client.__class__(client.base_url, cassette=client.cassette)
+    result = PlanResult(plan)
+
+    def stage(name, fn):
+        start = time.perf_counter()
+        value = fn()
+        result.timings[name] = round(time.perf_counter() - start, 3)
+        return value
+
+    payloads = [BookingDataBuilder(params).build() for params in plan.bookings]
+    created = stage("create", lambda: create_bookings(client, payloads, max_workers=max_workers))
+    if not created.ok:
+        delete_bookings(client, [b["bookingid"] for b in created.succeeded], max_workers=max_workers)
+        created.raise_for_failures()
+    booking_ids = [booking["bookingid"] for booking in created.succeeded]
+
+    try:
+        keys = list(plan.reads)
+        fetched = stage("reads", lambda: run_parallel(
+            lambda key: (key, _send_read(client, *plan.reads[key], booking_ids)),
+            keys, max_workers, operation="scenario reads"))
+        responses = dict(fetched.succeeded)
+        failed_reads = {key: error for key, error in fetched.failed}
+
+        for scenario in plan.scenarios:
+            if scenario.kind not in READ_KINDS:
+                continue
+            errors = [failed_reads[key] for key in scenario.reads if key in failed_reads]
+            if errors:
+                result.results[scenario.id] = ScenarioResult(False, f"read failed: {errors[0]}")
+            else:
+                result.results[scenario.id] = _outcome(lambda: _check_read(scenario, responses, booking_ids))
+
+        writes = stage("writes", lambda: run_parallel(
+            lambda s: (s.id, _outcome(lambda: _run_write(client, anonymous_client, s, booking_ids))),
+            plan.writes, max_workers, operation="scenario writes"))
+        result.results.update(dict(writes.succeeded))
+    finally:
+        stage("delete", lambda: delete_bookings(client, booking_ids, max_workers=max_workers))
+
+    logger.info("Scenario plan: %s", result.summary())
+    return result
@@ -0,0 +1,46 @@
+from tests.api.utils.booking_data_builder import BookingDataBuilder
+
+"""
+Booking scenarios for load and soak runs
+
+Plain-function versions of the E2E flows in test_booking_e2e.py, so runners
+can replay them many times outside a single test.
+- booking_lifecycle → create → filter by firstname → patch → delete
+
+Scenarios take an optional `payload` (e.g. from a seeded PayloadStream) so
+runs can replay the same data; without one a random payload is built.
+
+Each HTTP step goes through `step(label, send, expected)`, which lets the
+runner time the call, count errors and raise StepError on an unexpected
+status. Labels use endpoint templates (e.g. "PATCH /booking/{id}") so
+results aggregate per endpoint rather than per booking.
+"""
+class StepError(Exception):
+    """A scenario step returned an unexpected status code."""
+
+    def __init__(self, label, response):
+        self.label = label
+        self.response = response
+        super().__init__(f"{label} returned {response.status_code}: {response.text[:200]}")
+
+
+def booking_lifecycle(client, step, payload=None):
+    """Create → Filter → Update → Delete, the same flow as test_e2e_booking_lifecycle."""
+    payload = payload or BookingDataBuilder().build()
+
+    created = step("POST /booking", lambda: client.post("/booking", json=payload), (200,))
+    booking_id = created.json()["bookingid"]
+    try:
+        step(
+            "GET /booking",
+            lambda: client.get("/booking", params={"firstname": payload["firstname"]}),
+            (200,),
+        )
+        step(
+            "PATCH /booking/{id}",
+            lambda: client.patch(f"/booking/{booking_id}", json={"firstname": "UpdatedName"}),
+            (200,),
+        )
+    finally:
+        step("DELETE /booking/{id}", lambda: client.delete(f"/booking/{booking_id}"), (201,))
+    return booking_id
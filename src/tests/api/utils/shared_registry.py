@@ -0,0 +1,70 @@
+import json
+import os
+from pathlib import Path
+
+from filelock import FileLock
+
+"""
+SharedBookingRegistry class
+
+Session-wide booking registry shared by every pytest-xdist worker.
+- The first worker that needs it creates the bookings while holding a file
+  lock; the rest read the serialized registry from the same JSON file.
+- Every holder (workers and the controller process) takes a reference;
+  bookings are deleted only when the last reference is released.
+- Workers get a tuple of bookings (wrapped by the shared_booking_registry
+  fixture in a ReadOnlyBookingRegistry), so accidental pop/append fails loudly.
+  Tests that modify or delete bookings must use the module-scoped
+  booking_registry instead.
+
+State file layout:
+    {"refcount": 2, "registry": [{"bookingid": 1, "data": {...}}, ...]}
+"""
+class SharedBookingRegistry:
+    def __init__(self, directory, name="booking_registry"):
+        directory = Path(directory)
+        self.state_path = directory / f"{name}.json"
+        self.lock = FileLock(str(directory / f"{name}.lock"))
+
+    def _read(self):
+        if not self.state_path.exists():
+            return {"refcount": 0, "registry": None}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _write(self, state):
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def acquire(self, create=None):
+        """
+        Take a reference and return the registry as a tuple.
+        `create()` runs only if no registry exists yet; pass None to hold a
+        reference without creating bookings (coordinator pin).
+        """
+        with self.lock:
+            state = self._read()
+            if state["registry"] is None and create is not None:
+                state["registry"] = list(create())
+            state["refcount"] += 1
+            self._write(state)
+            return tuple(state["registry"] or ())
+
+    def release(self, delete):
+        """
+        Drop a reference; the last holder calls `delete(registry)` and clears it.
+        Returns True if this call deleted the bookings.
+        """
+        with self.lock:
+            state = self._read()
+            state["refcount"] = max(0, state["refcount"] - 1)
+            registry = state["registry"]
+            if state["refcount"] > 0 or not registry:
+                self._write(state)
+                return False
+            state["registry"] = None
+            self._write(state)
+        delete(registry)
+        return True
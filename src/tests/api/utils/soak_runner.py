@@ -0,0 +1,248 @@
+import gc
+import html
+import os
+import re
+import threading
+import time
+
+from tests.api.utils.load_runner import LoadRunner, percentile
+from tests.api.utils.scenarios import StepError
+
+"""
+Soak (endurance) runs for booking scenarios
+
+SoakRunner is a LoadRunner that keeps a scenario (default: booking_lifecycle)
+looping for hours and watches for slow degradation instead of peak load.
+- window → every `window` seconds the runner closes a time window:
+  request count, errors and p50/p95/p99 of the requests in that window,
+  plus a client resource sample:
+    rss_mb       resident memory of this process (/proc/self/statm)
+    fds          open file descriptors (/proc/self/fd)
+    sockets      open sockets, i.e. live HTTP connections
+    gc_objects   objects tracked by the garbage collector
+    outstanding  bookings created but not (yet) deleted by the scenario
+- memory → no per-request latency lists: only the open window's
+  latencies are kept, run totals go into a fixed-size histogram per
+  endpoint (keep_samples = False), so the runner's own RSS stays flat
+- drift / leaks → least-squares slope per hour of p99 and of each resource
+  over the windows after `warmup_windows`
+- orphans → after the run, every booking the scenario created but failed to
+  delete is checked server-side (GET 200 = orphaned) and then deleted
+- soak_violations(report, thresholds) → messages for every threshold the
+  run exceeded (max_p99_ms, max_p99_drift_ms_per_hour, max_rss_mb_per_hour,
+  max_fds_per_hour, max_sockets_per_hour, max_orphaned_bookings), plus
+  any scenario_errors (iterations that raised something other than a
+  failed step)
+- render_soak_html → per-window table for the pytest-html summary
+
+Resource samples are None where /proc is not available. Slopes are None
+until the post-warm-up windows span `min_trend_span` seconds: a few
+seconds of jitter extrapolated to an hour says nothing about leaks.
+"""
+_BOOKING_URL = re.compile(r"/booking/(\d+)")
+_RESOURCES = ("rss_mb", "fds", "sockets", "gc_objects", "outstanding")
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 2)
+
+
+def _fd_counts():
+    """(open file descriptors, open sockets), or (None, None) without /proc."""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None, None
+    sockets = 0
+    for fd in fds:
+        try:
+            sockets += os.readlink(f"/proc/self/fd/{fd}").startswith("socket:")
+        except OSError:
+            pass  # closed since listdir
+    return len(fds), sockets
+
+
+def slope_per_hour(points):
+    """Least-squares slope of [(seconds, value), ...] in units per hour (None if < 2 points)."""
+    points = [(t, v) for t, v in points if v is not None]
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var_t = sum((t - mean_t) ** 2 for t, _ in points)
+    if not var_t:
+        return None
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return round(cov / var_t * 3600, 3)
+
+
+class SoakRunner(LoadRunner):
+    keep_samples = False
+
+    def __init__(self, client, window=60, warmup_windows=1, min_trend_span=600, **kwargs):
+        super().__init__(client, **kwargs)
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        self.window = window
+        self.warmup_windows = warmup_windows
+        self.min_trend_span = min_trend_span
+        self.windows = []
+        self._window_latencies = []
+        self._window_errors = 0
+        self._outstanding = set()   # bookings created but not deleted by the scenario
+        self._stop = threading.Event()
+
+    # -----------------------------
+    # Per-window accounting
+    # -----------------------------
+    def _record(self, label, elapsed, status, error):
+        super()._record(label, elapsed, status, error)
+        with self._lock:
+            self._window_latencies.append(elapsed)
+            self._window_errors += bool(error)
+
+    def step(self, label, send, expected):
+        """LoadRunner.step, also tracking which created bookings were deleted."""
+        try:
+            response = super().step(label, send, expected)
+        except StepError as exc:
+            self._track(label, exc.response)
+            raise
+        self._track(label, response)
+        return response
+
+    def _track(self, label, response):
+        if label == "POST /booking" and response.status_code == 200:
+            with self._lock:
+                self._outstanding.add(response.json()["bookingid"])
+        elif label.startswith("DELETE ") and response.status_code == 201:
+            match = _BOOKING_URL.search(response.url or "")
+            if match:
+                with self._lock:
+                    self._outstanding.discard(int(match.group(1)))
+
+    def _close_window(self, started):
+        with self._lock:
+            latencies, self._window_latencies = sorted(self._window_latencies), []
+            errors, self._window_errors = self._window_errors, 0
+            outstanding = len(self._outstanding)
+        fds, sockets = _fd_counts()
+        self.windows.append({
+            "t_s": round(time.perf_counter() - started, 2),
+            "requests": len(latencies),
+            "errors": errors,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "rss_mb": _rss_mb(),
+            "fds": fds,
+            "sockets": sockets,
+            "gc_objects": len(gc.get_objects()),
+            "outstanding": outstanding,
+        })
+
+    def _sampler(self, started):
+        while not self._stop.wait(self.window):
+            self._close_window(started)
+
+    # -----------------------------
+    # Run / analysis
+    # -----------------------------
+    def _sweep_orphans(self):
+        """Check leftover bookings server-side; delete the ones that still exist."""
+        orphaned = []
+        for booking_id in sorted(self._outstanding):
+            if self.client.get(f"/booking/{booking_id}").status_code == 200:
+                orphaned.append(booking_id)
+                self.client.delete(f"/booking/{booking_id}")
+        return {"suspected": len(self._outstanding), "orphaned": len(orphaned), "ids": orphaned[:50]}
+
+    def _trends(self):
+        steady = self.windows[self.warmup_windows:]
+        if len(steady) < 2 or steady[-1]["t_s"] - steady[0]["t_s"] < self.min_trend_span:
+            return {"p99_ms_per_hour": None, **{f"{name}_per_hour": None for name in _RESOURCES}}
+        trends = {"p99_ms_per_hour": slope_per_hour([(w["t_s"], w["p99_ms"]) for w in steady])}
+        for name in _RESOURCES:
+            trends[f"{name}_per_hour"] = slope_per_hour([(w["t_s"], w[name]) for w in steady])
+        return trends
+
+    def run(self):
+        """Loop the scenario for the duration, sampling a window every `window` seconds."""
+        started = time.perf_counter()
+        sampler = threading.Thread(target=self._sampler, args=(started,), name="soak-sampler", daemon=True)
+        sampler.start()
+        try:
+            report = super().run()
+        finally:
+            self._stop.set()
+            sampler.join()
+        if self._window_latencies:
+            self._close_window(started)  # last, partial window
+        report.update({
+            "window_s": self.window,
+            "warmup_windows": self.warmup_windows,
+            "windows": self.windows,
+            "trends": self._trends(),
+            "orphans": self._sweep_orphans(),
+        })
+        return report
+
+
+def soak_violations(report, thresholds):
+    """Threshold breaches of a SoakRunner report, as messages (empty when healthy)."""
+    violations = []
+    steady = report["windows"][report["warmup_windows"]:] or report["windows"]
+    max_p99 = thresholds.get("max_p99_ms")
+    if max_p99 is not None:
+        worst = max((w["p99_ms"] for w in steady), default=0.0)
+        if worst > max_p99:
+            violations.append(f"window p99 {worst} ms above {max_p99} ms")
+
+    trends = report["trends"]
+    for trend, limit_key, unit in (
+        ("p99_ms_per_hour", "max_p99_drift_ms_per_hour", "ms/h"),
+        ("rss_mb_per_hour", "max_rss_mb_per_hour", "MB/h"),
+        ("fds_per_hour", "max_fds_per_hour", "fds/h"),
+        ("sockets_per_hour", "max_sockets_per_hour", "sockets/h"),
+    ):
+        limit, value = thresholds.get(limit_key), trends.get(trend)
+        if limit is not None and value is not None and value > limit:
+            violations.append(f"{trend} {value} {unit} above {limit} {unit}")
+
+    if report["scenario_errors"]:
+        violations.append(f"scenario iterations raised {report['scenario_errors']}")
+
+    max_orphans = thresholds.get("max_orphaned_bookings")
+    if max_orphans is not None and report["orphans"]["orphaned"] > max_orphans:
+        violations.append(f"{report['orphans']['orphaned']} orphaned bookings left on the server "
+                          f"(max {max_orphans}): {report['orphans']['ids']}")
+    return violations
+
+
+def render_soak_html(report, title="Soak Test Results"):
+    """Per-window latency/resource table plus trend slopes for the pytest-html summary."""
+    def cell(value):
+        return "–" if value is None else value
+
+    rows = "".join(
+        "<tr>" + "".join(f"<td>{cell(w[key])}</td>" for key in (
+            "t_s", "requests", "errors", "p50_ms", "p95_ms", "p99_ms", *_RESOURCES)) + "</tr>"
+        for w in report["windows"]
+    )
+    trends = ", ".join(f"{html.escape(name)} {cell(value)}" for name, value in report["trends"].items())
+    return (
+        f"<div><h3>{html.escape(title)}</h3>"
+        f"<p>{report['scenario']}: {report['requests']} requests in {report['duration_s']}s, "
+        f"{report['window_s']}s windows (first {report['warmup_windows']} warm-up), "
+        f"error rate {report['error_rate']:.2%}, orphaned bookings {report['orphans']['orphaned']}</p>"
+        f"<p>Slopes per hour: {trends}</p>"
+        "<table><tr><th>t (s)</th><th>Requests</th><th>Errors</th><th>p50 ms</th><th>p95 ms</th>"
+        "<th>p99 ms</th><th>RSS MB</th><th>FDs</th><th>Sockets</th><th>GC objects</th><th>Outstanding</th></tr>"
+        f"{rows}</table></div>"
+    )
@@ -0,0 +1,73 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.http_pool import build_session
+from tests.api.utils.local_booker_server import LocalBookerServer
+
+"""
+ApiClient connection pooling benchmark
+
+Compares requests/sec of the legacy per-call `requests.get` path (new
+connection per request) with the pooled keep-alive ApiClient against the
+local Booker stand-in (local_booker_server.py).
+
+Run from the repository root:
+    PYTHONPATH=src python -m tests.benchmarks.bench_api_client --requests 2000 --threads 8
+"""
+
+
+def _legacy_get(base_url):
+    """Pre-pooling behaviour: module-level requests.get per call."""
+    return requests.get(f"{base_url}/ping", headers={"Content-Type": "application/json"})
+
+
+def run(call, total, threads):
+    """Execute `call` total times across threads and return requests/sec."""
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(total):
+            call()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: call(), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--base-url", help="benchmark an existing server instead of the stand-in")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = LocalBookerServer().start()
+        base_url = server.base_url
+
+    client = ApiClient(
+        base_url,
+        session=build_session(pool_maxsize=max(args.threads, 1)),
+    )
+    try:
+        before = run(lambda: _legacy_get(base_url), args.requests, args.threads)
+        after = run(lambda: client.get("/ping"), args.requests, args.threads)
+    finally:
+        client.session.close()
+        if server:
+            server.stop()
+
+    print(f"target:          {base_url}")
+    print(f"requests:        {args.requests} ({args.threads} thread(s))")
+    print(f"per-call (before): {before:10.1f} req/s")
+    print(f"pooled (after):    {after:10.1f} req/s")
+    print(f"speed-up:          {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
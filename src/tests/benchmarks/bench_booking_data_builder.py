@@ -0,0 +1,51 @@
+import argparse
+import json
+import time
+
+from tests.api.utils.booking_data_builder import BookingDataBuilder
+
+"""
+BookingDataBuilder bulk generation benchmark
+
+Compares payloads/sec of per-object generation (BookingDataBuilder().build(),
+one Faker/random call per field) with the batched build_many() path, both as
+dicts and as pre-serialized JSON bytes.
+
+Run from the repository root:
+    PYTHONPATH=src python -m tests.benchmarks.bench_booking_data_builder --payloads 100000
+"""
+
+
+def run(generate, total):
+    """Consume `total` payloads from generate(total) and return payloads/sec."""
+    start = time.perf_counter()
+    count = sum(1 for _ in generate(total))
+    assert count == total, f"expected {total} payloads, got {count}"
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payloads", type=int, default=100_000)
+    parser.add_argument("--per-object-payloads", type=int, default=10_000,
+                        help="smaller sample for the slow per-object path")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    per_object = run(lambda n: (BookingDataBuilder().build() for _ in range(n)), args.per_object_payloads)
+    per_object_json = run(
+        lambda n: (json.dumps(BookingDataBuilder().build(), separators=(",", ":")).encode() for _ in range(n)),
+        args.per_object_payloads,
+    )
+    batched = run(lambda n: BookingDataBuilder.build_many(n, seed=args.seed), args.payloads)
+    batched_json = run(lambda n: BookingDataBuilder.build_many(n, seed=args.seed, as_json=True), args.payloads)
+
+    print(f"payloads:                 {args.payloads} (per-object: {args.per_object_payloads})")
+    print(f"per-object dicts (before): {per_object:12.1f} payloads/s")
+    print(f"build_many dicts (after):  {batched:12.1f} payloads/s  ({batched / per_object:.1f}x)")
+    print(f"per-object JSON (before):  {per_object_json:12.1f} payloads/s")
+    print(f"build_many JSON (after):   {batched_json:12.1f} payloads/s  ({batched_json / per_object_json:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import random
+import time
+
+from tests.api.utils.booking_data_builder import BookingDataBuilder
+from tests.api.utils.booking_registry import BookingRegistry
+
+"""
+BookingRegistry lookup benchmark
+
+Compares the pre-index linear scan of find_matching_bookings with the
+indexed BookingRegistry for exact-match filters and checkin date ranges,
+on a synthetic registry (seeded build_many payloads, one per booking ID).
+
+Run from the repository root:
+    PYTHONPATH=src python -m tests.benchmarks.bench_booking_registry --bookings 100000 --queries 1000
+"""
+
+
+def _linear_find(registry, filter_params):
+    """Pre-index find_matching_bookings: scan every booking per query."""
+    for booking in registry:
+        payload = booking["data"]
+        match = True
+        for key, value in filter_params.items():
+            if key in ["checkin", "checkout"]:
+                if payload["bookingdates"].get(key) != value:
+                    match = False
+                    break
+            else:
+                if payload.get(key) != value:
+                    match = False
+                    break
+        if match:
+            return booking
+    return None
+
+
+def _linear_range(registry, start, end):
+    return [b for b in registry if start <= b["data"]["bookingdates"]["checkin"] <= end]
+
+
+def timed(fn, queries):
+    """Run fn(query) for every query and return (queries/sec, results)."""
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return len(queries) / (time.perf_counter() - start), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    bookings = [
+        {"bookingid": booking_id, "data": payload}
+        for booking_id, payload in enumerate(BookingDataBuilder.build_many(args.bookings, seed=args.seed), 1)
+    ]
+    start = time.perf_counter()
+    registry = BookingRegistry(bookings)
+    build_s = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    filter_queries = []
+    for booking in rng.sample(bookings, min(args.queries, len(bookings))):
+        payload = booking["data"]
+        filter_queries.append({
+            "firstname": payload["firstname"],
+            "lastname": payload["lastname"],
+            "checkin": payload["bookingdates"]["checkin"],
+        })
+    # one-day windows: selective enough that the cost is finding rows, not copying them
+    checkins = [b["data"]["bookingdates"]["checkin"] for b in bookings]
+    range_queries = [(day, day) for day in rng.sample(checkins, max(args.queries // 10, 1))]
+
+    linear_qps, linear_hits = timed(lambda q: _linear_find(bookings, q), filter_queries)
+    indexed_qps, indexed_hits = timed(registry.find_first, filter_queries)
+    assert [b["bookingid"] for b in linear_hits] == [b["bookingid"] for b in indexed_hits]
+
+    linear_range_qps, linear_ranges = timed(lambda q: _linear_range(bookings, *q), range_queries)
+    indexed_range_qps, indexed_ranges = timed(lambda q: registry.date_range("checkin", *q), range_queries)
+    assert [len(r) for r in linear_ranges] == [len(r) for r in indexed_ranges]
+
+    print(f"bookings:                {args.bookings} (index build {build_s * 1000:.1f} ms)")
+    print(f"exact filter, linear:    {linear_qps:12.1f} queries/s")
+    print(f"exact filter, indexed:   {indexed_qps:12.1f} queries/s  ({indexed_qps / linear_qps:.0f}x)")
+    print(f"checkin range, linear:   {linear_range_qps:12.1f} queries/s")
+    print(f"checkin range, bisect:   {indexed_range_qps:12.1f} queries/s  ({indexed_range_qps / linear_range_qps:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import logging
+import time
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.auth_helper import AuthenticationHelper
+from tests.api.utils.booking_data_builder import BookingDataBuilder
+from tests.api.utils.bulk_booking import create_bookings, delete_bookings
+from tests.api.utils.bulk_pipeline import pipeline_create_bookings, pipeline_delete_bookings
+from tests.api.utils.local_booker_server import LocalBookerServer
+
+"""
+Bulk pipeline under rate limiting benchmark
+
+Creates and deletes --bookings bookings against the local stand-in
+throttled to --rate-limit requests/s (token bucket of --burst; excess
+requests get 429 + Retry-After), two ways:
+- thread pool (before): bulk_booking.create_bookings / delete_bookings
+  with --workers threads, no throttling handling
+- pipeline (after): bulk_pipeline with AIMD concurrency (up to --workers)
+  and Retry-After handling
+--latency-ms adds a fixed delay before every request to stand in for the
+network round trip, so concurrency matters as it does against a deployment.
+
+Run from the repository root:
+    PYTHONPATH=src python -m tests.benchmarks.bench_bulk_pipeline --bookings 2000 --rate-limit 200 --latency-ms 20
+"""
+
+
+class DelayedClient(ApiClient):
+    """ApiClient that waits `delay` seconds before each request (simulated RTT)."""
+    delay = 0.0
+
+    def _send_live(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super()._send_live(*args, **kwargs)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--rate-limit", type=float, default=200)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    payloads = list(BookingDataBuilder.build_many(args.bookings, seed=args.seed))
+    with LocalBookerServer(rate_limit=args.rate_limit, burst=args.burst) as server:
+        DelayedClient.delay = args.latency_ms / 1000
+        limit, server.httpd.rate_limit = server.httpd.rate_limit, None  # the token itself is not throttled
+        token = AuthenticationHelper.get_token(server.base_url, "admin", "password123")
+        server.httpd.rate_limit = limit
+        client = DelayedClient(server.base_url, auth_token=token, metrics=None,
+                               pool_settings={"pool_maxsize": args.workers})
+
+        created, create_s = timed(lambda: create_bookings(client, payloads, max_workers=args.workers))
+        deleted, delete_s = timed(lambda: delete_bookings(
+            client, [b["bookingid"] for b in created.succeeded], max_workers=args.workers))
+        print(f"{args.bookings} bookings, stand-in limited to {args.rate_limit:g} req/s (burst {args.burst}), "
+              f"{args.latency_ms:g} ms simulated latency, up to {args.workers} in flight")
+        print(f"thread pool (before): create {len(created.succeeded):>6} ok {len(created.failed):>6} failed "
+              f"in {create_s:6.2f} s | delete {len(deleted.succeeded):>6} ok {len(deleted.failed):>6} failed "
+              f"in {delete_s:6.2f} s")
+        leftovers = [booking_id for booking_id, _ in deleted.failed]
+
+        time.sleep(args.burst / args.rate_limit)  # refill the bucket
+        created = pipeline_create_bookings(client, iter(payloads), max_concurrency=args.workers, seed=args.seed)
+        deleted = pipeline_delete_bookings(client, [b["bookingid"] for b in created.succeeded] + leftovers,
+                                           max_concurrency=args.workers, seed=args.seed)
+        for label, result in (("create", created), ("delete", deleted)):
+            stats = result.stats
+            print(f"pipeline ({label}):    {stats['succeeded']:>6} ok {stats['failed']:>6} failed "
+                  f"in {stats['elapsed_s']:6.2f} s = {stats['throughput_per_s']:7.1f}/s; "
+                  f"{stats['attempts']} attempts, {stats['throttled_429']} × 429, "
+                  f"{stats['retry_after_waits']} Retry-After waits, concurrency {stats['concurrency']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import time
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.auth_helper import AuthenticationHelper
+from tests.api.utils.booking_data_builder import BookingDataBuilder
+from tests.api.utils.bulk_booking import create_bookings, delete_bookings
+from tests.api.utils.load_runner import percentile
+from tests.api.utils.local_booker_server import LocalBookerServer
+
+"""
+Filter-query scaling benchmark
+
+Seeds the target with growing dataset sizes (--sizes, default 1k/10k/100k;
+add 1000000 for 1M) and, at each size, times GET /booking for every
+combination of firstname / lastname / checkin / checkout plus no filters,
+recording p50/p95 latency and the result size.
+- the dataset is BookingDataBuilder.build_many(seed=--seed), grown in
+  place: each size only adds the bookings the previous one lacked
+- values come from the dataset itself: names of its first booking (about
+  n / 1000 matches each), checkin >= its 90th and checkout <= its 10th
+  percentile date (about 10% each), so result sizes grow with n
+- probe queries match one fixed booking at every size (unique names,
+  checkin in 2099, checkout in 2000): their latency should not grow with
+  n, so a slope there is a scan in the filter path
+Per query, the log-log slope of p50 latency against n is printed per size
+step: ~0 is constant, ~1 is linear. A step is flagged when latency grows
+with slope >= --linear-threshold while the result size does not, i.e.
+where the filter path stops scaling (O(n) work for a bounded result);
+steps that add less than --min-increase-ms are jitter and never flagged.
+
+Targets: the in-process stand-in by default; --base-url for a deployment
+you own (seeded bookings are deleted afterwards unless --keep). With the
+stand-in, --direct-seed inserts straight into its BookingStore instead of
+POSTing, which makes 1M bookings practical.
+
+Run from the repository root:
+    PYTHONPATH=src python -m tests.benchmarks.bench_filter_scaling --sizes 1000,10000,100000 --direct-seed
+"""
+FILTER_FIELDS = ("firstname", "lastname", "checkin", "checkout")
+PROBE_NAME = "ScalingProbe"
+PROBES = [
+    {"firstname": PROBE_NAME, "lastname": PROBE_NAME, "totalprice": 1, "depositpaid": True,
+     "bookingdates": {"checkin": "2099-01-01", "checkout": "2099-01-02"}, "additionalneeds": "probe"},
+    {"firstname": "Early", "lastname": "Probe", "totalprice": 1, "depositpaid": True,
+     "bookingdates": {"checkin": "1999-12-25", "checkout": "2000-01-01"}, "additionalneeds": "probe"},
+]
+PROBE_QUERIES = {
+    "probe firstname": {"firstname": PROBE_NAME},
+    "probe firstname+lastname": {"firstname": PROBE_NAME, "lastname": PROBE_NAME},
+    "probe checkin": {"checkin": "2099-01-01"},
+    "probe checkout": {"checkout": "2000-01-01"},
+    "probe checkin+checkout": {"checkin": "2099-01-01", "checkout": "2099-01-02"},
+}
+CHUNK = 10_000
+
+
+def query_values(sample):
+    """Filter values drawn from a sample of the dataset (see module docstring)."""
+    checkins = sorted(p["bookingdates"]["checkin"] for p in sample)
+    checkouts = sorted(p["bookingdates"]["checkout"] for p in sample)
+    return {
+        "firstname": sample[0]["firstname"],
+        "lastname": sample[0]["lastname"],
+        "checkin": percentile(checkins, 90),
+        "checkout": percentile(checkouts, 10),
+    }
+
+
+def queries(values):
+    """Every filter combination (and none) with the dataset values, plus the probes."""
+    combos = {"no filters": {}}
+    for size in range(1, len(FILTER_FIELDS) + 1):
+        for fields in itertools.combinations(FILTER_FIELDS, size):
+            combos["+".join(fields)] = {field: values[field] for field in fields}
+    return {**combos, **PROBE_QUERIES}
+
+
+class Seeder:
+    """Grows the target's dataset to a given size, over HTTP (bulk_booking) or straight into a local store."""
+
+    def __init__(self, client, seed, workers, store=None):
+        self.client = client
+        self.store = store
+        self.workers = workers
+        self.seed = seed
+        self.payloads = BookingDataBuilder.build_many(10 ** 9, seed=seed)
+        self.count = 0
+        self.ids = []
+
+    def _insert(self, payloads):
+        if self.store is not None:
+            self.ids += self.store.bulk_create(payloads)
+            return
+        created = create_bookings(self.client, payloads, max_workers=self.workers)
+        self.ids += [booking["bookingid"] for booking in created.succeeded]
+        created.raise_for_failures()
+
+    def grow_to(self, size):
+        start = time.perf_counter()
+        while self.count < size:
+            chunk = list(itertools.islice(self.payloads, min(CHUNK, size - self.count)))
+            self._insert(chunk)
+            self.count += len(chunk)
+        return time.perf_counter() - start
+
+    def sample(self, size=1000):
+        """The first `size` bookings of the dataset (same seed, so the same values)."""
+        return list(BookingDataBuilder.build_many(size, seed=self.seed))
+
+
+def time_query(client, params, repeat, warmup):
+    latencies = []
+    result_size = 0
+    for i in range(warmup + repeat):
+        start = time.perf_counter()
+        response = client.get("/booking", params=params)
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f"GET /booking {params} → {response.status_code}")
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+        result_size = len(response.json())
+    latencies.sort()
+    return {"p50_ms": round(percentile(latencies, 50), 3), "p95_ms": round(percentile(latencies, 95), 3),
+            "results": result_size}
+
+
+def slope(x0, y0, x1, y1):
+    """Log-log slope between (x0, y0) and (x1, y1); y must be positive (result counts are passed +1)."""
+    return math.log(y1 / y0) / math.log(x1 / x0)
+
+
+def scaling(curve, threshold, min_increase_ms):
+    """Per size step: latency and result-size slopes; flag steps where latency alone grows ~linearly."""
+    steps = []
+    for (n0, a), (n1, b) in zip(curve, curve[1:]):
+        latency = slope(n0, a["p50_ms"], n1, b["p50_ms"])
+        results = slope(n0, a["results"] + 1, n1, b["results"] + 1)
+        steps.append({"from": n0, "to": n1, "latency_slope": round(latency, 2), "result_slope": round(results, 2),
+                      "flagged": (latency >= threshold and results < threshold
+                                  and b["p50_ms"] - a["p50_ms"] >= min_increase_ms)})
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=16, help="parallel POSTs when seeding over HTTP")
+    parser.add_argument("--base-url", default=None, help="benchmark this deployment instead of the local stand-in")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--direct-seed", action="store_true", help="local stand-in only: skip HTTP when seeding")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded bookings on --base-url")
+    parser.add_argument("--linear-threshold", type=float, default=0.7)
+    parser.add_argument("--min-increase-ms", type=float, default=2.0)
+    parser.add_argument("--report", default="reports/filter-scaling.json")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    if args.direct_seed and args.base_url:
+        parser.error("--direct-seed needs the local stand-in (no --base-url)")
+
+    server = None if args.base_url else LocalBookerServer(username=args.username, password=args.password).start()
+    base_url = args.base_url or server.base_url
+    token = AuthenticationHelper.get_token(base_url, args.username, args.password)
+    client = ApiClient(base_url, auth_token=token, metrics=None, pool_settings={"pool_maxsize": args.workers})
+    seeder = Seeder(client, args.seed, args.workers, store=server.store if args.direct_seed else None)
+
+    curves = {}
+    try:
+        seeder._insert(PROBES)
+        named = queries(query_values(seeder.sample()))
+        for size in sizes:
+            seed_s = seeder.grow_to(size)
+            print(f"\nn = {size:,} bookings (+{len(PROBES)} probes), seeded in {seed_s:.1f} s")
+            print(f"  {'query':<36}{'p50 ms':>10}{'p95 ms':>10}{'results':>10}")
+            for name, params in named.items():
+                stats = time_query(client, params, args.repeat, args.warmup)
+                curves.setdefault(name, []).append((size, stats))
+                print(f"  {name:<36}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['results']:>10}")
+    finally:
+        if server is not None:
+            server.stop()
+        elif not args.keep:
+            delete_bookings(client, seeder.ids, max_workers=args.workers)
+
+    report = {"base_url": base_url, "sizes": sizes, "queries": {}}
+    print(f"\nlog-log slope of p50 latency per size step (0 = constant, 1 = linear; "
+          f"* = latency >= {args.linear_threshold} while the result size is not)")
+    for name, curve in curves.items():
+        steps = scaling(curve, args.linear_threshold, args.min_increase_ms)
+        report["queries"][name] = {"params": named[name], "curve": [{"n": n, **s} for n, s in curve], "steps": steps}
+        cells = "  ".join(f"{s['latency_slope']:5.2f}{'*' if s['flagged'] else ' '}" for s in steps)
+        print(f"  {name:<36}{cells}")
+    flagged = {name: [f"{s['from']:,}→{s['to']:,}" for s in q["steps"] if s["flagged"]]
+               for name, q in report["queries"].items()}
+    flagged = {name: steps for name, steps in flagged.items() if steps}
+    print(f"\nstops scaling: {flagged or 'nothing flagged'}")
+
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
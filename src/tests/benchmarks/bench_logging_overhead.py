@@ -0,0 +1,105 @@
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+
+import requests
+
+from tests.api.utils.http_log import HttpLog, JsonLinesFormatter, lazy_json, start_queue_logging
+
+"""
+Logging overhead benchmark
+
+Per-call cost on the calling thread of logging booking-shaped payloads of
+growing size (--sizes, bytes of JSON):
+- test-style logging with INFO filtered out: eager json.dumps(indent=2) as
+  the tests used to do vs lazy_json
+- HttpLog on a response with that body: level disabled, 10% sampled and
+  100% logged to a JSON-lines file, with the file handler called directly
+  (formatting on the calling thread) vs behind start_queue_logging
+
+Run from the repository root:
+    PYTHONPATH=src python -m tests.benchmarks.bench_logging_overhead --calls 2000 --sizes 1000,64000,1000000
+"""
+logger = logging.getLogger("bench.logging")
+
+
+def payload(size):
+    """Booking list whose JSON is about `size` bytes."""
+    booking = {"firstname": "Thomas", "lastname": "AutomationTest", "totalprice": 365, "depositpaid": True,
+               "bookingdates": {"checkin": "2025-09-10", "checkout": "2025-09-15"}, "additionalneeds": "Breakfast"}
+    one = len(json.dumps(booking)) + 2
+    return [dict(booking, totalprice=i) for i in range(max(1, size // one))]
+
+
+def fake_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    response.headers["Content-Type"] = "application/json"
+    response.request = requests.Request("POST", "http://bench/booking", data=response._content[:200]).prepare()
+    return response
+
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def http_log_cases(response, calls, log_dir):
+    http_log = HttpLog(logger="bench.http", sample_rate=1.0, seed=1)
+    record = lambda: http_log.record("POST", "/booking", response, 0.005)
+    results = {}
+
+    http_log.logger.setLevel(logging.INFO)  # DEBUG records disabled
+    results["level disabled"] = per_call_us(record, calls)
+
+    http_log.logger.setLevel(logging.DEBUG)
+    http_log.logger.propagate = False
+    handler = logging.FileHandler(os.path.join(log_dir, "sync.jsonl"), mode="w")
+    handler.setFormatter(JsonLinesFormatter())
+    http_log.logger.addHandler(handler)
+    http_log.sample_rate = 0.1
+    results["10% sampled, inline handler"] = per_call_us(record, calls)
+    http_log.sample_rate = 1.0
+    results["100%, inline handler"] = per_call_us(record, calls)
+    http_log.logger.removeHandler(handler)
+    handler.close()
+
+    handler = logging.FileHandler(os.path.join(log_dir, "queued.jsonl"), mode="w")
+    handler.setFormatter(JsonLinesFormatter())
+    stop = start_queue_logging([handler], http_log.logger)
+    results["100%, queue handler"] = per_call_us(record, calls)
+    start = time.perf_counter()
+    stop()
+    results["(queue drain at stop, total ms)"] = (time.perf_counter() - start) * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--sizes", default="1000,64000,1000000")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="booker-log-bench-") as log_dir:
+        for size in (int(s) for s in args.sizes.split(",")):
+            body = payload(size)
+            calls = max(20, args.calls * 1000 // max(size, 1000))
+            eager = per_call_us(lambda: logger.info("Response:\n%s", json.dumps(body, indent=2)), calls)
+            lazy = per_call_us(lambda: logger.info("Response:\n%s", lazy_json(body)), calls)
+            print(f"payload ~{size} B ({calls} calls)")
+            print(f"  INFO filtered, eager json.dumps:   {eager:12.2f} µs/call")
+            print(f"  INFO filtered, lazy_json:          {lazy:12.2f} µs/call  ({eager / lazy:.0f}x)")
+            for name, value in http_log_cases(fake_response(body), calls, log_dir).items():
+                unit = "" if name.startswith("(") else " µs/call"
+                print(f"  HttpLog {name + ':':<34}{value:10.2f}{unit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import logging
+import random
+import time
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.auth_helper import AuthenticationHelper
+from tests.api.utils.local_booker_server import LocalBookerServer
+from tests.api.utils.scenario_engine import compile_plan, run_plan
+
+"""
+Scenario engine scaling benchmark
+
+Runs a synthetic set of filters.json / update_payloads.json style cases
+against the local Booker stand-in two ways:
+- per case (before): every case on its own, one after another, with its
+  own booking and requests, like one hand-written test per case
+- compiled plan (after): compile_plan + run_plan, with shared bookings,
+  deduplicated reads and concurrent stages
+--latency-ms adds a fixed delay before every request to stand in for the
+network round trip to a deployed API (the stand-in answers in ~1 ms).
+
+Run from the repository root:
+    PYTHONPATH=src python -m tests.benchmarks.bench_scenario_engine --filters 1000 --updates 250 --latency-ms 20
+"""
+FIRSTNAMES = [f"First{i}" for i in range(40)]
+LASTNAMES = [f"Last{i}" for i in range(40)]
+DATES = [f"2026-{month:02d}-{day:02d}" for month in (3, 4) for day in (1, 8, 15, 22)]
+
+
+class DelayedClient(ApiClient):
+    """ApiClient that waits `delay` seconds before each request (simulated RTT)."""
+    delay = 0.0
+
+    def _send_live(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super()._send_live(*args, **kwargs)
+
+
+def synthetic_cases(filters, updates, seed):
+    rng = random.Random(seed)
+    # no "No filters" case: run on its own it would poll an empty booking list until its deadline
+    filter_cases = []
+    for _ in range(filters):
+        roll = rng.random()
+        if roll < 0.2:
+            filter_cases.append({"description": "Invalid Value Format In filter",
+                                 "params": {"checkin": rng.choice(["sally", "13-03-2014"])}, "valid": False})
+        elif roll < 0.6:
+            key = rng.choice(["firstname", "lastname", "checkin"])
+            value = rng.choice({"firstname": FIRSTNAMES, "lastname": LASTNAMES, "checkin": DATES}[key])
+            filter_cases.append({"description": "Individual filter", "params": {key: value}, "valid": True})
+        else:
+            filter_cases.append({"description": "Multiple filters", "valid": True, "params": {
+                "firstname": rng.choice(FIRSTNAMES), "lastname": rng.choice(LASTNAMES)}})
+    update_cases = []
+    for i in range(updates):
+        roll = rng.random()
+        if roll < 0.5:
+            update_cases.append({"description": "Update Individual Field", "payload": {"firstname": f"Updated{i}"}})
+        elif roll < 0.8:
+            update_cases.append({"description": "Update Multiple Fields",
+                                 "payload": {"lastname": f"Smith{i}", "totalprice": i}})
+        elif roll < 0.9:
+            update_cases.append({"description": "Idempotent update", "payload": {"firstname": "Repeat"},
+                                 "idempotent": True})
+        else:
+            update_cases.append({"description": "Invalid Value Format In Update", "payload": {"firstname": "Nobody"},
+                                 "invalid_id": 999999999})
+    return filter_cases, update_cases
+
+
+def per_case(client, plan_scenarios):
+    """Each case as its own single-scenario plan, sequentially."""
+    failed = 0
+    for source, index, case in plan_scenarios:
+        cases = ([case], []) if source == "filters.json" else ([], [case])
+        result = run_plan(client, compile_plan(*cases), max_workers=1)
+        failed += len(result.failed)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filters", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=250)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    filter_cases, update_cases = synthetic_cases(args.filters, args.updates, args.seed)
+    start = time.perf_counter()
+    plan = compile_plan(filter_cases, update_cases)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    with LocalBookerServer() as server:
+        DelayedClient.delay = args.latency_ms / 1000
+        token = AuthenticationHelper.get_token(server.base_url, "admin", "password123")
+        client = DelayedClient(server.base_url, auth_token=token, pool_settings={"pool_maxsize": args.workers})
+
+        start = time.perf_counter()
+        before_failed = per_case(client, [("filters.json", i, c) for i, c in enumerate(filter_cases)]
+                                 + [("update_payloads.json", i, c) for i, c in enumerate(update_cases)])
+        before_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = run_plan(client, plan, max_workers=args.workers)
+        after_s = time.perf_counter() - start
+
+    cases = len(filter_cases) + len(update_cases)
+    stats = plan.stats()
+    print(f"cases:                 {cases} ({len(filter_cases)} filter, {len(update_cases)} update), "
+          f"{args.latency_ms:g} ms simulated latency")
+    print(f"plan:                  {stats['bookings']} bookings, {stats['reads']} reads "
+          f"({stats['reads_deduplicated']} deduplicated), {stats['writes']} writes; compiled in {compile_ms:.1f} ms")
+    print(f"per case (before):     {before_s:8.2f} s  ({before_failed} failed)")
+    print(f"compiled plan (after): {after_s:8.2f} s  ({len(result.failed)} failed)  ({before_s / after_s:.1f}x)")
+    print(f"plan stages:           {result.timings}")
+
+
+if __name__ == "__main__":
+    main()
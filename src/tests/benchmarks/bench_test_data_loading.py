@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from tests.api.utils import data_loader
+
+"""
+Test-data loading / collection startup benchmark
+
+Builds a synthetic filters.json with --cases scenarios (same shape as
+resources/test-data/filters.json) and compares, per process:
+- import-time loading (before): json.load + one list comprehension per
+  parametrized test, as the test modules used to do at import
+- data loader, cold: parse + index + write the compiled copy
+- data loader, warm: a new process reading the compiled copy
+- data loader, in-process: every later lookup in the same process
+Then times `pytest --collect-only` of test_01_get_booking.py against the
+synthetic data with a cold and a warm compiled cache.
+
+Run from the repository root:
+    PYTHONPATH=src python -m tests.benchmarks.bench_test_data_loading --cases 20000
+"""
+DESCRIPTIONS = ("Individual filter", "Multiple filters", "Invalid Value Format In filter")
+FIELDS = ("firstname", "lastname", "checkin", "checkout")
+
+
+def synthetic_filters(count, seed):
+    rng = random.Random(seed)
+    cases = [{"description": "No filters", "params": {}, "valid": False}]
+    for i in range(count - 1):
+        description = rng.choice(DESCRIPTIONS)
+        fields = rng.sample(FIELDS, 1 if description == "Individual filter" else rng.randint(2, 4))
+        params = {
+            field: f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if field in ("checkin", "checkout")
+            else f"{field}-{i}"
+            for field in fields
+        }
+        cases.append({"description": description, "params": params,
+                      "valid": description != "Invalid Value Format In filter"})
+    return cases
+
+
+def timed(fn, repeat=3):
+    """Best wall time of `repeat` runs, in ms."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def import_time_loading(path):
+    with open(path) as f:
+        data = json.load(f)
+    return [[d for d in data if d["description"] == description] for description in ("No filters", *DESCRIPTIONS)]
+
+
+def loader_lookups(path):
+    return [data_loader.select_cases(path, description=description) for description in ("No filters", *DESCRIPTIONS)]
+
+
+def collect(data_dir, html_path):
+    env = {**os.environ, "BOOKER_TEST_DATA_DIR": data_dir, "PYTHONPATH": "src"}
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-n", "0", f"--html={html_path}",
+         "src/tests/api/booking/test_01_get_booking.py"],
+        env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-collection", action="store_true", help="only time the in-process loaders")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="booker-test-data-")
+    path = os.path.join(data_dir, "filters.json")
+    compiled = data_loader._cache_path(path, data_loader.CACHE_DIR)
+    try:
+        with open(path, "w") as f:
+            json.dump(synthetic_filters(args.cases, args.seed), f, indent=2)
+        shutil.copy(os.path.join("resources", "test-data", "update_payloads.json"), data_dir)
+
+        def cold():
+            data_loader.clear_memory()
+            if os.path.exists(compiled):
+                os.remove(compiled)
+            loader_lookups(path)
+
+        def warm():
+            data_loader.clear_memory()
+            loader_lookups(path)
+
+        before_ms = timed(lambda: import_time_loading(path))
+        cold_ms = timed(cold)
+        warm_ms = timed(warm)
+        hot_ms = timed(lambda: loader_lookups(path))
+
+        print(f"cases:                          {args.cases} ({os.path.getsize(path) / 2**20:.1f} MiB JSON)")
+        print(f"import-time json.load (before): {before_ms:10.2f} ms per process")
+        print(f"data loader, cold:              {cold_ms:10.2f} ms (parse + compile, once per data change)")
+        print(f"data loader, warm:              {warm_ms:10.2f} ms per process  ({before_ms / warm_ms:.1f}x)")
+        print(f"data loader, in-process:        {hot_ms:10.2f} ms per further lookup")
+
+        if not args.skip_collection:
+            html_path = os.path.join(data_dir, "report.html")
+            os.remove(compiled)
+            cold_collect_ms = collect(data_dir, html_path)
+            warm_collect_ms = collect(data_dir, html_path)
+            print(f"pytest --collect-only, cold:    {cold_collect_ms:10.0f} ms")
+            print(f"pytest --collect-only, warm:    {warm_collect_ms:10.0f} ms")
+    finally:
+        data_loader.clear_memory()
+        if os.path.exists(compiled):
+            os.remove(compiled)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,561 @@
 import pytest
 import json
+import os
+import random
+import secrets
+import shutil
+import tempfile
 import time
 import logging
+from datetime import date
+from pathlib import Path
 
-import matplotlib.pyplot as plt
-import base64
-from io import BytesIO
+import requests
 
 from tests.api.utils.api_client import ApiClient
-from tests.api.utils.auth_helper import AuthenticationHelper
-from tests.api.utils.booking_data_builder import BookingDataBuilder
+from tests.api.utils.async_api_client import AsyncApiClient
+from tests.api.utils.http_pool import close_shared_sessions
+from tests.api.utils import booking_data_builder
+from tests.api.utils.auth_helper import AuthenticationHelper, TokenCache
+from tests.api.utils.booking_data_builder import BookingDataBuilder, PayloadStream
+from tests.api.utils.booking_journal import BookingJournal, finish_run, start_run, sweep_orphans
+from tests.api.utils.booking_registry import BookingRegistry, ReadOnlyBookingRegistry
+from tests.api.utils.bulk_booking import create_bookings, delete_bookings
+from tests.api.utils.cassette import MODES as CASSETTE_MODES, Cassette
+from tests.api.utils.data_loader import load_cases, select_cases, warm_cache
+from tests.api.utils.html_summary import render_results_summary
+from tests.api.utils.http_log import HttpLog, JsonLinesFormatter, start_queue_logging
+from tests.api.utils.local_booker_server import LocalBookerServer
+from tests.api.utils.response_cache import ResponseCache
+from tests.api.utils.metrics import (
+    ApiMetrics, api_metrics, render_html_table as render_metrics_table, render_waits_html_table)
+from tests.api.utils.shared_registry import SharedBookingRegistry
 
 """
 Pytest fixtures and hooks for booking API tests
 
+- pytest_addoption / pytest_configure → optional local Booker stand-in
+  (--local-server or "local_server": true), shared with xdist workers
+- pytest_configure → also pins a cross-worker SharedBookingRegistry and
+  picks the run's payload seed (--payload-seed / "payload_seed", else random)
+- pytest_configure → opens the HTTP cassette when --cassette-mode (or
+  "cassette.mode") is not "off"; the cassette pins the payload seed and
+  base date it was recorded with
+- pytest_configure → creates the GET response cache when --response-cache
+  (or "response_cache.enabled") is set
+- pytest_configure → with --http-log (or "http_log.enabled"), logs sampled
+  ApiClient calls as JSON lines through a background queue listener
+- pytest_configure → starts a run-tagged booking journal (unless
+  "booking_journal.enabled" is false, the in-process stand-in runs or a
+  replay-only cassette is active); every process journals its ApiClient
+  booking writes under the run, released at unconfigure
+- pytest_sessionstart → sweeps bookings that earlier interrupted runs left
+  on the same API (skip with --no-orphan-sweep)
+- pytest_generate_tests → parametrize `data` from a test's
+  @pytest.mark.test_data(file, description=..., where=..., ids=...) marker,
+  reading the file through the cached data loader
+- pytest_runtest_protocol → with a cassette, scope recordings to the running
+  test and seed random/Faker per test so generated payloads are repeatable
+- pytest_report_header → print the payload seed so a run can be replayed
 - config → load test configuration from JSON
-- auth_token → fetch session-wide authentication token
-- api_client → provide ApiClient with base URL and token
+- cassette → the run's record/replay Cassette, or None when disabled
+- response_cache → per-session GET ResponseCache, or None when disabled
+- http_log → the process's HttpLog, or None when disabled
+- booking_journal → the process's BookingJournal, or None when disabled
+- token_provider → TokenCache-backed token source shared by all workers/runs
+- auth_token → current session-wide authentication token
+- api_client → provide ApiClient with base URL, token and pooled session
+- async_api_client → AsyncApiClient sharing the api_client settings
 - check_health → verify API health (/ping) before tests
-- configure_logging → set up logging for test session
+- configure_logging → set up logging for test session ("log_level" in
+  config.json; pytest's --log-level takes precedence)
 - booking_registry → create/delete test bookings from filters.json
+  (an indexed BookingRegistry)
 - create_test_booking → alias to booking_registry
+- shared_booking_registry → read-only bookings created once for all workers
+- payload_stream → seeded PayloadStream, sharded per xdist worker
+- report_section → publish an HTML section into the pytest-html summary
+- pytest_sessionfinish / pytest_terminal_summary → merge per-worker ApiClient
+  metrics (and cassette / response cache counters), write
+  reports/api-metrics.json and print per-endpoint latency
 - pytest_runtest_logreport → collect pass/fail/skip results
-- pytest_html_results_summary → embed pie chart in pytest-html report
+- pytest_html_results_summary → embed the results pie (inline SVG) and the
+  slowest tests in the pytest-html report,
+  plus any sections published with add_report_section (e.g. load results)
 """
+CONFIG_PATH = "resources/config/config.json"
+LOCAL_SERVER_URL = pytest.StashKey[str]()
+SHARED_DIR = pytest.StashKey[str]()
+METRICS_SUMMARY = pytest.StashKey[dict]()
+PAYLOAD_SEED = pytest.StashKey[int]()
+CASSETTE = pytest.StashKey[Cassette]()
+RESPONSE_CACHE = pytest.StashKey[ResponseCache]()
+CLIENT_COUNTERS = pytest.StashKey[dict]()
+HTTP_LOG = pytest.StashKey[HttpLog]()
+RUN_ID = pytest.StashKey[str]()
+BOOKING_JOURNAL = pytest.StashKey[BookingJournal]()
+
+
+def load_config():
+    with open(CONFIG_PATH) as f:
+        return json.load(f)
+
+
+def resolve_config(pytestconfig):
+    """config.json with base_url pointed at the local stand-in when it is running."""
+    test_config = load_config()
+    local_url = pytestconfig.stash.get(LOCAL_SERVER_URL, None)
+    if local_url:
+        test_config["base_url"] = local_url
+    return test_config
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--local-server",
+        action="store_true",
+        default=False,
+        help="Run against the bundled in-process Restful-Booker stand-in instead of base_url",
+    )
+    group = parser.getgroup("load", "booking load-test mode")
+    group.addoption("--load-duration", type=float, default=0,
+                    help="Run load tests for this many seconds (0 = load tests skipped)")
+    group.addoption("--load-concurrency", type=int, default=8,
+                    help="Worker threads replaying the scenario")
+    group.addoption("--load-rps", type=float, default=None,
+                    help="Cap total requests/sec (default: unbounded)")
+    group.addoption("--load-max-error-rate", type=float, default=0.01,
+                    help="Fail the load test above this error rate")
+    group.addoption("--load-report", default="reports/load-report.json",
+                    help="Where to write the JSON load report")
+    group = parser.getgroup("soak", "booking soak/endurance mode")
+    group.addoption("--soak-duration", type=float, default=0,
+                    help="Loop the booking lifecycle for this many seconds (0 = soak tests skipped)")
+    group.addoption("--soak-window", type=float, default=60,
+                    help="Seconds per latency/resource sampling window")
+    group.addoption("--soak-concurrency", type=int, default=4,
+                    help="Worker threads looping the scenario")
+    group.addoption("--soak-report", default="reports/soak-report.json",
+                    help='Where to write the JSON soak report (thresholds: "soak" in config.json)')
+    group = parser.getgroup("regression", "performance regression benchmarks")
+    group.addoption("--regression", action="store_true", default=False,
+                    help="Benchmark every endpoint and compare with the stored baseline (run with -n 0)")
+    group.addoption("--update-baseline", action="store_true", default=False,
+                    help="Record the measured latencies as the new baseline instead of comparing")
+    group.addoption("--baseline-env", default=None,
+                    help='Baseline environment name (default: "regression.environment", else local / API host)')
+    group.addoption("--regression-iterations", type=int, default=None,
+                    help='Measured calls per endpoint (default: "regression.iterations" in config.json)')
+    group.addoption("--regression-report", default="reports/regression-report.json",
+                    help="Where to write the JSON regression verdicts")
+    parser.addoption("--scenario-plan", action="store_true", default=False,
+                     help="Run the compiled filters.json / update_payloads.json scenario plan (test_scenario_plan.py)")
+    parser.addoption("--payload-seed", type=int, default=None,
+                     help="Seed for generated booking payloads (default: payload_seed in config.json, else random)")
+    group = parser.getgroup("cassette", "HTTP record/replay")
+    group.addoption("--cassette-mode", choices=CASSETTE_MODES, default=None,
+                    help='Record/replay API traffic (default: "cassette.mode" in config.json, else off)')
+    group.addoption("--cassette-path", default=None,
+                    help='Cassette file prefix (default: "cassette.path" in config.json)')
+    parser.addoption("--response-cache", action="store_true", default=None,
+                     help='Cache idempotent GETs per session (default: "response_cache.enabled" in config.json)')
+    parser.addoption("--http-log", action="store_true", default=None,
+                     help='Log sampled ApiClient requests/responses as JSON lines (default: "http_log.enabled")')
+    parser.addoption("--no-orphan-sweep", action="store_true", default=False,
+                     help="Don't delete bookings left behind by interrupted earlier runs at session start")
+    parser.addoption("--metrics-report", default="reports/api-metrics.json",
+                     help="Where to write per-endpoint ApiClient metrics (JSON)")
+
+
+def add_report_section(config, name, html):
+    """
+    Publish an HTML fragment for the pytest-html summary.
+    Fragments go to the run directory so sections produced on xdist
+    workers reach the controller, which renders the report.
+    """
+    sections_dir = os.path.join(config.stash[SHARED_DIR], "report-sections")
+    os.makedirs(sections_dir, exist_ok=True)
+    with open(os.path.join(sections_dir, f"{name}.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+
+
 @pytest.fixture(scope="session")
-def config():
+def report_section(pytestconfig):
+    """Return publish(name, html) for adding a section to the pytest-html summary."""
+    return lambda name, html: add_report_section(pytestconfig, name, html)
+
+
+def _report_sections(config):
+    sections_dir = os.path.join(config.stash[SHARED_DIR], "report-sections")
+    if not os.path.isdir(sections_dir):
+        return []
+    sections = []
+    for name in sorted(os.listdir(sections_dir)):
+        with open(os.path.join(sections_dir, name), encoding="utf-8") as f:
+            sections.append(f.read())
+    return sections
+
+
+def pytest_configure(config):
+    """
+    Controller-process setup, shared with xdist workers through workerinput:
+    - start the local Booker stand-in once when requested
+    - create the run directory holding the shared booking registry and pin
+      it, so its bookings are deleted only after every worker has finished
+    - compile the test-data files, so workers load the compiled copies
+    Every process opens its own handle on the cassette (when enabled).
+    """
+    test_config = load_config()
+    cassette = _open_cassette(config, test_config)
+    _create_response_cache(config, test_config)
+    _create_http_log(config, test_config)
+
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        if workerinput.get("booker_local_url"):
+            config.stash[LOCAL_SERVER_URL] = workerinput["booker_local_url"]
+        config.stash[SHARED_DIR] = workerinput["booker_shared_dir"]
+        config.stash[PAYLOAD_SEED] = workerinput["booker_payload_seed"]
+        if workerinput.get("booker_run_id"):
+            _open_booking_journal(config, test_config, workerinput["booker_run_id"], workerinput["workerid"])
+        if cassette is not None:
+            booking_data_builder.base_date = date.fromisoformat(cassette.meta["base_date"])
+        return
+
+    seed = config.getoption("--payload-seed")
+    if seed is None:
+        seed = test_config.get("payload_seed")
+    if seed is None and cassette is not None:
+        seed = cassette.meta.get("payload_seed")
+    config.stash[PAYLOAD_SEED] = secrets.randbits(32) if seed is None else seed
+    if cassette is not None:
+        # Replays only match if payloads are generated exactly as when recorded
+        cassette.meta["payload_seed"] = config.stash[PAYLOAD_SEED]
+        cassette.meta.setdefault("base_date", date.today().isoformat())
+        cassette.save()
+        booking_data_builder.base_date = date.fromisoformat(cassette.meta["base_date"])
+
+    if config.getoption("--local-server") or test_config.get("local_server", False):
+        server = LocalBookerServer(
+            username=test_config["username"], password=test_config["password"]).start()
+        config.add_cleanup(server.stop)
+        config.stash[LOCAL_SERVER_URL] = server.base_url
+
+    warm_cache()
+    # before the shared registry: cleanups run in reverse, so its deletions are journaled
+    _start_booking_journal(config, test_config, cassette)
+
+    shared_dir = tempfile.mkdtemp(prefix="booker-shared-")
+    config.add_cleanup(lambda: shutil.rmtree(shared_dir, ignore_errors=True))
+    config.stash[SHARED_DIR] = shared_dir
+
+    shared = SharedBookingRegistry(shared_dir)
+    shared.acquire()
+    config.add_cleanup(lambda: shared.release(
+        lambda registry: _delete_shared_registry(
+            resolve_config(config), registry, cassette, config.stash.get(BOOKING_JOURNAL, None))))
+
+
+def _open_cassette(config, test_config):
+    """Open the configured cassette (closed at unconfigure), or None when off."""
+    cassette_config = test_config.get("cassette", {})
+    mode = config.getoption("--cassette-mode") or cassette_config.get("mode", "off")
+    if mode == "off":
+        return None
+    cassette = Cassette(
+        config.getoption("--cassette-path") or cassette_config.get("path", "resources/cassettes/booker"),
+        mode=mode,
+        max_age=cassette_config.get("max_age_seconds"),
+    )
+    config.add_cleanup(cassette.close)
+    config.stash[CASSETTE] = cassette
+    return cassette
+
+
+def _create_response_cache(config, test_config):
+    """Per-process GET cache shared by api_client and async_api_client (opt-in)."""
+    cache_config = test_config.get("response_cache", {})
+    enabled = config.getoption("--response-cache") or cache_config.get("enabled", False)
+    if not enabled:
+        return None
+    cache = ResponseCache(
+        max_entries=cache_config.get("max_entries", 256),
+        ttl=cache_config.get("ttl_seconds", 30),
+    )
+    config.stash[RESPONSE_CACHE] = cache
+    return cache
+
+
+def _create_http_log(config, test_config):
+    """
+    Per-process HttpLog writing JSON lines from a queue listener thread
+    (opt-in). xdist workers write their own file: http-log.gw0.jsonl, ...
+    """
+    log_config = test_config.get("http_log", {})
+    enabled = config.getoption("--http-log") or log_config.get("enabled", False)
+    if not enabled:
+        return None
+    http_log = HttpLog(
+        level=log_config.get("level", "DEBUG"),
+        sample_rate=log_config.get("sample_rate", 1.0),
+        always_log_errors=log_config.get("always_log_errors", True),
+        max_body_bytes=log_config.get("max_body_bytes", 2048),
+    )
+    path = log_config.get("path", "reports/http-log.jsonl")
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        root, ext = os.path.splitext(path)
+        path = f"{root}.{workerinput['workerid']}{ext}"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    handler = logging.FileHandler(path, mode="w", encoding="utf-8")
+    handler.setFormatter(JsonLinesFormatter())
+    # the logger's own level decides what is built; DEBUG would otherwise be dropped by the root's INFO
+    http_log.logger.setLevel(min(http_log.level, http_log.error_level))
+    config.add_cleanup(start_queue_logging([handler], http_log.logger))
+    config.stash[HTTP_LOG] = http_log
+    return http_log
+
+
+def _start_booking_journal(config, test_config, cassette):
+    """
+    Controller: lock a new journal run (see booking_journal.py), finished at
+    unconfigure. Off for the in-process stand-in, whose bookings go away
+    with it, and for replay-only cassettes, which never reach the API.
+    """
+    journal_config = test_config.get("booking_journal", {})
+    if (not journal_config.get("enabled", True) or config.stash.get(LOCAL_SERVER_URL, None)
+            or (cassette is not None and cassette.mode == "replay-only")):
+        return None
+    directory = journal_config.get("directory", ".booker/journal")
+    run_id, lock = start_run(directory, test_config["base_url"])
+    config.add_cleanup(lambda: finish_run(directory, run_id, lock))
+    config.stash[RUN_ID] = run_id
+    return _open_booking_journal(config, test_config, run_id, "controller")
+
+
+def _open_booking_journal(config, test_config, run_id, name):
+    """This process's journal file in the run (controller, gw0, ...)."""
+    directory = test_config.get("booking_journal", {}).get("directory", ".booker/journal")
+    journal = BookingJournal(directory, run_id, name)
+    config.add_cleanup(journal.close)
+    config.stash[BOOKING_JOURNAL] = journal
+    return journal
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionstart(session):
+    """
+    Controller, before xdist starts workers: delete the bookings interrupted
+    runs left on this API. Only runs other than this one are looked at, so
+    nothing (not even /auth) is sent when there are none.
+    """
+    config = session.config
+    run_id = config.stash.get(RUN_ID, None)
+    if (run_id is None or getattr(config, "workerinput", None) is not None
+            or config.getoption("--no-orphan-sweep") or config.option.collectonly):
+        return
+    test_config = resolve_config(config)
+    journal_config = test_config.get("booking_journal", {})
+    directory = Path(journal_config.get("directory", ".booker/journal"))
+    if not any(path.name != run_id for path in directory.iterdir()):
+        return
+    try:
+        client = ApiClient(test_config["base_url"], pool_settings=test_config.get("http_pool"), metrics=None,
+                           token_provider=_token_provider(test_config))
+        stats = sweep_orphans(client, directory, max_age_days=journal_config.get("max_age_days", 7),
+                              max_concurrency=journal_config.get("sweep_concurrency", 8))
+    except requests.RequestException as error:
+        print(f"\nOrphan sweep skipped: {error}")
+        return
+    if stats["outstanding"] or stats["pruned_runs"]:
+        print(f"\nOrphan sweep: {stats['deleted']} deleted of {stats['outstanding']} left by {stats['runs']} "
+              f"earlier runs ({stats['dropped']} already gone or changed, {stats['failed']} failed, "
+              f"{stats['pruned_runs']} stale runs of other APIs pruned)")
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize `data` lazily from the test_data marker (one parse per process)."""
+    marker = metafunc.definition.get_closest_marker("test_data")
+    if marker is None:
+        return
+    cases = select_cases(
+        marker.args[0],
+        description=marker.kwargs.get("description"),
+        where=marker.kwargs.get("where"),
+    )
+    metafunc.parametrize(marker.kwargs.get("argname", "data"), cases, ids=marker.kwargs.get("ids"))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Scope cassette recordings to the test and make its generated payloads repeatable."""
+    cassette = item.config.stash.get(CASSETTE, None)
+    if cassette is not None:
+        cassette.scope = item.nodeid
+        seed = f"{item.config.stash[PAYLOAD_SEED]}:{item.nodeid}"
+        random.seed(seed)
+        booking_data_builder.faker.seed_instance(seed)
+    yield
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """xdist hook: hand the local server URL and shared directory to each worker."""
+    url = node.config.stash.get(LOCAL_SERVER_URL, None)
+    if url:
+        node.workerinput["booker_local_url"] = url
+    node.workerinput["booker_shared_dir"] = node.config.stash[SHARED_DIR]
+    node.workerinput["booker_payload_seed"] = node.config.stash[PAYLOAD_SEED]
+    node.workerinput["booker_run_id"] = node.config.stash.get(RUN_ID, None)
+
+
+def pytest_report_header(config):
+    seed = config.stash[PAYLOAD_SEED]
+    return f"booking payload seed: {seed} (replay with --payload-seed {seed})"
+
+
+def _token_provider(test_config, cassette=None):
+    """
+    Token provider backed by the on-disk TokenCache configured in config.json.
+    Replay-only runs never reach the API, so any fixed token will do.
+    """
+    if cassette is not None and cassette.mode == "replay-only":
+        return lambda rejected=None: "cassette-replay"
+    cache_config = test_config.get("token_cache", {})
+    cache = TokenCache(
+        path=cache_config.get("path", ".pytest_cache/booker/tokens.json"),
+        ttl=cache_config.get("ttl_seconds", 600),
+        refresh_ratio=cache_config.get("refresh_ratio", 0.8),
+        fetch=lambda base_url, username, password: AuthenticationHelper.get_token(
+            base_url, username, password, cassette=cassette),
+    )
+    return cache.provider(test_config["base_url"], test_config["username"], test_config["password"])
+
+
+def _delete_shared_registry(test_config, registry, cassette=None, booking_journal=None):
+    """Coordinator-side cleanup of the shared registry (needs its own client)."""
+    client = ApiClient(test_config["base_url"],
+                       pool_settings=test_config.get("http_pool"),
+                       token_provider=_token_provider(test_config, cassette),
+                       cassette=cassette,
+                       booking_journal=booking_journal)
+    _delete_registry(client, registry, test_config.get("fixture_parallelism", 8))
+
+
+@pytest.fixture(scope="session")
+def config(pytestconfig):
     """
     Load test configuration (base_url, credentials, etc.) 
     from resources/config/config.json once per test session.
+    base_url points at the local stand-in when it is running.
     """
-    with open("resources/config/config.json") as f:
-        return json.load(f)
+    return resolve_config(pytestconfig)
 
 @pytest.fixture(scope="session", autouse=True)
-def configure_logging():
-    """Configure logging for the whole test session"""
+def configure_logging(pytestconfig, config):
+    """
+    Configure logging for the whole test session.
+    The level comes from pytest's --log-level, else "log_level" in
+    config.json (INFO). Log arguments are formatted lazily (http_log.lazy_json),
+    so raising it to WARNING also skips pretty-printing the payloads.
+    """
+    level = pytestconfig.getoption("log_level") or config.get("log_level", "INFO")
     logging.basicConfig(
-        level=logging.INFO,  # or DEBUG for more details
+        level=level,
         format="%(asctime)s [%(levelname)s] %(message)s",
     )
-    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().setLevel(level)
+
+
+@pytest.fixture(scope="session")
+def cassette(pytestconfig):
+    """Record/replay cassette for ApiClient (None unless a cassette mode is active)."""
+    return pytestconfig.stash.get(CASSETTE, None)
+
+
+@pytest.fixture(scope="session")
+def response_cache(pytestconfig):
+    """LRU cache for idempotent GETs (None unless enabled); writes invalidate it."""
+    return pytestconfig.stash.get(RESPONSE_CACHE, None)
+
+
+@pytest.fixture(scope="session")
+def http_log(pytestconfig):
+    """Structured request/response logger for ApiClient (None unless enabled)."""
+    return pytestconfig.stash.get(HTTP_LOG, None)
+
+
+@pytest.fixture(scope="session")
+def booking_journal(pytestconfig):
+    """This process's BookingJournal in the run (None when journaling is off)."""
+    return pytestconfig.stash.get(BOOKING_JOURNAL, None)
 
 
 @pytest.fixture(scope="session")
-def auth_token(config):
+def token_provider(config, cassette):
     """
-    Generate an authentication token for the session 
-    using configured username and password.
+    Token source shared by every worker and by later runs (on-disk cache with
+    file lock and TTL): /auth is called at most once per TTL per base_url+user.
     """
-    return AuthenticationHelper.get_token(
-        config["base_url"],
-        config["username"],
-        config["password"]
-    )
+    return _token_provider(config, cassette)
+
+
+@pytest.fixture(scope="session")
+def auth_token(token_provider):
+    """
+    Authentication token for the session (from the shared token cache).
+    ApiClient refreshes it transparently; prefer api_client.auth_token for
+    the current value.
+    """
+    return token_provider()
 
 
 @pytest.fixture(scope="session")
-def api_client(config, auth_token):
+def api_client(config, auth_token, token_provider, cassette, response_cache, http_log, booking_journal):
     """
     Provide an API client initialized with base URL and auth token.
-    Shared across all tests in the session.
+    Shared across all tests in the session; pooled connections are
+    closed at session teardown. Rejected tokens are refreshed and the
+    request retried once. Goes through the cassette and the GET response
+    cache, logs to http_log and journals booking writes, when enabled.
+    """
+    client = ApiClient(
+        base_url=config["base_url"],
+        auth_token=auth_token,
+        pool_settings=config.get("http_pool"),
+        token_provider=token_provider,
+        cassette=cassette,
+        response_cache=response_cache,
+        http_log=http_log,
+        booking_journal=booking_journal,
+    )
+    yield client
+    close_shared_sessions()
+
+
+@pytest.fixture(scope="session")
+def async_api_client(config, api_client):
     """
-    return ApiClient(base_url=config["base_url"], auth_token=auth_token)
+    Provide an AsyncApiClient for concurrent request flows.
+    In-flight requests are capped by `async_max_concurrency` from config.json.
+    """
+    client = AsyncApiClient.from_client(
+        api_client, max_concurrency=config.get("async_max_concurrency", 10))
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session", autouse=True)
-def check_health(config):
+def check_health(config, cassette):
     """
     Verify API health once at the start of the test session.
     Runs automatically before the first test.
     Retries up to 3 times with 2s delay before failing the entire run.
     """
     tmp_client = ApiClient(
-        base_url=config["base_url"])  # no auth needed for /ping
+        base_url=config["base_url"],
+        pool_settings=config.get("http_pool"),
+        cassette=cassette)  # no auth needed for /ping
     for _ in range(3):
         response = tmp_client.get("/ping")
         if response.status_code == 201:
@@ -89,58 +571,179 @@ def create_test_booking(booking_registry):
     return booking_registry
     
 
+def _create_registry(api_client, parallelism):
+    """POST one booking per valid filters.json entry, in parallel, keeping file order."""
+    # filters.json, parsed once per process by the data loader
+    filters = load_cases("filters.json")
+
+    # Build payloads for valid=true filters
+    valid_params = [entry.get("params", {}) for entry in filters if entry.get("valid", False)]
+    payloads = [BookingDataBuilder(params).build() for params in valid_params]
+
+    created = create_bookings(api_client, payloads, max_workers=parallelism)
+    registry = created.succeeded
+    for booking in registry:
+        print(f"Booking created: ID={booking['bookingid']}, payload={booking['data']}")
+    if not created.ok:
+        delete_bookings(api_client, [b["bookingid"] for b in registry], max_workers=parallelism)
+        created.raise_for_failures()
+    return registry
+
+
+def _delete_registry(api_client, registry, parallelism, headers=None):
+    """DELETE every registry booking in parallel and report aggregated failures."""
+    deleted = delete_bookings(
+        api_client,
+        [booking["bookingid"] for booking in registry],
+        max_workers=parallelism,
+        headers=headers,
+    )
+    for booking_id in deleted.succeeded:
+        print(f"Booking {booking_id} deleted successfully.")
+    for booking_id, error in deleted.failed:
+        print(f"Failed to delete booking {booking_id}. {error}")
+
+
 @pytest.fixture(scope="module")
-def booking_registry(api_client, auth_token):
+def booking_registry(config, api_client):
     """
     Creates all valid bookings from filters.json at session start,
     stores them in a registry for test use, and deletes them at session teardown.
+    POSTs and DELETEs run in parallel (`fixture_parallelism` in config.json);
+    failures are aggregated so one slow or failing call doesn't hold up the rest.
     """
-    # Load filters.json
-    with open("resources/test-data/filters.json") as f:
-        filters = json.load(f)
+    parallelism = config.get("fixture_parallelism", 8)
+    registry = BookingRegistry(_create_registry(api_client, parallelism))
 
-    registry = []
+    # Yield the registry to tests
+    yield registry
 
-    # Create bookings for valid=true filters
-    for entry in filters:
-        if entry.get("valid", False):
-            params = entry.get("params", {})
-            booking_payload = BookingDataBuilder(params).build()
+    # Teardown: delete all remaining bookings in parallel
+    # api_client authenticates with its (auto-refreshed) token cookie
+    _delete_registry(api_client, registry, parallelism)
 
-            # POST booking
-            response = api_client.post("/booking", json=booking_payload)
-            response.raise_for_status()
-            booking_id = response.json()["bookingid"]
 
-            registry.append({"bookingid": booking_id, "data": booking_payload})
-            print(f"Booking created: ID={booking_id}, params={params}")
+@pytest.fixture(scope="session")
+def shared_booking_registry(pytestconfig, config, api_client):
+    """
+    Read-only registry of filters.json bookings shared by all xdist workers.
+    Created once per run by whichever worker needs it first (file lock) and
+    deleted when the last reference is released, so setup cost stays constant
+    as workers are added. Tests that modify bookings use booking_registry.
+    """
+    parallelism = config.get("fixture_parallelism", 8)
+    shared = SharedBookingRegistry(pytestconfig.stash[SHARED_DIR])
 
-    # Yield the registry to tests
-    yield registry
+    registry = shared.acquire(lambda: _create_registry(api_client, parallelism))
+    yield ReadOnlyBookingRegistry(registry)
+    shared.release(lambda bookings: _delete_registry(api_client, bookings, parallelism))
 
-    # Teardown: delete all created bookings
-    for booking in registry:
-        booking_id = booking["bookingid"]
-        delete_response = api_client.delete(
-            f"/booking/{booking_id}",
-            headers={"Cookie": f"token={auth_token}"}
-        )
-        if delete_response.status_code == 201:
-            print(f"Booking {booking_id} deleted successfully.")
-        else:
-            print(
-                f"Failed to delete booking {booking_id}. "
-                f"Status: {delete_response.status_code}, Response: {delete_response.text}"
-            )
+
+@pytest.fixture(scope="session")
+def payload_stream(pytestconfig):
+    """
+    Seeded booking payload stream for this worker. All workers share the
+    run's seed and take disjoint shards of one sequence, so a run with the
+    same seed and worker count sends exactly the same payloads.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return PayloadStream(pytestconfig.stash[PAYLOAD_SEED], shard=int(worker[2:]), shards=workers)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """
+    Collect ApiClient metrics (and cassette / response cache counters):
+    xdist workers dump theirs to the run directory; the controller merges
+    them with its own and writes the report.
+    """
+    config = session.config
+    metrics_dir = os.path.join(config.stash[SHARED_DIR], "metrics")
+    os.makedirs(metrics_dir, exist_ok=True)
+    counters = _client_counters(config)
+
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        with open(os.path.join(metrics_dir, f"{workerinput['workerid']}.json"), "w") as f:
+            json.dump({**api_metrics.to_dict(), "counters": counters}, f)
+        return
+
+    merged = ApiMetrics()
+    merged.merge_dict(api_metrics.to_dict())
+    for name in sorted(os.listdir(metrics_dir)):
+        with open(os.path.join(metrics_dir, name)) as f:
+            worker_metrics = json.load(f)
+        merged.merge_dict(worker_metrics)
+        for layer, stats in worker_metrics.get("counters", {}).items():
+            totals = counters.setdefault(layer, {})
+            for key, count in stats.items():
+                totals[key] = totals.get(key, 0) + count
+    config.stash[CLIENT_COUNTERS] = counters
+    summary = merged.summary()
+    if not summary:
+        return
+    waits = merged.wait_summary()
+
+    config.stash[METRICS_SUMMARY] = summary
+    report_path = config.getoption("--metrics-report")
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    with open(report_path, "w") as f:
+        json.dump({"endpoints": summary, "waits": waits, "histograms": merged.to_dict()}, f, indent=2)
+    add_report_section(config, "metrics", render_metrics_table(summary))
+    if waits:
+        add_report_section(config, "waits", render_waits_html_table(waits))
+
+
+def _client_counters(config):
+    """Counters of the optional ApiClient layers active in this process."""
+    counters = {}
+    cassette = config.stash.get(CASSETTE, None)
+    if cassette is not None:
+        counters["cassette"] = dict(cassette.stats)
+    cache = config.stash.get(RESPONSE_CACHE, None)
+    if cache is not None:
+        counters["response_cache"] = dict(cache.stats)
+    return counters
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Print per-endpoint latency percentiles (and cassette / cache usage) at the end of the run."""
+    counters = config.stash.get(CLIENT_COUNTERS, {})
+    if "cassette" in counters:
+        stats = counters["cassette"]
+        terminalreporter.write_line(
+            f"Cassette ({config.stash[CASSETTE].mode}): {stats.get('replayed', 0)} replayed, "
+            f"{stats.get('recorded', 0)} recorded, {stats.get('missed', 0)} missing")
+    if "response_cache" in counters:
+        stats = counters["response_cache"]
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        terminalreporter.write_line(
+            f"Response cache: {stats.get('hits', 0)}/{lookups} GETs served from cache, "
+            f"{stats.get('invalidations', 0)} invalidated by writes, {stats.get('expired', 0)} expired, "
+            f"{stats.get('evictions', 0)} evicted")
+    summary = config.stash.get(METRICS_SUMMARY, None)
+    if not summary:
+        return
+    terminalreporter.section("API call metrics")
+    terminalreporter.write_line(
+        f"{'endpoint':<28}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'reused':>8}")
+    for key, m in summary.items():
+        terminalreporter.write_line(
+            f"{key:<28}{m['count']:>7}{m['p50_ms']:>9.2f}{m['p95_ms']:>9.2f}"
+            f"{m['p99_ms']:>9.2f}{m['max_ms']:>9.2f}{m['reused_connections']:>8}")
+    terminalreporter.write_line(f"Full metrics: {config.getoption('--metrics-report')}")
 
 
 # Track results
 results_summary = {"passed": 0, "failed": 0, "skipped": 0}
+test_durations = []
 
 
 def pytest_runtest_logreport(report):
     """Hook to collect test results"""
     if report.when == "call":
+        test_durations.append((report.nodeid, report.duration))
         if report.passed:
             results_summary["passed"] += 1
         elif report.failed:
@@ -149,24 +752,7 @@ def pytest_runtest_logreport(report):
         results_summary["skipped"] += 1
 
 
-def pytest_html_results_summary(prefix, summary, postfix):
-    """Hook to add pie chart to pytest-html report"""
-    # Prepare pie chart
-    labels = list(results_summary.keys())
-    sizes = list(results_summary.values())
-    colors = ["#28a745", "#dc3545", "#ffc107"]  # green, red, yellow
-
-    fig, ax = plt.subplots()
-    ax.pie(sizes, labels=labels, autopct="%1.1f%%", colors=colors, startangle=90)
-    ax.axis("equal")  # Equal aspect ratio
-
-    # Save to memory
-    buf = BytesIO()
-    plt.savefig(buf, format="png")
-    buf.seek(0)
-    encoded = base64.b64encode(buf.read()).decode("utf-8")
-    buf.close()
-
-    # Embed into report
-    html = f'<div><h3>📊 Test Results Summary</h3><img src="data:image/png;base64,{encoded}" /></div>'
-    prefix.extend([html])
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Hook to add the results chart and published report sections to pytest-html report"""
+    prefix.append(render_results_summary(results_summary, test_durations))
+    prefix.extend(_report_sections(session.config))
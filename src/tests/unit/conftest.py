@@ -0,0 +1,30 @@
+import pytest
+
+from tests.api.utils.api_client import ApiClient
+from tests.api.utils.auth_helper import AuthenticationHelper
+from tests.api.utils.local_booker_server import LocalBookerServer
+
+"""
+Fixtures for unit tests of the test utilities (src/tests/api/utils)
+
+- check_health → overridden: these tests never touch the configured API
+- booker_server → a private in-process Restful-Booker stand-in per module
+- booker_client → authenticated ApiClient on booker_server (no metrics)
+"""
+
+
+@pytest.fixture(scope="session", autouse=True)
+def check_health():
+    """Nothing to check: unit tests use their own stand-in, if any."""
+
+
+@pytest.fixture(scope="module")
+def booker_server():
+    with LocalBookerServer() as server:
+        yield server
+
+
+@pytest.fixture
+def booker_client(booker_server):
+    token = AuthenticationHelper.get_token(booker_server.base_url, "admin", "password123")
+    return ApiClient(booker_server.base_url, auth_token=token, metrics=None)
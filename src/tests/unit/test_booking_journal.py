@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from tests.api.utils.booking_data_builder import PayloadStream
+from tests.api.utils.booking_journal import BookingJournal, outstanding, start_run, sweep_orphans
+
+
+@pytest.fixture
+def payloads():
+    return PayloadStream(seed=25)
+
+
+def _journaled_run(client, directory, base_url=None):
+    """Start a run against `base_url` (default: the client's) and journal the client's writes under it."""
+    run_id, lock = start_run(directory, base_url or client.base_url)
+    journal = BookingJournal(directory, run_id)
+    client.booking_journal = journal
+    return run_id, lock, journal
+
+
+def _create(client, payloads, count):
+    return [client.post("/booking", json=next(payloads)).json()["bookingid"] for _ in range(count)]
+
+
+def _status(client, booking_id):
+    return client.get(f"/booking/{booking_id}").status_code
+
+
+def test_killed_run_leftovers_are_deleted(booker_client, payloads, tmp_path):
+    run_id, lock, journal = _journaled_run(booker_client, tmp_path)
+    first, second, third = _create(booker_client, payloads, 3)
+    booker_client.delete(f"/booking/{first}")  # the run's own teardown got this far
+    journal.close()
+    booker_client.booking_journal = None
+    lock.release()  # killed: the OS drops the lock, finish_run never runs
+
+    assert set(outstanding(tmp_path / run_id)) == {second, third}
+    stats = sweep_orphans(booker_client, tmp_path)
+
+    assert (stats["runs"], stats["outstanding"], stats["deleted"], stats["dropped"]) == (1, 2, 2, 0)
+    assert [_status(booker_client, b) for b in (second, third)] == [404, 404]
+    assert not (tmp_path / run_id).exists()
+
+
+def test_bookings_changed_since_journaled_are_dropped_not_deleted(booker_client, payloads, tmp_path):
+    run_id, lock, journal = _journaled_run(booker_client, tmp_path)
+    updated, changed, gone = _create(booker_client, payloads, 3)
+    booker_client.patch(f"/booking/{updated}", json={"firstname": "Journaled"})  # journaled update
+    journal.close()
+    booker_client.booking_journal = None
+    lock.release()
+    # someone else's writes after the run died: not in the journal
+    booker_client.patch(f"/booking/{changed}", json={"firstname": "SomeoneElse"})
+    booker_client.delete(f"/booking/{gone}")
+
+    stats = sweep_orphans(booker_client, tmp_path)
+
+    assert (stats["deleted"], stats["dropped"], stats["failed"]) == (1, 2, 0)
+    assert _status(booker_client, updated) == 404
+    assert booker_client.get(f"/booking/{changed}").json()["firstname"] == "SomeoneElse"
+    assert not (tmp_path / run_id).exists()
+    booker_client.delete(f"/booking/{changed}")
+
+
+def test_live_runs_and_runs_against_other_apis_are_left_alone(booker_client, payloads, tmp_path):
+    live_id, live_lock, journal = _journaled_run(booker_client, tmp_path)
+    (live,) = _create(booker_client, payloads, 1)
+    journal.close()
+
+    # a dead run journaled against another API, whose booking IDs happen to exist here
+    other_dir = tmp_path / "20200101T000000Z-elsewhere-1"
+    other_dir.mkdir()
+    (other_dir / "run.json").write_text(json.dumps(
+        {"run_id": other_dir.name, "base_url": "http://elsewhere.example", "started_at": 0}))
+    booker_client.booking_journal = BookingJournal(tmp_path, other_dir.name)
+    (foreign,) = _create(booker_client, payloads, 1)
+    booker_client.booking_journal.close()
+    booker_client.booking_journal = None
+
+    try:
+        stats = sweep_orphans(booker_client, tmp_path, max_age_days=1e6)
+        assert stats == {"runs": 0, "outstanding": 0, "deleted": 0, "dropped": 0, "failed": 0, "pruned_runs": 0}
+        assert other_dir.exists() and (tmp_path / live_id).exists()
+
+        stats = sweep_orphans(booker_client, tmp_path, max_age_days=7)  # started_at 1970: stale
+        assert (stats["runs"], stats["deleted"], stats["pruned_runs"]) == (0, 0, 1)
+        assert not other_dir.exists()
+        assert [_status(booker_client, b) for b in (live, foreign)] == [200, 200]
+    finally:
+        live_lock.release()
+        for booking_id in (live, foreign):
+            booker_client.delete(f"/booking/{booking_id}")
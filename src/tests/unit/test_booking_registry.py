@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from tests.api.utils.booking_registry import BookingRegistry, ReadOnlyBookingRegistry
+
+
+def _booking(booking_id, firstname, checkin):
+    return {"bookingid": booking_id, "data": {
+        "firstname": firstname, "lastname": "Shared", "totalprice": 100, "depositpaid": True,
+        "bookingdates": {"checkin": checkin, "checkout": "2031-01-01"}, "additionalneeds": "Breakfast"}}
+
+
+@pytest.fixture
+def shared():
+    return ReadOnlyBookingRegistry([_booking(1, "Ann", "2030-01-01"), _booking(2, "Bob", "2030-06-01")])
+
+
+def test_registry_mutations_fail(shared):
+    for mutate in (lambda: shared.pop(), lambda: shared.append(_booking(3, "Cy", "2030-01-02")),
+                   lambda: shared.extend([]), lambda: shared.remove(1)):
+        with pytest.raises(TypeError, match="read-only registry"):
+            mutate()
+    assert len(shared) == 2
+
+
+def test_record_data_is_frozen_so_lookups_stay_consistent(shared):
+    record = shared.find_first({"firstname": "Ann"})
+    with pytest.raises(TypeError):
+        record.data["firstname"] = "Mallory"
+    with pytest.raises(TypeError):
+        record["data"]["bookingdates"]["checkin"] = "1999-01-01"
+
+    assert shared.find_first({"firstname": "Ann"}).data["firstname"] == "Ann"
+    assert [r.bookingid for r in shared.date_range("checkin", "2030-01-01", "2030-01-31")] == [1]
+
+
+def test_source_bookings_are_not_aliased_and_to_list_returns_mutable_copies():
+    source = [_booking(1, "Ann", "2030-01-01")]
+    shared = ReadOnlyBookingRegistry(source)
+    source[0]["data"]["firstname"] = "Changed"  # the caller's dict, not the registry's
+
+    copies = shared.to_list()
+    copies[0]["data"]["bookingdates"]["checkin"] = "1999-01-01"
+    json.dumps(copies)
+
+    assert shared.get(1).data["firstname"] == "Ann"
+    assert shared.get(1).data["bookingdates"]["checkin"] == "2030-01-01"
+    assert BookingRegistry(shared.to_list()).find_first({"firstname": "Ann"}) is not None
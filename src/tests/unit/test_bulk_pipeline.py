@@ -0,0 +1,134 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from tests.api.utils.bulk_pipeline import (
+    AimdLimiter, pipeline_create_bookings, pipeline_delete_bookings, retry_after_seconds)
+
+FAST_BACKOFF = {"backoff": {"initial_delay": 0.001, "max_delay": 0.001}}
+
+
+def _response(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}"
+    response._content_consumed = True
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+class ScriptedClient:
+    """Answers every request with the next scripted response (or raises it), counting calls."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    def _next(self, *args, **kwargs):
+        self.calls += 1
+        outcome = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    post = delete = _next
+
+
+# -----------------------------
+# Retry-After parsing
+# -----------------------------
+@pytest.mark.parametrize("header, seconds", [
+    ("3", 3.0),
+    ("1.5", 1.5),
+    ("-4", 0.0),
+    ("120", 60.0),   # capped at the limit
+    ("soon", None),
+    ("", None),
+    (None, None),
+])
+def test_retry_after_delta_seconds_and_garbage(header, seconds):
+    assert retry_after_seconds(_response(429, header), limit=60.0) == seconds
+
+
+def test_retry_after_http_date():
+    in_30s = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    yesterday = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+    next_week = format_datetime(datetime.now(timezone.utc) + timedelta(days=7), usegmt=True)
+
+    assert 28 <= retry_after_seconds(_response(503, in_30s)) <= 30
+    assert retry_after_seconds(_response(503, yesterday)) == 0.0
+    assert retry_after_seconds(_response(503, next_week), limit=60.0) == 60.0
+
+
+# -----------------------------
+# AIMD concurrency limit
+# -----------------------------
+def _respond(limiter, throttled):
+    limiter.acquire()
+    limiter.release(throttled)
+
+
+def test_decrease_is_multiplicative_and_stops_at_minimum():
+    limiter = AimdLimiter(initial=16, minimum=3, maximum=32, window=4, throttle_threshold=0.5, cooldown=0)
+    for _ in range(4):
+        _respond(limiter, throttled=True)
+
+    assert limiter.limit == 3  # 16 → 8 → 4 → 3 (not 2)
+    assert limiter.stats() == {"final": 3, "peak": 16, "lowest": 3, "decreases": 4}
+
+
+def test_decrease_at_most_once_per_cooldown():
+    limiter = AimdLimiter(initial=16, minimum=1, window=4, throttle_threshold=0.5, cooldown=0.2)
+    for _ in range(3):
+        _respond(limiter, throttled=True)
+    assert (limiter.limit, limiter.decreases) == (8, 1)
+
+    time.sleep(0.25)
+    _respond(limiter, throttled=True)
+    assert (limiter.limit, limiter.decreases) == (4, 2)
+
+
+def test_isolated_throttles_below_threshold_do_not_decrease():
+    limiter = AimdLimiter(initial=8, window=10, throttle_threshold=0.5, cooldown=0)
+    for _ in range(9):
+        _respond(limiter, throttled=False)
+    _respond(limiter, throttled=True)  # 1 of the last 10
+
+    assert limiter.decreases == 0 and limiter.limit > 8
+
+
+# -----------------------------
+# Retry policy
+# -----------------------------
+@pytest.mark.parametrize("failure", [_response(500), requests.ConnectionError("reset by peer")],
+                         ids=["500", "connection-error"])
+def test_post_is_never_retried_on_server_or_connection_errors(failure):
+    client = ScriptedClient(failure, _response(200))
+
+    result = pipeline_create_bookings(client, [{"firstname": "Once"}], **FAST_BACKOFF)
+
+    assert client.calls == 1
+    assert (result.stats["succeeded"], result.stats["failed"], result.stats["retries"]) == (0, 1, 0)
+
+
+def test_post_is_retried_after_429():
+    client = ScriptedClient(_response(429, "0"), _response(200))
+    client.script[1]._content = b'{"bookingid": 7}'
+
+    result = pipeline_create_bookings(client, [{"firstname": "Twice"}], **FAST_BACKOFF)
+
+    assert client.calls == 2 and result.succeeded == [{"bookingid": 7, "data": {"firstname": "Twice"}}]
+
+
+@pytest.mark.parametrize("failure", [_response(500), requests.ConnectionError("reset by peer")],
+                         ids=["500", "connection-error"])
+def test_delete_is_retried_and_a_405_after_an_uncertain_attempt_counts_as_deleted(failure):
+    client = ScriptedClient(failure, _response(405))
+
+    result = pipeline_delete_bookings(client, [12], **FAST_BACKOFF)
+
+    assert client.calls == 2 and result.succeeded == [12] and result.stats["retries"] == 1
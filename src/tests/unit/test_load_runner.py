@@ -0,0 +1,36 @@
+import itertools
+
+import requests
+
+from tests.api.utils.load_runner import LoadRunner
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    return response
+
+
+def test_scenario_exceptions_fail_the_iteration_not_the_worker():
+    calls = itertools.count()
+
+    def scenario(client, step):
+        n = next(calls)
+        step("POST /booking", lambda: _response(200 if n % 3 else 500), (200,))
+        if n % 3 == 1:
+            return {}["bookingid"]  # a 200 with an unexpected body
+
+    report = LoadRunner(None, scenario=scenario, duration=0.2, concurrency=2).run()
+
+    failed_steps = report["endpoints"]["POST /booking"]["errors"]
+    assert report["iterations"] > 6
+    assert report["scenario_errors"]["KeyError"] == report["failed_iterations"] - failed_steps > 0
+
+
+def test_workers_stop_when_payloads_run_out():
+    seen = []
+    report = LoadRunner(None, scenario=lambda client, step, payload: seen.append(payload),
+                        duration=5, concurrency=3, payloads=iter(range(10))).run()
+
+    assert sorted(seen) == list(range(10))
+    assert report["iterations"] == 10 and report["duration_s"] < 5
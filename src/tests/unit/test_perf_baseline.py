@@ -0,0 +1,63 @@
+import pytest
+
+from tests.api.utils.perf_baseline import batch_p95, compare, mann_whitney_greater
+
+# Reference p-values from scipy.stats.mannwhitneyu(x, y, alternative="greater"),
+# method="exact" for tie-free samples up to exact_limit, else "asymptotic" (continuity corrected)
+
+
+@pytest.mark.parametrize("x, y, u, p_value", [
+    ([4, 5, 6], [1, 2, 3], 9.0, 0.05),
+    ([3, 5, 6], [1, 2, 4], 8.0, 0.1),
+    ([1, 2, 3], [4, 5, 6], 0.0, 1.0),
+    ([0.5 * i for i in range(1, 13)], [0.5 * i + 0.25 for i in range(12)], 78.0, 0.3776424141210788),
+], ids=["all-larger", "one-swap", "all-smaller", "exact-12x12"])
+def test_exact_distribution_for_small_tie_free_samples(x, y, u, p_value):
+    assert mann_whitney_greater(x, y) == pytest.approx((u, p_value), rel=1e-9)
+
+
+@pytest.mark.parametrize("x, y, u, p_value", [
+    ([1.2, 1.5, 1.5, 2.0, 2.2, 2.2, 2.9, 3.1], [1.0, 1.1, 1.5, 1.6, 2.0, 2.0, 2.1, 2.2], 43.0, 0.1329441788784308),
+    (list(range(30, 55)), list(range(20, 45)), 512.5, 5.3914665374013136e-05),
+], ids=["ties", "above-exact-limit"])
+def test_normal_approximation_with_tie_correction(x, y, u, p_value):
+    assert mann_whitney_greater(x, y) == pytest.approx((u, p_value), rel=1e-9)
+
+
+def test_all_ties_and_empty_samples_are_never_significant():
+    assert mann_whitney_greater([2.0] * 5, [2.0] * 5) == (12.5, 1.0)
+    assert mann_whitney_greater([], [1.0]) == (0.0, 1.0)
+
+
+def test_batch_p95_drops_the_trailing_partial_batch():
+    assert batch_p95(list(range(1, 46)), 20) == [19, 39]
+
+
+BASELINE = {"batch_size": 1, "batch_p95_ms": [10.0 + i / 10 for i in range(10)]}  # median 10.45 ms
+SLOWER = [11.0 + i / 10 for i in range(10)]                                     # median +1 ms (+9.6%), p < 0.001
+
+
+@pytest.mark.parametrize("min_increase, min_delta_ms, regression", [
+    (0.05, 0.5, True),    # +1 ms clears both minimums
+    (0.05, 2.0, False),   # below the absolute minimum
+    (0.20, 0.5, False),   # below the relative minimum (20% of 10.45 ms)
+])
+def test_compare_needs_significance_and_both_effect_size_minimums(min_increase, min_delta_ms, regression):
+    verdict = compare(BASELINE, SLOWER, alpha=0.01, min_increase=min_increase, min_delta_ms=min_delta_ms)
+
+    assert verdict["p_value"] < 0.01
+    assert verdict["delta_ms"] == pytest.approx(1.0)
+    assert verdict["regression"] is regression
+
+
+def test_compare_ignores_large_but_insignificant_shifts():
+    noisy = [5.0, 30.0] * 5  # median +7 ms, but half the batches are faster than the baseline
+    verdict = compare(BASELINE, noisy, alpha=0.01, min_increase=0.0, min_delta_ms=0.0)
+
+    assert verdict["p_value"] >= 0.01 and not verdict["regression"]
+
+
+def test_compare_rejects_sample_sizes_that_can_never_be_significant():
+    baseline = {"batch_size": 1, "batch_p95_ms": [10.0, 11.0]}
+    with pytest.raises(ValueError, match="can never reach p < 0.01"):
+        compare(baseline, [20.0, 21.0], alpha=0.01)
@@ -0,0 +1,65 @@
+from functools import partial
+
+import requests
+
+from tests.api.utils.cassette import Cassette
+from tests.api.utils.race import NO_CACHE, RaceOutcome, last_writer_wins, race
+
+PATCHES = {
+    "PATCH #0": {"firstname": "Race0", "lastname": "Writer0"},
+    "PATCH #1": {"firstname": "Race0", "lastname": "Writer1"},
+}
+
+
+def _outcome(label, status, started, finished):
+    response = requests.Response()
+    response.status_code = status
+    return RaceOutcome(label, response, None, started, finished)
+
+
+def test_last_writer_wins_flags_a_winner_that_finished_before_another_writer_started():
+    # PATCH #0 finished at t=1, PATCH #1 started at t=2: #1 should have overwritten it
+    outcomes = [_outcome("PATCH #0", 200, 0.0, 1.0), _outcome("PATCH #1", 200, 2.0, 3.0)]
+    final = dict(PATCHES["PATCH #0"], totalprice=100)
+
+    assert last_writer_wins(final, outcomes, PATCHES) == [
+        "PATCH #0 won although ['PATCH #1'] started after it finished"]
+    assert last_writer_wins(final, outcomes, PATCHES, check_order=False) == []
+
+
+def test_last_writer_wins_flags_torn_writes_and_failed_patches_without_order_check():
+    outcomes = [_outcome("PATCH #0", 200, 0.0, 1.0), _outcome("PATCH #1", 500, 0.0, 1.0)]
+    torn = {"firstname": "Race0", "lastname": "Writer2"}
+
+    violations = last_writer_wins(torn, outcomes, PATCHES, check_order=False)
+
+    assert violations[0] == "PATCH #1 returned 500"
+    assert "matches no single PATCH" in violations[1]
+
+
+def test_replayed_race_passes_without_order_check(booker_client, tmp_path):
+    """A recorded race replays the recorded winner; only the timings are this run's."""
+    booking_id = booker_client.post("/booking", json={
+        "firstname": "Race", "lastname": "Target", "totalprice": 1, "depositpaid": True,
+        "bookingdates": {"checkin": "2030-01-01", "checkout": "2030-01-02"}}).json()["bookingid"]
+    endpoint = f"/booking/{booking_id}"
+    path = str(tmp_path / "race")
+
+    def run(mode):
+        cassette = Cassette(path, mode)
+        booker_client.cassette = cassette
+        try:
+            outcomes = race([(label, partial(booker_client.patch, endpoint, json=payload))
+                             for label, payload in PATCHES.items()])
+            final = booker_client.get(endpoint, headers=NO_CACHE).json()
+        finally:
+            booker_client.cassette = None
+            cassette.close()
+        return final, outcomes, cassette.stats
+
+    recorded, outcomes, stats = run("record-once")
+    assert stats["recorded"] == 3 and last_writer_wins(recorded, outcomes, PATCHES) == []
+
+    replayed, outcomes, stats = run("replay-only")
+    assert stats["replayed"] == 3 and replayed == recorded
+    assert last_writer_wins(replayed, outcomes, PATCHES, check_order=False) == []